@@ -0,0 +1,114 @@
+"""Compare top-k fuzzy matching with per-candidate loop, and Korean
+normalization with replace based one.
+
+Run with ``python -m benchmarks.fuzz`` on top of repository.
+
+"""
+import timeit
+import unicodedata
+from typing import List
+
+from yui.utils.fuzz import (
+    Choices,
+    KOREAN_ALPHABETS_FIRST_MAP,
+    KOREAN_ALPHABETS_MIDDLE_MAP,
+    KOREAN_END,
+    KOREAN_START,
+    best_matches,
+    match,
+    normalize_korean_nfc_to_nfd,
+    ratio,
+)
+
+NUMBER = 20
+
+SYLLABLES = '가나다라마바사아자차카타파하강남북동서신성역구청'
+
+
+def make_choices(count: int) -> List[str]:
+    """Build station like names."""
+
+    names = []
+    for i in range(count):
+        length = 2 + i % 3
+        names.append(''.join(
+            SYLLABLES[(i * 7 + j * 3) % len(SYLLABLES)] for j in range(length)
+        ))
+    return names
+
+
+def legacy_best(query: str, names: List[str], scorer) -> str:
+    """Loop of subway app before best_matches."""
+
+    best = None
+    best_ratio = -1
+    for name in names:
+        r = scorer(name, query)
+        if best_ratio < r:
+            best = name
+            best_ratio = r
+    return best
+
+
+def legacy_normalize(value: str) -> str:
+    """Replace based normalization before translate table."""
+
+    for from_, to_ in KOREAN_ALPHABETS_FIRST_MAP.items():
+        value = value.replace(from_, to_)
+
+    for from_, to_ in KOREAN_ALPHABETS_MIDDLE_MAP.items():
+        value = value.replace(from_, to_)
+
+    return ''.join(
+        unicodedata.normalize('NFD', x) if KOREAN_START <= ord(x) <= KOREAN_END
+        else x for x in list(value)
+    )
+
+
+def bench_normalize(names: List[str]):
+    uncached = normalize_korean_nfc_to_nfd.__wrapped__  # type: ignore
+    cases = [
+        ('normalize, replace', legacy_normalize),
+        ('normalize, translate', uncached),
+        ('normalize, translate with memo', normalize_korean_nfc_to_nfd),
+    ]
+    print(f'normalize {len(names)} names, {NUMBER} times')
+    for name, func in cases:
+        elapsed = timeit.timeit(
+            lambda: [func(x) for x in names],
+            number=NUMBER,
+        )
+        print(f'{name:>34}: {elapsed / NUMBER * 1000:8.3f} ms/round')
+
+
+def main():
+    names = make_choices(600)
+    choices = Choices(names)
+    query = '강남구청역'
+
+    assert legacy_best(query, names, ratio) == \
+        best_matches(query, choices)[0][0]
+
+    cases = [
+        ('ratio, loop', lambda: legacy_best(query, names, ratio)),
+        ('ratio, best_matches', lambda: best_matches(query, names)),
+        (
+            'ratio, best_matches with Choices',
+            lambda: best_matches(query, choices),
+        ),
+        ('match, loop', lambda: legacy_best(query, names, match)),
+        (
+            'match, best_matches with Choices',
+            lambda: best_matches(query, choices, scorer='match'),
+        ),
+    ]
+    print(f'{len(names)} choices, {NUMBER} queries')
+    for name, func in cases:
+        elapsed = timeit.timeit(func, number=NUMBER)
+        print(f'{name:>34}: {elapsed / NUMBER * 1000:8.3f} ms/query')
+
+    bench_normalize(names)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Compare compiled parse plan with per-call parser.
+
+Run with ``python -m benchmarks.parser`` on top of repository.
+
+"""
+import datetime
+import shlex
+import timeit
+from typing import List, Set, Tuple
+
+from yui.box import Box
+from yui.box.parsers import compile_plan, parse_option_and_arguments
+from yui.command.decorators import argument, option
+from yui.transform import str_to_date, value_range
+from yui.types.handler import Handler
+
+from .legacy_parser import legacy_parse_option_and_arguments
+
+NUMBER = 10000
+
+
+def make_cases() -> List[Tuple[str, Handler, str]]:
+    """Build commands of ``tests/box/parser_test.py``."""
+
+    box = Box()
+
+    def callable_default():
+        return 'hello'
+
+    @box.command('test-option')
+    @option('--required-option', required=True)
+    @option('--dest-change-option', dest='dest_changed_option')
+    @option('--is-flag', is_flag=True)
+    @option('--multiple', multiple=True)
+    @option('--container', container_cls=set, type_=float, nargs=2)
+    @option('--callable-default', default=callable_default)
+    @option('--non-type')
+    @option('--default-option', default='!!!')
+    @option('--transform', type_=int, transform_func=value_range(1, 10))
+    @option('--transform-non-type', transform_func=str_to_date())
+    @option('--transform-container', type_=int,
+            transform_func=value_range(1, 10),
+            container_cls=set, nargs=3)
+    @option('--transform-two', transform_func=str_to_date(),
+            container_cls=list, nargs=2)
+    async def test_option(
+        required_option: int,
+        dest_changed_option: int,
+        is_flag: bool,
+        multiple: List[int],
+        container,
+        callable_default: str,
+        non_type,
+        default_option,
+        transform: int,
+        transform_non_type: datetime.date,
+        transform_container: Set[int],
+        transform_two: List[datetime.date],
+    ):
+        pass
+
+    @box.command('test-argument1')
+    @argument('non_type')
+    @argument('transform_non_type', transform_func=str_to_date())
+    @argument('container', nargs=3, container_cls=set, type_=float)
+    @argument('container_with_typing', nargs=3)
+    @argument('container_with_transform', nargs=2, container_cls=list,
+              transform_func=str_to_date())
+    async def test_argument1(
+        non_type,
+        transform_non_type: datetime.date,
+        container_with_typing: List[int],
+        container_with_transform: List[datetime.date],
+    ):
+        pass
+
+    @box.command('test-argument3')
+    @argument('args', nargs=2)
+    @argument('concat', nargs=3, concat=True)
+    async def test_argument3(args):
+        pass
+
+    return [
+        ('options', test_option, (
+            '--dest-change-option=2222 '
+            '--is-flag '
+            '--multiple 3333 --multiple=4444 '
+            '--container 55.55 66.66 '
+            '--non-type world '
+            '--transform 4 '
+            '--transform-non-type 2017-10-07 '
+            '--transform-container 4 6 2 '
+            '--transform-two 2017-10-07 2017-10-24 '
+            '--required-option 1111 '
+        )),
+        ('arguments', test_argument1, (
+            'hello '
+            '2017-10-07 '
+            '3.3 1.1 2.2 '
+            '1 2 3 '
+            '2017-10-07 2017-10-24 '
+        )),
+        ('concat', test_argument3, '1 2 hell o world'),
+    ]
+
+
+def main():
+    print(f'{"case":<12}{"legacy":>12}{"compiled":>12}{"speedup":>10}')
+    for name, handler, text in make_cases():
+        compile_plan(handler)
+        chunks = shlex.split(text)
+        assert legacy_parse_option_and_arguments(handler, chunks[:]) == \
+            parse_option_and_arguments(handler, chunks)
+
+        legacy = timeit.timeit(
+            lambda: legacy_parse_option_and_arguments(handler, chunks[:]),
+            number=NUMBER,
+        )
+        compiled = timeit.timeit(
+            lambda: parse_option_and_arguments(handler, chunks),
+            number=NUMBER,
+        )
+        print(
+            f'{name:<12}{legacy / NUMBER * 1e6:>10.2f}us'
+            f'{compiled / NUMBER * 1e6:>10.2f}us'
+            f'{legacy / compiled:>9.2f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
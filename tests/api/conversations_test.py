@@ -1,6 +1,10 @@
+import asyncio
+
 import pytest
 
+from yui.api import MAX_PAGE_SIZE, PaginationError
 from yui.api.encoder import bool2str
+from yui.types.slack.response import APIResponse
 
 from ..util import FakeBot
 
@@ -147,3 +151,107 @@ async def test_slack_api_conversations_open():
     assert call.data == {
         'users': f'{user_id},{user2_id}',
     }
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_iter_history():
+    bot = FakeBot()
+    pages = {
+        None: (['1', '2'], 'c1'),
+        'c1': (['3', '4'], 'c2'),
+        'c2': (['5'], ''),
+    }
+
+    @bot.response('conversations.history')
+    def history(data):
+        messages, cursor = pages[data.get('cursor')]
+        return APIResponse(
+            body={
+                'ok': True,
+                'messages': [{'ts': ts} for ts in messages],
+                'response_metadata': {'next_cursor': cursor},
+            },
+            status=200,
+            headers={},
+        )
+
+    result = [
+        m['ts'] async for m in bot.api.conversations.iter_history('C1')
+    ]
+    assert result == ['1', '2', '3', '4', '5']
+    assert [c.data.get('cursor') for c in bot.call_queue] == \
+        [None, 'c1', 'c2']
+    assert bot.call_queue[0].data['limit'] == str(MAX_PAGE_SIZE)
+
+    bot.call_queue.clear()
+    result = [
+        m['ts'] async for m in bot.api.conversations.iter_history(
+            'C1',
+            total=2,
+        )
+    ]
+    assert result == ['1', '2']
+    assert len(bot.call_queue) == 1
+    assert bot.call_queue[0].data['limit'] == '2'
+
+    # page bigger than asked is cut, and next page asks only for the rest
+    bot.call_queue.clear()
+    result = [
+        m['ts'] async for m in bot.api.conversations.iter_history(
+            'C1',
+            limit=1,
+            total=3,
+        )
+    ]
+    assert result == ['1', '2', '3']
+    assert [c.data['limit'] for c in bot.call_queue] == ['1', '1']
+
+    bot.call_queue.clear()
+    result = [
+        m['ts'] async for m in bot.api.conversations.iter_history(
+            'C1',
+            total=3,
+        )
+    ]
+    assert result == ['1', '2', '3']
+    assert [
+        (c.data.get('cursor'), c.data['limit']) for c in bot.call_queue
+    ] == [(None, '3'), ('c1', '1')]
+
+    bot.call_queue.clear()
+    assert [
+        m async for m in bot.api.conversations.iter_history('C1', total=0)
+    ] == []
+    assert bot.call_queue == []
+
+
+@pytest.mark.asyncio
+async def test_slack_api_conversations_iter_list():
+    bot = FakeBot()
+    consumed = []
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        if data.get('cursor') == 'next':
+            return APIResponse(
+                body={'ok': False, 'error': 'ratelimited'},
+                status=200,
+                headers={},
+            )
+        return APIResponse(
+            body={
+                'ok': True,
+                'channels': [{'id': 'C1'}, {'id': 'C2'}],
+                'response_metadata': {'next_cursor': 'next'},
+            },
+            status=200,
+            headers={},
+        )
+
+    with pytest.raises(PaginationError):
+        async for c in bot.api.conversations.iter_list():
+            # next page is requested while current page is consumed
+            await asyncio.sleep(0)
+            assert len(bot.call_queue) == 2
+            consumed.append(c['id'])
+    assert consumed == ['C1', 'C2']
@@ -1,6 +1,8 @@
 import pytest
 
+from yui.api import MAX_PAGE_SIZE
 from yui.api.encoder import bool2str
+from yui.types.slack.response import APIResponse
 
 from ..util import FakeBot
 
@@ -43,3 +45,33 @@ async def test_slack_api_users_list():
         'limit': '20',
         'presence': bool2str(True),
     }
+
+
+@pytest.mark.asyncio
+async def test_slack_api_users_iter_members():
+    bot = FakeBot()
+
+    @bot.response('users.list')
+    def users_list(data):
+        cursor = data.get('cursor')
+        return APIResponse(
+            body={
+                'ok': True,
+                'members': [{'id': 'U2' if cursor else 'U1'}],
+                'response_metadata': {
+                    'next_cursor': '' if cursor else 'next',
+                },
+            },
+            status=200,
+            headers={},
+        )
+
+    members = [
+        u['id'] async for u in bot.api.users.iter_members(presence=False)
+    ]
+    assert members == ['U1', 'U2']
+    assert bot.call_queue[1].data == {
+        'cursor': 'next',
+        'limit': str(MAX_PAGE_SIZE),
+        'presence': bool2str(False),
+    }
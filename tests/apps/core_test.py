@@ -0,0 +1,401 @@
+import asyncio
+
+import pytest
+
+from yui.apps.core import (
+    SNAPSHOT_KEY,
+    SNAPSHOT_VERSION,
+    channel_changed,
+    channel_marked,
+    channel_removed,
+    forget_channel,
+    get_refresher,
+    mutate,
+    on_start,
+    on_user_change,
+    reconcile,
+    start_reconcile,
+    store_channel,
+)
+from yui.event import create_event
+from yui.types.slack.response import APIResponse
+from yui.utils import json
+
+from ..util import FakeBot
+
+
+class FakeCache:
+
+    def __init__(self) -> None:
+        self.data = {}
+
+    async def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def set(self, key, value, exptime=0):
+        self.data[key] = json.loads(json.dumps(value))
+        return True
+
+
+@pytest.mark.asyncio
+async def test_on_start():
+    bot = FakeBot()
+    bot.add_channel('C0', 'old')
+    channels = {
+        'C1': {'id': 'C1', 'name': 'general', 'creator': 'U0',
+               'is_channel': True},
+        'C2': {'id': 'C2', 'name': 'random', 'creator': 'U0',
+               'is_channel': True},
+        'D1': {'id': 'D1', 'user': 'U1', 'is_im': True},
+        'G1': {'id': 'G1', 'name': 'secret', 'creator': 'U0',
+               'is_group': True},
+    }
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        if data.get('cursor') == 'page2':
+            ids = ['D1', 'G1']
+            cursor = ''
+        else:
+            ids = ['C1', 'C2']
+            cursor = 'page2'
+        return APIResponse(
+            body={
+                'ok': True,
+                'channels': [{'id': x} for x in ids],
+                'response_metadata': {'next_cursor': cursor},
+            },
+            status=200,
+            headers={},
+        )
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        return APIResponse(
+            body={'ok': True, 'channel': channels[data['channel']]},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('users.list')
+    def users_list(data):
+        return APIResponse(
+            body={
+                'ok': True,
+                'members': [
+                    {'id': 'U1', 'name': 'item4', 'team_id': 'T0'},
+                ],
+            },
+            status=200,
+            headers={},
+        )
+
+    assert await on_start(bot)
+
+    assert bot.is_ready
+    assert sorted(c.id for c in bot.channels) == ['C1', 'C2']
+    assert bot.channels.get_by_id('C0') is None
+    assert [d.id for d in bot.ims] == ['D1']
+    assert [g.id for g in bot.groups] == ['G1']
+    assert [u.id for u in bot.users] == ['U1']
+    assert len([
+        c for c in bot.call_queue if c.method == 'conversations.info'
+    ]) == 4
+
+
+@pytest.mark.asyncio
+async def test_on_start_with_snapshot():
+    cache = FakeCache()
+    cache.data[SNAPSHOT_KEY] = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': 0,
+        'workspace': {
+            'channels': [{'id': 'C1', 'name': 'general', 'creator': 'U1'}],
+            'ims': [{'id': 'D1', 'user': 'U1'}],
+            'groups': [],
+            'users': [{'id': 'U1', 'name': 'item4', 'team_id': 'T0'}],
+        },
+    }
+
+    bot = FakeBot()
+    bot.cache = cache
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        return APIResponse(
+            body={'ok': True, 'channels': [{'id': 'C2'}]},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        return APIResponse(
+            body={'ok': True, 'channel': {
+                'id': 'C2',
+                'name': 'random',
+                'creator': 'U1',
+                'is_channel': True,
+                'topic': None,
+            }},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('users.list')
+    def users_list(data):
+        return APIResponse(
+            body={'ok': True, 'members': [
+                {'id': 'U1', 'name': 'item4', 'team_id': 'T0',
+                 'profile': {'display_name': 'item4', 'image_24': 'a.png'}},
+            ]},
+            status=200,
+            headers={},
+        )
+
+    assert await on_start(bot)
+
+    # ready with snapshot before calling any API
+    assert bot.is_ready
+    assert [c.id for c in bot.channels] == ['C1']
+    assert bot.ims.get_by_name('item4').id == 'D1'
+    assert bot.ims[0].user is bot.users[0]
+
+    await asyncio.sleep(0.05)
+
+    # reconciled in background
+    assert [c.id for c in bot.channels] == ['C2']
+    assert bot.ims == []
+    saved = cache.data[SNAPSHOT_KEY]
+    assert saved['version'] == SNAPSHOT_VERSION
+    assert saved['workspace']['channels'] == [
+        {'id': 'C2', 'name': 'random', 'creator': 'U1', 'is_channel': True},
+    ]
+    assert saved['workspace']['users'] == [
+        {'id': 'U1', 'name': 'item4', 'team_id': 'T0',
+         'profile': {'display_name': 'item4'}},
+    ]
+
+    cache.data[SNAPSHOT_KEY]['version'] = SNAPSHOT_VERSION - 1
+    bot = FakeBot()
+    bot.cache = cache
+    bot.responses = {}
+    await on_start(bot)
+    assert bot.call_queue[0].method in ('conversations.list', 'users.list')
+
+
+@pytest.mark.asyncio
+async def test_reconcile_replay_mutations():
+    bot = FakeBot()
+    bot.cache = FakeCache()
+    bot.add_user('U1', 'item4')
+    bot.add_channel('C1', 'general')
+    bot.add_channel('C2', 'random')
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        # events arrive while reconcile is fetching workspace
+        mutate(bot, store_channel, {
+            'id': 'C1',
+            'name': 'renamed',
+            'creator': 'U1',
+            'is_channel': True,
+        })
+        mutate(bot, forget_channel, 'C2')
+        return APIResponse(
+            body={'ok': True, 'channels': [{'id': 'C1'}, {'id': 'C2'}]},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        # fetched before rename and archive were applied
+        name = {'C1': 'general', 'C2': 'random'}[data['channel']]
+        return APIResponse(
+            body={'ok': True, 'channel': {
+                'id': data['channel'],
+                'name': name,
+                'creator': 'U1',
+                'is_channel': True,
+            }},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('users.list')
+    def users_list(data):
+        return APIResponse(
+            body={'ok': True, 'members': [
+                {'id': 'U1', 'name': 'item4', 'team_id': 'T0'},
+            ]},
+            status=200,
+            headers={},
+        )
+
+    await reconcile(bot)
+
+    assert [c.name for c in bot.channels] == ['renamed']
+    assert bot.channels.get_by_name('general') is None
+
+    # mutations after reconcile are not recorded
+    mutate(bot, forget_channel, 'C1')
+    assert bot.channels == []
+
+
+@pytest.mark.asyncio
+async def test_channel_mutation():
+    bot = FakeBot()
+    bot.add_user('U1', 'item4')
+    general = bot.add_channel('C1', 'general')
+    bot.add_channel('C2', 'random')
+    bot.add_private_channel('G1', 'secret')
+    refresher = get_refresher(bot)
+    refresher.delay = 0.01
+
+    @bot.response('conversations.info')
+    def conversations_info(data):
+        if data['channel'] == 'C3':
+            return APIResponse(
+                body={'ok': False, 'error': 'channel_not_found'},
+                status=200,
+                headers={},
+            )
+        return APIResponse(
+            body={'ok': True, 'channel': {
+                'id': data['channel'],
+                'name': 'renamed',
+                'creator': 'U1',
+                'is_channel': True,
+            }},
+            status=200,
+            headers={},
+        )
+
+    # mark only updates local state
+    await channel_marked(bot, create_event({
+        'type': 'channel_marked',
+        'channel': 'C1',
+        'ts': '1234.5678',
+    }))
+    assert general.last_read == '1234.5678'
+    assert not bot.call_queue
+
+    # burst of events is coalesced
+    for _ in range(5):
+        await channel_changed(bot, create_event({
+            'type': 'channel_rename',
+            'channel': {'id': 'C1', 'name': 'renamed', 'created': 0},
+        }))
+    await channel_changed(bot, create_event({
+        'type': 'channel_created',
+        'channel': {'id': 'C3', 'name': 'new', 'created': 0},
+    }))
+    assert set(refresher.pending) == {'C1', 'C3'}
+
+    await asyncio.sleep(0.05)
+
+    assert not refresher.pending
+    calls = [c.data['channel'] for c in bot.call_queue]
+    assert sorted(calls) == ['C1', 'C3']
+    assert bot.channels.get_by_name('renamed').id == 'C1'
+    assert bot.channels.get_by_name('general') is None
+    assert bot.channels.get_by_id('C3') is None
+
+    # private channel converted into public channel
+    refresher.schedule('G1')
+    await asyncio.sleep(0.05)
+    assert bot.groups == []
+    assert bot.channels.get_by_id('G1').name == 'renamed'
+
+    await channel_removed(bot, create_event({
+        'type': 'channel_archive',
+        'channel': 'C2',
+        'user': 'U1',
+    }))
+    assert bot.channels.get_by_id('C2') is None
+
+
+@pytest.mark.asyncio
+async def test_on_user_change_rename_dm():
+    bot = FakeBot()
+    old = bot.add_user('U1', 'item4')
+    dm = bot.add_dm('D1', 'U1')
+    assert bot.ims.get_by_name('item4') is dm
+
+    @bot.response('users.info')
+    def users_info(data):
+        return APIResponse(
+            body={'ok': True, 'user': {
+                'id': 'U1',
+                'name': 'renamed',
+                'team_id': 'T0',
+            }},
+            status=200,
+            headers={},
+        )
+
+    event = create_event({
+        'type': 'user_change',
+        'user': {'id': 'U1', 'name': 'renamed', 'team_id': 'T0'},
+    })
+    assert await on_user_change(bot, event)
+
+    assert bot.users.get_by_id('U1') is not old
+    assert dm.user is bot.users.get_by_id('U1')
+    assert bot.ims.get_by_name('item4') is None
+    assert bot.ims.get_by_name('renamed') is dm
+
+
+@pytest.mark.asyncio
+async def test_start_reconcile():
+    bot = FakeBot()
+    bot.cache = FakeCache()
+    bot.add_user('U1', 'item4')
+    bot.add_channel('C1', 'general')
+    release = asyncio.Event()
+
+    @bot.response('conversations.list')
+    def conversations_list(data):
+        return APIResponse(
+            body={'ok': True, 'channels': []},
+            status=200,
+            headers={},
+        )
+
+    @bot.response('users.list')
+    def users_list(data):
+        return APIResponse(
+            body={'ok': True, 'members': [
+                {'id': 'U1', 'name': 'item4', 'team_id': 'T0'},
+            ]},
+            status=200,
+            headers={},
+        )
+
+    original = bot.api.users.iter_members
+
+    async def iter_members(*args, **kwargs):
+        await release.wait()
+        async for x in original(*args, **kwargs):
+            yield x
+
+    bot.api.users.iter_members = iter_members
+
+    task = start_reconcile(bot)
+    assert start_reconcile(bot) is task
+
+    # overlapped reconcile keeps its own journal
+    other = asyncio.ensure_future(reconcile(bot))
+    await asyncio.sleep(0.01)
+    mutate(bot, store_channel, {
+        'id': 'C2',
+        'name': 'new',
+        'creator': 'U1',
+        'is_channel': True,
+    })
+    release.set()
+    await asyncio.gather(task, other)
+
+    assert [c.id for c in bot.channels] == ['C2']
+    assert start_reconcile(bot) is not task
@@ -3,6 +3,7 @@ import datetime
 import pytest
 
 from yui.apps.date.utils import APIDoesNotSupport, get_holiday_names
+from yui.utils import json
 
 
 @pytest.mark.asyncio
@@ -23,3 +24,18 @@ async def test_get_holiday_names():
 
     with pytest.raises(APIDoesNotSupport):
         await get_holiday_names(unsupported)
+
+
+@pytest.mark.asyncio
+async def test_get_holiday_names_cached_by_day(fx_cache, response_mock):
+    # registered once, so second request would fail
+    response_mock.get(
+        'https://item4.net/api/holiday/2018/01/01',
+        body=json.dumps(['신정']),
+        headers={'Content-Type': 'application/json'},
+    )
+
+    morning = datetime.datetime(2018, 1, 1, 9, 0, 0, 123)
+    night = datetime.datetime(2018, 1, 1, 23, 59, 59, 456)
+    assert await get_holiday_names(morning) == ['신정']
+    assert await get_holiday_names(night) == ['신정']
@@ -0,0 +1,98 @@
+import pytest
+
+from yui.apps.manage.cleanup.commons import (
+    cleanup_by_event_logs,
+    cleanup_by_history,
+    prune_event_logs,
+)
+from yui.apps.manage.cleanup.models import EventLog, ts_to_micro
+from yui.types.slack.response import APIResponse
+
+from ....util import FakeBot
+
+
+def add_logs(sess, channel, *timestamps):
+    with sess.begin():
+        for ts in timestamps:
+            sess.add(EventLog(
+                channel=channel,
+                ts=ts,
+                ts_micro=ts_to_micro(ts),
+            ))
+
+
+def test_ts_to_micro():
+    assert ts_to_micro('1577836800.000100') == 1577836800000100
+    assert ts_to_micro('1577836800.1') == 1577836800100000
+    assert ts_to_micro('1577836800') == 1577836800000000
+    assert ts_to_micro('9.5') < ts_to_micro('10.0')
+
+
+@pytest.mark.asyncio
+async def test_cleanup_by_event_logs(fx_config, fx_sess):
+    fx_config.OWNER_USER_TOKEN = 'owner'
+    bot = FakeBot(fx_config)
+    channel = bot.add_channel('C1', 'test')
+    deleted = []
+
+    @bot.response('chat.delete')
+    def callback(data):
+        deleted.append(data['ts'])
+        ok = data['ts'] != '10.000000'
+        return APIResponse(
+            body={'ok': ok, 'error': None if ok else 'cant_delete_message'},
+            status=200,
+            headers={},
+        )
+
+    add_logs(fx_sess, 'C1', '9.000000', '10.000000', '11.000000', '100.0')
+    add_logs(fx_sess, 'C2', '9.000000')
+
+    assert await cleanup_by_event_logs(bot, fx_sess, channel, '11.0') == 2
+    assert deleted == ['11.000000', '10.000000', '9.000000']
+    assert sorted(
+        (log.channel, log.ts) for log in fx_sess.query(EventLog)
+    ) == [('C1', '10.000000'), ('C1', '100.0'), ('C2', '9.000000')]
+
+
+def test_prune_event_logs(fx_sess):
+    add_logs(fx_sess, 'C1', *(f'{i}.000000' for i in range(1, 1201)))
+
+    assert prune_event_logs(fx_sess, ts_to_micro('1101.0')) == 1100
+    assert fx_sess.query(EventLog).count() == 100
+    assert prune_event_logs(fx_sess, ts_to_micro('1101.0')) == 0
+
+
+@pytest.mark.asyncio
+async def test_cleanup_by_history_truncated(fx_config, caplog):
+    fx_config.OWNER_USER_TOKEN = 'owner'
+    bot = FakeBot(fx_config)
+    channel = bot.add_channel('C1', 'test')
+    deleted = []
+
+    @bot.response('conversations.history')
+    def history(data):
+        if data.get('cursor') == 'next':
+            return APIResponse(
+                body={'ok': False, 'error': 'ratelimited'},
+                status=200,
+                headers={},
+            )
+        return APIResponse(
+            body={
+                'ok': True,
+                'messages': [{'ts': '2.0'}, {'ts': '1.0'}],
+                'response_metadata': {'next_cursor': 'next'},
+            },
+            status=200,
+            headers={},
+        )
+
+    @bot.response('chat.delete')
+    def delete(data):
+        deleted.append(data['ts'])
+        return APIResponse(body={'ok': True}, status=200, headers={})
+
+    assert await cleanup_by_history(bot, channel, '3.0', 10) == (2, True)
+    assert deleted == ['2.0', '1.0']
+    assert 'history of C1 was truncated after 2 messages' in caplog.text
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from yui.apps.manage.cleanup.deleter import DeleteStatus, bulk_delete
+from yui.types.slack.response import APIResponse
+
+from ....util import FakeBot
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete(fx_config):
+    fx_config.OWNER_USER_TOKEN = 'owner'
+    bot = FakeBot(fx_config)
+    running = 0
+    peak = 0
+
+    async def delete(channel, ts, token=None):
+        nonlocal running, peak
+        assert token == 'owner'
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if ts == 'gone':
+            body = {'ok': False, 'error': 'message_not_found'}
+        elif ts == 'bad':
+            body = {'ok': False, 'error': 'cant_delete_message'}
+        else:
+            body = {'ok': True}
+        return APIResponse(body=body, status=200, headers={})
+
+    bot.api.chat.delete = delete
+
+    messages = [('C1', str(i)) for i in range(10)] + [('C2', 'gone')]
+    report = await bulk_delete(bot, messages, concurrency=4)
+    assert peak == 4
+    assert report.deleted == 10
+    assert report.statuses[-1] == DeleteStatus.not_found
+    assert all(s.gone for s in report.statuses)
+    assert report.rate > 0
+
+    messages = [('C1', 'bad')] + [('C1', str(i)) for i in range(10)]
+    report = await bulk_delete(
+        bot,
+        messages,
+        stop_on_error=True,
+        concurrency=2,
+    )
+    # delete of '0' was in flight with 'bad', and it is cancelled too
+    assert report.statuses[0] == DeleteStatus.failed
+    assert report.deleted == 0
+    assert report.statuses.count(DeleteStatus.skipped) == 10
+
+    report = await bulk_delete(bot, [])
+    assert report.statuses == []
+    assert report.rate == 0.0
@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from yui.apps.manage.cleanup.models import EventLog
+from yui.apps.manage.cleanup.recorder import EventLogRecorder
+from yui.orm import AsyncDatabase
+
+
+@pytest.mark.asyncio
+async def test_event_log_recorder(fx_engine, fx_sess):
+    bot = SimpleNamespace(
+        loop=asyncio.get_event_loop(),
+        db=AsyncDatabase(fx_engine),
+    )
+    recorder = EventLogRecorder(size=3, interval=0.01)
+
+    await recorder.record(bot, 'C1', '1.1')
+    await recorder.record(bot, 'C1', '1.2')
+    assert fx_sess.query(EventLog).count() == 0
+
+    await recorder.record(bot, 'C2', '1.3')
+    assert fx_sess.query(EventLog).count() == 3
+    assert recorder.stats.flushes == 1
+    assert recorder.stats.last_batch_size == 3
+
+    await recorder.record(bot, 'C2', '1.4')
+    await asyncio.sleep(0.05)
+    assert fx_sess.query(EventLog).count() == 4
+    assert recorder.stats.flushes == 2
+    assert recorder.stats.rows == 4
+    assert recorder.stats.max_batch_size == 3
+
+    async def broken(*args):
+        raise ConnectionError
+
+    bot.db = SimpleNamespace(run=broken)
+    await recorder.record(bot, 'C3', '1.5')
+    await recorder.flush(bot)
+    assert recorder.stats.failures == 1
+    assert recorder.buffer == [
+        {'channel': 'C3', 'ts': '1.5', 'ts_micro': 1500000},
+    ]
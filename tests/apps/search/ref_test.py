@@ -1,13 +1,16 @@
 import pytest
 
 from yui.apps.search.ref import (
+    REF_INDEXES,
     css,
     fetch_css_ref,
     fetch_html_ref,
     fetch_python_ref,
+    get_ref_index,
     html,
     python,
 )
+from yui.apps.shared.cache import SNAPSHOTS, publish_snapshot
 
 from ...util import FakeBot
 
@@ -118,3 +121,33 @@ async def test_python_command(fx_sess):
     assert said.method == 'chat.postMessage'
     assert said.data['channel'] == 'C1'
     assert said.data['text'] == '비슷한 Python library를 찾지 못하겠어요!'
+
+
+def test_ref_index(fx_sess):
+    body = [
+        ['', 'Built-in Functions', 'https://docs.python.org/3/library/f'],
+        ['re', 're — Regular expression operations', 'https://re'],
+        ['reprlib', 'reprlib — Alternate repr()', 'https://reprlib'],
+        ['json', 'json — JSON encoder and decoder', 'https://json'],
+    ]
+    REF_INDEXES.pop('python', None)
+    SNAPSHOTS.pop('python', None)
+    assert get_ref_index('python', fx_sess) is None
+
+    publish_snapshot('python', fx_sess, body)
+    index = get_ref_index('python', fx_sess)
+    assert index.entries == body
+    assert get_ref_index('python', fx_sess) is index
+
+    entry, ratio = index.find('re')
+    assert entry == body[1]
+    assert ratio == 100
+    assert index.find('built-in functions')[0] == body[0]
+    assert index.find('쀍뗗') == (body[0], 0)
+
+    # index is rebuilt when new snapshot is published
+    publish_snapshot('python', fx_sess, body[1:])
+    assert get_ref_index('python', fx_sess).entries == body[1:]
+
+    REF_INDEXES.pop('python')
+    SNAPSHOTS.pop('python')
@@ -0,0 +1,88 @@
+import datetime
+from urllib.parse import urlencode
+
+import pytest
+
+from yui.apps.search.subway import (
+    STATION_INDEXES,
+    alias_key,
+    get_station_index,
+    search_route,
+    station_aliases,
+)
+from yui.apps.shared.cache import SNAPSHOTS, publish_snapshot
+from yui.utils import json
+
+
+def test_station_aliases():
+    assert station_aliases('강남') == ['강남']
+    assert station_aliases('총신대입구(이수)') == ['총신대입구', '이수']
+    assert alias_key('서울 역') == '서울'
+    assert alias_key('역') == '역'
+    assert alias_key('Digital Media City') == 'digitalmediacity'
+
+
+def test_station_index(fx_sess):
+    name = 'subway-test-v1'
+    stations = [
+        {'id': '1', 'name': '서울역'},
+        {'id': '2', 'name': '총신대입구(이수)'},
+        {'id': '3', 'name': '강남'},
+        {'id': '4', 'name': '강남구청'},
+    ]
+    STATION_INDEXES.pop(name, None)
+    SNAPSHOTS.pop(name, None)
+    assert get_station_index(name, fx_sess) is None
+
+    publish_snapshot(name, fx_sess, [{'realInfo': stations}])
+    index = get_station_index(name, fx_sess)
+    assert get_station_index(name, fx_sess) is index
+
+    assert index.find('서울') == (stations[0], 100)
+    assert index.find('이수역') == (stations[1], 100)
+    assert index.find('강남') == (stations[2], 100)
+    station, ratio = index.find('강남구청역앞')
+    assert station is stations[3]
+    assert ratio < 100
+
+    publish_snapshot(name, fx_sess, [{'realInfo': []}])
+    empty = get_station_index(name, fx_sess)
+    assert empty is not index
+    assert empty.find('강남') == (None, -1)
+
+
+@pytest.mark.asyncio
+async def test_search_route_cache(monkeypatch, fx_cache, response_mock):
+    def route_url(departure_time):
+        return 'https://map.naver.com/v5/api/subway/search?' + urlencode({
+            'serviceRegion': '1000',
+            'start': 'A',
+            'goal': 'B',
+            'departureTime': departure_time,
+        })
+
+    # each response is registered once, so extra request would fail
+    for departure_time, body in [
+        ('2020-01-01T23:50:00', {'paths': []}),
+        ('2020-01-01T23:50:00', {'paths': [1]}),
+        ('2020-01-02T00:00:00', {'paths': [2]}),
+    ]:
+        response_mock.get(
+            route_url(departure_time),
+            body=json.dumps(body),
+            headers={'Content-Type': 'application/json'},
+        )
+    times = iter([
+        datetime.datetime(2020, 1, 1, 23, 50, 10),
+        datetime.datetime(2020, 1, 1, 23, 51, 0),
+        datetime.datetime(2020, 1, 1, 23, 59, 59),
+        datetime.datetime(2020, 1, 2, 0, 1, 0),
+    ])
+    monkeypatch.setattr('yui.apps.search.subway.now', lambda: next(times))
+
+    # response without route is not cached
+    assert await search_route('1000', 'A', 'B') == {'paths': []}
+    assert await search_route('1000', 'A', 'B') == {'paths': [1]}
+    assert await search_route('1000', 'A', 'B') == {'paths': [1]}
+    # next time slot searches again
+    assert await search_route('1000', 'A', 'B') == {'paths': [2]}
@@ -2,7 +2,12 @@ import datetime
 
 from dateutil.tz import UTC, gettz
 
-from yui.apps.shared.cache import JSONCache
+from yui.apps.shared.cache import (
+    JSONCache,
+    SNAPSHOTS,
+    get_snapshot,
+    publish_snapshot,
+)
 from yui.utils.datetime import now
 
 
@@ -52,3 +57,30 @@ def test_json_cache_model_with_naive_dt(fx_sess):
     assert record.created_at == dt
     assert record.created_datetime == dt
     assert record.created_timezone is None
+
+
+def test_json_cache_snapshot(fx_sess, monkeypatch):
+    SNAPSHOTS.pop('test', None)
+    assert get_snapshot('test', fx_sess) is None
+
+    published = publish_snapshot('test', fx_sess, {'a': [1, 2]})
+    assert get_snapshot('test', fx_sess) is published
+    record = fx_sess.query(JSONCache).filter_by(name='test').one()
+    assert record.body == {'a': [1, 2]}
+
+    # other process stores new version
+    record.body = {'a': [3]}
+    record.created_at = now() + datetime.timedelta(seconds=1)
+    with fx_sess.begin():
+        fx_sess.add(record)
+
+    # trusted until next version check
+    assert get_snapshot('test', fx_sess) is published
+
+    monkeypatch.setattr('yui.apps.shared.cache.SNAPSHOT_CHECK_INTERVAL', 0)
+    loaded = get_snapshot('test', fx_sess)
+    assert loaded is not published
+    assert loaded.body == {'a': [3]}
+    assert get_snapshot('test', fx_sess) is loaded
+
+    SNAPSHOTS.pop('test')
@@ -34,6 +34,22 @@ def test_bot_init(monkeypatch, fx_config):
     ]
 
 
+@pytest.mark.asyncio
+async def test_bot_shutdown_database(fx_config):
+    box = Box()
+    order = []
+
+    @box.on_shutdown
+    async def flush(bot):
+        order.append('flush')
+
+    bot = Bot(fx_config, using_box=box)
+    bot.db.shutdown = lambda: order.append('db')
+
+    await bot.shutdown()
+    assert order == ['flush', 'db']
+
+
 @pytest.mark.asyncio
 async def test_call(fx_config, response_mock):
     token = 'asdf1234'
@@ -1,6 +1,8 @@
-from yui.box import Box
+from yui.box import Box, route
 from yui.box.apps.basic import App
-from yui.event import Hello
+from yui.event import Hello, Message, create_event
+
+from ..util import FakeBot
 
 
 def test_box_class():
@@ -57,3 +59,90 @@ def test_box_class():
 
     assert box.tasks[0].spec == '*/3 * * * *'
     assert box.tasks[0].handler == test4
+
+
+def test_box_get_apps():
+    box = Box()
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general')
+    user = bot.add_user('U1', 'item4')
+
+    @box.on(Hello)
+    async def on_hello():
+        pass
+
+    @box.on(Message)
+    async def on_message():
+        pass
+
+    @box.on(Message, subtype='*')
+    async def on_any_message():
+        pass
+
+    @box.on(Message, subtype='message_changed')
+    async def on_message_changed():
+        pass
+
+    @box.command('test1', ['t1'])
+    async def test1():
+        pass
+
+    @box.command('test2', subtype='*')
+    async def test2():
+        pass
+
+    class Route(route.RouteApp):
+        name = 'route'
+
+    route_app = Route()
+    box.register(route_app)
+
+    def handlers(event):
+        return [
+            getattr(a, 'handler', a)
+            for a in box.get_apps(event, '=')
+        ]
+
+    assert handlers(create_event({'type': 'hello'})) == [on_hello]
+    assert handlers(create_event({
+        'type': 'user_typing',
+        'channel': 'C1',
+        'user': 'U1',
+    })) == []
+    assert handlers(
+        bot.create_message(channel, user, text='hello')
+    ) == [on_message, on_any_message]
+    assert handlers(
+        bot.create_message(channel, user, text='=t1 hello')
+    ) == [on_message, on_any_message, test1]
+    assert handlers(
+        bot.create_message(channel, user, text='=test1')
+    ) == [on_message, on_any_message, test1]
+    assert handlers(
+        bot.create_message(channel, user, text='test1')
+    ) == [on_message, on_any_message]
+    assert handlers(
+        bot.create_message(channel, user, text='=route add')
+    ) == [on_message, on_any_message, route_app]
+    assert handlers(
+        bot.create_message(
+            channel,
+            user,
+            subtype='message_changed',
+            text='=test2',
+        )
+    ) == [on_any_message, on_message_changed, test2]
+    assert handlers(
+        bot.create_message(
+            channel,
+            user,
+            subtype='message_changed',
+            text='=test1',
+        )
+    ) == [on_any_message, on_message_changed]
+
+    # index is rebuilt after apps are changed
+    box.apps.pop()
+    assert handlers(
+        bot.create_message(channel, user, text='=route add')
+    ) == [on_message, on_any_message]
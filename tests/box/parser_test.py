@@ -243,3 +243,32 @@ def test_parse_option_and_arguments():
         parse_option_and_arguments(app.handler, chunks)
     assert e.value.msg == ('args: fail to transform argument value '
                            '(day is out of range for month)')
+
+
+def test_compile_plan():
+    box = Box()
+
+    @box.command('test-plan')
+    @option('--count', '-c', default=1)
+    @argument('words', nargs=-1)
+    async def test_plan(count: int, words):
+        pass
+
+    app: App = box.apps.pop()
+    plan = app.handler.plan
+
+    assert plan is not None
+    assert plan.lookup == {'--count': 0, '-c': 1}
+    assert parse_option_and_arguments(app.handler, ['-c=3', 'a', 'b']) == (
+        {'count': 3, 'words': ('a', 'b')},
+        [],
+    )
+    assert app.handler.plan is plan
+
+    option('--verbose', is_flag=True)(app.handler)
+    assert app.handler.plan is None
+    chunks = ['--verbose', 'a']
+    kw, remain_chunks = parse_option_and_arguments(app.handler, chunks)
+    assert kw['verbose']
+    assert app.handler.plan is not None
+    assert chunks == ['--verbose', 'a']
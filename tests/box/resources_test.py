@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+from yui.box.resources import Resources, resource_scope
+from yui.types.handler import Handler
+
+
+def make_bot():
+    return SimpleNamespace(
+        loop=None,
+        config=SimpleNamespace(
+            DATABASE_ENGINE=None,
+            DATABASE_URL='sqlite://',
+            DATABASE_ECHO=False,
+        ),
+    )
+
+
+def test_resources_inject():
+    bot = make_bot()
+
+    async def no_db(bot, event):
+        pass
+
+    async def with_db(bot, sess, engine_config, event):
+        pass
+
+    assert Handler(no_db).injections == ('bot',)
+    assert Handler(with_db).injections == ('bot', 'sess', 'engine_config')
+
+    resources = Resources(bot)
+    assert resources.inject(Handler(no_db).injections, {'x': 1}) == {
+        'x': 1,
+        'bot': bot,
+    }
+    assert resources._sess is None
+
+    kwargs = resources.inject(Handler(with_db).injections, {})
+    assert kwargs['sess'] is resources.sess
+    assert kwargs['engine_config'].url == 'sqlite://'
+    assert resources.engine_config is kwargs['engine_config']
+
+    resources.close()
+    assert resources._sess is None
+    assert resources.closed
+
+
+def test_resource_scope():
+    bot = make_bot()
+
+    with resource_scope(bot) as outer:
+        with resource_scope(bot) as inner:
+            assert inner is outer
+        sess = outer.sess
+        assert not outer.closed
+        with resource_scope(make_bot()) as other:
+            assert other is not outer
+        assert outer.sess is sess
+    assert outer.closed
+
+    with resource_scope(bot) as new:
+        assert new is not outer
@@ -1,6 +1,8 @@
 from typing import List, Set, Tuple
 
-from yui.box.utils import is_container
+from yui.box.utils import MessageCommand, get_command, is_container
+
+from ..util import FakeBot
 
 
 def test_is_container():
@@ -13,3 +15,38 @@ def test_is_container():
     assert not is_container(int)
     assert not is_container(float)
     assert not is_container(bool)
+
+
+def test_message_command():
+    command = MessageCommand('=ref  tomato &lt;b&gt;  "hello world"')
+    assert command.call == '=ref'
+    assert command.args == 'tomato &lt;b&gt;  "hello world"'
+    assert command.raw == 'tomato <b>  "hello world"'
+    assert command.get_chunks(True) == ['tomato', '<b>', 'hello world']
+    assert command.get_chunks(False) == [
+        'tomato', '<b>', '', '"hello', 'world"',
+    ]
+    assert command.subcommand.call == 'tomato'
+    assert command.subcommand is command.subcommand
+
+    command = MessageCommand('=echo "unclosed')
+    assert command.shlex_chunks is None
+    assert command.plain_chunks == ['"unclosed']
+
+    command = MessageCommand('')
+    assert command.call == ''
+    assert command.args == ''
+
+
+def test_get_command():
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general')
+    user = bot.add_user('U1', 'item4')
+
+    event = bot.create_message(channel, user, text='=help me')
+    command = get_command(event)
+    assert command.call == '=help'
+    assert get_command(event) is command
+
+    event = bot.create_message(channel, user)
+    assert get_command(event).call == ''
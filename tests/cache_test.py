@@ -0,0 +1,240 @@
+import asyncio
+
+import pytest
+
+from yui.cache import (
+    CHUNKED_HEADER,
+    Cache,
+    LocalCache,
+    cached,
+    make_key,
+    set_default_cache,
+)
+from yui.codec import Codec
+
+from .util import FakeMemcache
+
+
+def test_local_cache_lru():
+    local = LocalCache(max_bytes=16, ttl=10)
+    local.set(b'a', b'1234')
+    local.set(b'b', b'1234')
+    local.set(b'c', b'1234')
+    assert local.stats.size == 15
+
+    assert local.get(b'a') == b'1234'
+    local.set(b'd', b'1234')
+
+    assert list(local.entries) == [b'c', b'a', b'd']
+    assert local.get(b'b') is None
+    assert local.stats.evictions == 1
+    assert local.stats.hits == 1
+    assert local.stats.misses == 1
+    assert local.stats.count == 3
+
+    local.set(b'big', b'x' * 30)
+    assert local.get(b'big') is None
+    assert local.stats.count == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_local_tier():
+    mc = FakeMemcache()
+    cache = Cache(mc, 'TEST_', local=LocalCache(ttl=0.05, negative_ttl=10))
+
+    await cache.set('a', {'x': 1})
+    mc.calls.clear()
+
+    first = await cache.get('a')
+    first['x'] = 2
+    assert await cache.get('a') == {'x': 1}
+    assert mc.calls == []
+
+    assert await cache.get('none', 'default') == 'default'
+    assert await cache.get('none') is None
+    assert mc.calls == [('get', b'TEST_none')]
+    mc.calls.clear()
+
+    await asyncio.sleep(0.06)
+    mc.data[b'TEST_a'] = b'"new"'
+    assert await cache.get('a') == 'new'
+    assert mc.calls == [('get', b'TEST_a')]
+    mc.calls.clear()
+
+    mc.data[b'TEST_b'] = b'3'
+    assert await cache.multi_get('a', 'b', 'none') == ['new', 3, None]
+    assert mc.calls == [('multi_get', (b'TEST_b',))]
+
+    await cache.delete('a')
+    assert await cache.get('a') is None
+
+    assert not await cache.add('b', 4)
+    assert await cache.get('b') == 3
+
+    stats = cache.stats()
+    assert stats.hits == 5
+    assert stats.misses == 5
+    assert Cache(mc).stats() is None
+
+
+@pytest.mark.asyncio
+async def test_cache_get_or_set():
+    mc = FakeMemcache()
+    cache = Cache(mc, 'TEST_')
+    other = Cache(mc, 'TEST_')
+    calls = []
+    release = asyncio.Event()
+
+    async def loader():
+        calls.append('load')
+        await release.wait()
+        return {'value': len(calls)}
+
+    tasks = [
+        asyncio.ensure_future(cache.get_or_set('key', loader, ttl=60))
+        for _ in range(5)
+    ]
+    # other process waits lease instead of calling loader
+    tasks.append(asyncio.ensure_future(
+        other.get_or_set('key', loader, ttl=60),
+    ))
+    await asyncio.sleep(0.01)
+    assert calls == ['load']
+    assert b'TEST_key.lease' in mc.data
+
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert results == [{'value': 1}] * 6
+    assert calls == ['load']
+    assert b'TEST_key.lease' not in mc.data
+    assert not cache.inflight
+    assert await cache.get_or_set('key', loader, ttl=60) == {'value': 1}
+    assert calls == ['load']
+
+
+@pytest.mark.asyncio
+async def test_cache_get_or_set_stale():
+    mc = FakeMemcache()
+    cache = Cache(mc, 'TEST_')
+    values = iter(['old', 'new'])
+
+    async def loader():
+        return next(values)
+
+    assert await cache.get_or_set('key', loader, ttl=0, stale_ttl=60) == \
+        'old'
+
+    # stale value is returned immediately and refreshed in background
+    assert await cache.get_or_set('key', loader, ttl=0, stale_ttl=60) == \
+        'old'
+    await asyncio.sleep(0.01)
+    assert not cache.inflight
+    assert (await cache.get('key'))['value'] == 'new'
+
+    # without stale_ttl, caller waits for loading
+    async def failing_loader():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        await cache.get_or_set('key', failing_loader, ttl=60)
+    assert b'TEST_key.lease' not in mc.data
+
+
+@pytest.mark.asyncio
+async def test_cached():
+    calls = []
+
+    @cached(ttl=60, max_bytes=60)
+    async def fetch(name: str, count: int = 1):
+        calls.append((name, count))
+        return name * count
+
+    mc = FakeMemcache()
+    set_default_cache(Cache(mc, 'TEST_'))
+    try:
+        assert await fetch('a') == 'a'
+        assert await fetch('a', count=1) == 'a'
+        assert await fetch(count=1, name='a') == 'a'
+        assert await fetch('b', 2) == 'bb'
+        assert calls == [('a', 1), ('b', 2)]
+        assert make_key(fetch.__wrapped__, 'a') == \
+            make_key(fetch.__wrapped__, name='a', count=1)
+
+        # too big result is not stored
+        assert await fetch('c', 60) == 'c' * 60
+        assert await fetch('c', 60) == 'c' * 60
+        assert calls[-2:] == [('c', 60), ('c', 60)]
+
+        # call function directly when cache fails
+        async def broken(*args, **kwargs):
+            raise ConnectionRefusedError
+
+        mc.get = broken
+        assert await fetch('a') == 'a'
+        assert calls[-1] == ('a', 1)
+    finally:
+        set_default_cache(None)
+
+    assert await fetch('a') == 'a'
+    assert calls[-1] == ('a', 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_chunk():
+    mc = FakeMemcache()
+    cache = Cache(mc, 'TEST_', codec=Codec(), chunk_size=100)
+    value = ['x' * 10] * 30
+
+    await cache.set('big', value)
+    assert len(mc.data) == 6
+    assert mc.data[b'TEST_big'][0] == CHUNKED_HEADER
+    assert mc.data[b'TEST_big.manifest'] == mc.data[b'TEST_big']
+    assert all(len(v) <= 100 for v in mc.data.values())
+
+    assert await cache.get('big') == value
+    assert await cache.multi_get('big', 'none') == [value, None]
+
+    await cache.set('small', 'x')
+    assert mc.data[b'TEST_small'] == b'\x01"x"'
+
+    # lost chunk means missing value
+    del mc.data[next(k for k in mc.data if k.endswith(b'.2'))]
+    assert await cache.get('big') is None
+
+
+@pytest.mark.asyncio
+async def test_cache_chunk_cleanup():
+    mc = FakeMemcache()
+    cache = Cache(mc, 'TEST_', codec=Codec(), chunk_size=100)
+    big = ['x' * 10] * 30
+
+    def chunk_keys():
+        return {k for k in mc.data if b'.chunk.' in k}
+
+    await cache.set('big', big)
+    first = chunk_keys()
+    assert len(first) == 4
+
+    # overwrite removes chunks of previous value
+    await cache.set('big', ['y' * 10] * 30)
+    second = chunk_keys()
+    assert len(second) == 4
+    assert not first & second
+    assert await cache.get('big') == ['y' * 10] * 30
+
+    # small value needs no lookup of the whole old value
+    mc.calls.clear()
+    await cache.set('big', 'small')
+    assert chunk_keys() == set()
+    assert b'TEST_big.manifest' not in mc.data
+    assert ('get', b'TEST_big') not in mc.calls
+
+    # lost add removes chunks it wrote
+    assert not await cache.add('big', big)
+    assert chunk_keys() == set()
+    assert await cache.get('big') == 'small'
+
+    await cache.set('big', big)
+    await cache.delete('big')
+    assert mc.data == {}
@@ -0,0 +1,50 @@
+import pytest
+
+from yui.codec import Codec, CodecError, has_msgpack, has_zstd
+
+
+def test_codec():
+    value = {'text': 'hello' * 1000, 'number': 1, 'list': [1.5, None]}
+
+    codec = Codec()
+    data = codec.encode(value)
+    assert data[0] == 0x01
+    assert codec.decode(data) == value
+
+    codec = Codec.from_name('json+zlib')
+    assert codec.name == 'json+zlib'
+    data = codec.encode(value)
+    assert data[0] == 0x02
+    assert len(data) < 200
+    assert codec.decode(data) == value
+
+    # small data is not compressed
+    assert codec.encode('short')[0] == 0x01
+
+    # old values without header
+    assert codec.decode(b'{"a": 1}') == {'a': 1}
+    assert codec.decode(b'"text"') == 'text'
+
+    with pytest.raises(CodecError):
+        Codec('unknown')
+
+    with pytest.raises(CodecError):
+        Codec.from_name('json+unknown')
+
+
+@pytest.mark.skipif(not has_msgpack, reason='msgpack is not installed')
+def test_codec_msgpack():
+    codec = Codec.from_name('msgpack+zlib')
+    value = {'text': 'hello' * 1000, 'binary': b'\x00\x01'}
+    data = codec.encode(value)
+    assert data[0] == 0x05
+    assert Codec().decode(data) == value
+
+
+@pytest.mark.skipif(not has_zstd, reason='zstandard is not installed')
+def test_codec_zstd():
+    codec = Codec.from_name('json+zstd')
+    value = ['hello'] * 1000
+    data = codec.encode(value)
+    assert data[0] == 0x03
+    assert Codec().decode(data) == value
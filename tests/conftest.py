@@ -10,9 +10,12 @@ from sqlalchemy.exc import ProgrammingError
 
 from yui.bot import Bot
 from yui.box import Box
+from yui.cache import Cache, set_default_cache
 from yui.config import Config, DEFAULT
 from yui.orm import Base, make_session
 
+from .util import FakeMemcache
+
 
 DEFAULT_DATABASE_URL = 'sqlite://'
 
@@ -124,3 +127,15 @@ def fx_config():
 def response_mock():
     with aioresponses.aioresponses() as m:
         yield m
+
+
+@pytest.yield_fixture()
+def fx_cache():
+    """Make :func:`yui.cache.cached` use cache on fake memcached."""
+
+    cache = Cache(FakeMemcache(), 'TEST_')
+    set_default_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_default_cache(None)
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+
+import pytest
+
+from yui.dispatcher import Dispatcher, get_lane_key
+from yui.event import create_event
+
+from .util import FakeBot
+
+
+def test_get_lane_key():
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general')
+    user = bot.add_user('U1', 'item4')
+
+    assert get_lane_key(bot.create_message(channel, user)) == 'C1'
+    assert get_lane_key(create_event({
+        'type': 'pin_added',
+        'user': 'U1',
+        'channel_id': 'C2',
+    })) == 'C2'
+    assert get_lane_key(create_event({'type': 'hello'})) == ''
+
+
+def test_dispatcher_route():
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general')
+    user = bot.add_user('U1', 'item4')
+    queue: asyncio.Queue = asyncio.Queue()
+    dispatcher = Dispatcher(queue, 4)
+
+    e1 = bot.create_message(channel, user, text='1')
+    e2 = bot.create_message(channel, user, text='2')
+    assert dispatcher.route(e1) is dispatcher.route(e2)
+    hello = create_event({'type': 'hello'})
+    assert dispatcher.route(hello) is not dispatcher.route(hello)
+    assert set(dispatcher.lanes) == {'C1'}
+    assert len(dispatcher.unordered) == 2
+
+    with pytest.raises(ValueError):
+        Dispatcher(queue, 0)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_run():
+    bot = FakeBot()
+    user = bot.add_user('U1', 'item4')
+    slow = bot.add_channel('C1', 'slow')
+    fast = bot.add_channel('C2', 'fast')
+    queue: asyncio.Queue = asyncio.Queue()
+    dispatcher = Dispatcher(queue, 8)
+
+    handled = []
+    release = asyncio.Event()
+
+    async def callback(event):
+        if event.text == 'slow-1':
+            await release.wait()
+        handled.append(event.text)
+
+    for text in ['slow-1', 'slow-2']:
+        await queue.put(bot.create_message(slow, user, text=text))
+    await queue.put(bot.create_message(fast, user, text='fast'))
+
+    task = asyncio.ensure_future(dispatcher.run(callback))
+    await asyncio.sleep(0.05)
+
+    # other channel is not blocked, but same channel keeps order
+    assert handled == ['fast']
+    status = dispatcher.status()
+    assert status.queue_size == 0
+    assert status.running == 1
+    assert status.busy_lanes == 1
+    assert [x.key for x in status.lanes] == ['C1']
+    busy = status.lanes[0]
+    assert busy.current.text == 'slow-1'
+    assert busy.queue_size == 1
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert handled == ['fast', 'slow-1', 'slow-2']
+    status = dispatcher.status()
+    assert status.running == 0
+    assert status.handled == 3
+    assert status.lanes == []
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_concurrency():
+    bot = FakeBot()
+    user = bot.add_user('U1', 'item4')
+    channels = [bot.add_channel(f'C{i}', f'ch{i}') for i in range(3)]
+    queue: asyncio.Queue = asyncio.Queue()
+    dispatcher = Dispatcher(queue, 2)
+
+    handled = []
+    release = asyncio.Event()
+
+    async def callback(event):
+        if event.text.startswith('block'):
+            await release.wait()
+        handled.append(event.text)
+
+    task = asyncio.ensure_future(dispatcher.run(callback))
+
+    # blocked channel does not delay others while slots remain
+    await queue.put(bot.create_message(channels[0], user, text='block-a'))
+    await queue.put(bot.create_message(channels[1], user, text='b'))
+    await asyncio.sleep(0.01)
+    assert handled == ['b']
+
+    # but no more than size handlers run at once
+    await queue.put(bot.create_message(channels[1], user, text='block-b'))
+    await queue.put(bot.create_message(channels[2], user, text='c'))
+    await asyncio.sleep(0.01)
+    assert handled == ['b']
+    assert dispatcher.status().running == 2
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert sorted(handled) == ['b', 'block-a', 'block-b', 'c']
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_failure():
+    bot = FakeBot()
+    channel = bot.add_channel('C1', 'general')
+    user = bot.add_user('U1', 'item4')
+    queue: asyncio.Queue = asyncio.Queue()
+    dispatcher = Dispatcher(queue, 2)
+
+    async def callback(event):
+        raise ValueError(event.text)
+
+    await queue.put(bot.create_message(channel, user, text='boom'))
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(dispatcher.run(callback), 1)
+    assert dispatcher.lanes == {}
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_unordered(monkeypatch, caplog):
+    monkeypatch.setattr('yui.dispatcher.STATUS_LOG_INTERVAL', 0.01)
+    queue: asyncio.Queue = asyncio.Queue()
+    dispatcher = Dispatcher(queue, 4)
+
+    handled = []
+    release = asyncio.Event()
+
+    async def callback(event):
+        if event.type == 'hello':
+            await release.wait()
+        handled.append(event.type)
+
+    task = asyncio.ensure_future(dispatcher.run(callback))
+    with caplog.at_level(logging.DEBUG, logger='yui.dispatcher'):
+        # events without channel do not wait each other
+        await queue.put(create_event({'type': 'hello'}))
+        await queue.put(create_event({'type': 'goodbye'}))
+        await asyncio.sleep(0.05)
+        assert handled == ['goodbye']
+        assert dispatcher.status().busy_lanes == 1
+
+    assert any('running 1/4' in r.message for r in caplog.records)
+    assert any("lane '': busy" in r.message for r in caplog.records)
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert handled == ['goodbye', 'hello']
+    assert not dispatcher.unordered
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from yui.orm import AsyncDatabase
+from yui.orm.engine import create_database_engine
+
+
+@pytest.mark.asyncio
+async def test_async_database(fx_tmpdir):
+    engine = create_database_engine(f'sqlite:///{fx_tmpdir}/test.db', False)
+    db = AsyncDatabase(engine, max_workers=1)
+    assert db.executor is not None
+
+    def work(sess, value):
+        return threading.get_ident(), sess.execute(f'SELECT {value}').scalar()
+
+    try:
+        ident, value = await db.run(work, 42)
+        assert ident != threading.get_ident()
+        assert value == 42
+        assert db.stats.count == 1
+        assert db.stats.blocking_count == 0
+
+        engine.execute('SELECT 1')
+        assert db.stats.count == 2
+        assert db.stats.blocking_count == 1
+        assert db.stats.blocking_total <= db.stats.total
+
+        # listeners are attached once per engine
+        other = AsyncDatabase(engine, max_workers=1)
+        assert other.stats is db.stats
+        engine.execute('SELECT 1')
+        assert db.stats.count == 3
+        other.shutdown()
+
+        # executor is replaced, so it works again after reconnect
+        executor = db.executor
+        db.shutdown()
+        assert db.executor is not executor
+        assert (await db.run(work, 7))[1] == 7
+    finally:
+        db.shutdown()
+        engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_async_database_memory():
+    engine = create_database_engine('sqlite://', False)
+    db = AsyncDatabase(engine)
+    assert db.executor is None
+
+    engine.execute('CREATE TABLE test (id INTEGER)')
+    try:
+        tables = await db.run(lambda sess: engine.table_names())
+        assert tables == ['test']
+    finally:
+        engine.dispose()
@@ -0,0 +1,112 @@
+from yui.registry import Registry, get_dm_name
+from yui.types.channel import DirectMessageChannel, PublicChannel
+from yui.types.user import User
+
+from .util import FakeBot
+
+
+def test_registry():
+    FakeBot()
+    general = PublicChannel(id='C1', name='general', creator='U0')
+    random = PublicChannel(id='C2', name='random', creator='U0')
+
+    registry = Registry([general])
+    assert registry == [general]
+    assert registry.get_by_id('C1') is general
+    assert registry.get_by_name('general') is general
+    assert registry.get_by_id('C2') is None
+
+    registry.append(random)
+    assert registry.get_by_id('C2') is random
+    assert registry.get_by_name('random') is random
+
+    renamed = PublicChannel(id='C2', name='free', creator='U0')
+    registry.replace(renamed)
+    assert registry == [general, renamed]
+    assert registry.get_by_id('C2') is renamed
+    assert registry.get_by_name('free') is renamed
+    assert registry.get_by_name('random') is None
+
+    registry[:] = [random]
+    assert registry.get_by_id('C1') is None
+    assert registry.get_by_id('C2') is random
+
+    assert registry.discard('C2') is random
+    assert registry == []
+    assert registry.get_by_id('C2') is None
+
+    registry.extend([general, random])
+    registry.pop(0)
+    assert registry.get_by_id('C1') is None
+    registry.clear()
+    assert registry.get_by_name('random') is None
+
+
+def test_registry_dm():
+    bot = FakeBot()
+    user = bot.add_user('U1', 'item4')
+    dm = DirectMessageChannel(id='D1', user='U1')
+
+    registry = Registry([dm], name_getter=get_dm_name)
+    assert registry.get_by_name('item4') is dm
+    assert dm.user is user
+
+
+def test_bot_registry_attribute():
+    bot = FakeBot()
+    assert isinstance(bot.users, Registry)
+
+    bot.users = [User(id='U1', name='item4', team_id='T0')]
+    assert isinstance(bot.users, Registry)
+    assert bot.users.get_by_name('item4').id == 'U1'
+
+    channel = bot.add_channel('C1', 'general')
+    assert bot.channels.get_by_id('C1') is channel
+    bot.add_dm('D1', 'U1')
+    assert bot.ims.get_by_name('item4').id == 'D1'
+
+
+def test_registry_duplicated_keys():
+    FakeBot()
+    first = PublicChannel(id='C1', name='general', creator='U0')
+    second = PublicChannel(id='C2', name='general', creator='U0')
+    third = PublicChannel(id='C3', name='random', creator='U0')
+
+    registry = Registry([first, second, third])
+    assert registry.get_by_name('general') is first
+
+    registry.insert(0, third)
+    assert registry.get_by_id('C3') is third
+
+    registry.discard('C1')
+    assert registry.get_by_name('general') is second
+    assert registry.get_by_id('C3') is third
+    assert registry == [third, second, third]
+
+    del registry[0]
+    assert registry.get_by_id('C3') is third
+    registry.remove(third)
+    assert registry.get_by_id('C3') is None
+
+    # first one wins after reordering
+    registry.extend([first, third])
+    registry.sort(key=lambda x: x.id, reverse=True)
+    assert registry.get_by_name('general') is second
+    registry.reverse()
+    assert registry.get_by_name('general') is first
+    registry *= 2
+    assert len(registry) == 6
+    assert registry.get_by_name('general') is first
+
+
+def test_registry_refresh():
+    FakeBot()
+    general = PublicChannel(id='C1', name='general', creator='U0')
+    random = PublicChannel(id='C2', name='random', creator='U0')
+    registry = Registry([general, random])
+
+    general.name = 'renamed'
+    registry.refresh(general)
+    assert registry.get_by_name('general') is None
+    assert registry.get_by_name('renamed') is general
+    assert registry.get_by_id('C1') is general
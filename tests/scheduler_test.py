@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import pytest
+
+from yui.scheduler import (
+    Priority,
+    RateLimit,
+    Scheduler,
+    TIERS,
+    TokenBucket,
+    get_bucket_key,
+    get_priority,
+    get_rate_limit,
+    lane,
+)
+from yui.types.slack.response import APIResponse
+
+
+def ok():
+    return APIResponse(body={'ok': True}, status=200, headers={})
+
+
+async def ok_request():
+    return ok()
+
+
+def test_get_rate_limit():
+    assert get_rate_limit('users.list') == TIERS[2]
+    assert get_rate_limit('unknown.method') == TIERS[3]
+    assert get_rate_limit('chat.postMessage').per_minute == 60
+
+
+def test_get_bucket_key():
+    assert get_bucket_key('users.info', channel='C1') == \
+        ('users.info', '', '')
+    assert get_bucket_key('chat.postMessage', channel='C1') != \
+        get_bucket_key('chat.postMessage', channel='C2')
+    assert get_bucket_key('chat.delete', channel='C1') != \
+        get_bucket_key('chat.delete', channel='C1', token='xoxp')
+    assert get_bucket_key('chat.delete', channel='C1', token=None) == \
+        ('chat.delete', '', '')
+
+
+def test_lane():
+    assert get_priority() == Priority.NORMAL
+    with lane(Priority.BULK):
+        assert get_priority() == Priority.BULK
+        with lane(Priority.INTERACTIVE):
+            assert get_priority() == Priority.INTERACTIVE
+        assert get_priority() == Priority.BULK
+    assert get_priority() == Priority.NORMAL
+
+
+@pytest.mark.asyncio
+async def test_scheduler_priority():
+    scheduler = Scheduler()
+    bucket = scheduler.buckets[get_bucket_key('test')] = TokenBucket(
+        scheduler,
+        RateLimit(per_minute=1200, burst=1),
+    )
+    sent = []
+
+    def request(name):
+        async def func():
+            sent.append(name)
+            return ok()
+        return func
+
+    await scheduler.run('test', request('first'))
+    assert bucket.tokens < 1
+
+    with lane(Priority.BULK):
+        bulk = [
+            asyncio.ensure_future(scheduler.run('test', request(f'bulk{i}')))
+            for i in range(3)
+        ]
+    await asyncio.sleep(0)
+    interactive = asyncio.ensure_future(scheduler.run(
+        'test',
+        request('interactive'),
+        priority=Priority.INTERACTIVE,
+    ))
+
+    await asyncio.gather(*bulk, interactive)
+
+    assert sent == ['first', 'interactive', 'bulk0', 'bulk1', 'bulk2']
+    assert not bucket.waiters
+
+
+@pytest.mark.asyncio
+async def test_scheduler_retry_after():
+    scheduler = Scheduler(max_retries=1)
+    scheduler.buckets[get_bucket_key('test')] = TokenBucket(
+        scheduler,
+        RateLimit(per_minute=6000, burst=10),
+    )
+    calls = []
+
+    async def request():
+        calls.append(time.monotonic())
+        return APIResponse(
+            body={'ok': False, 'error': 'ratelimited'},
+            status=429,
+            headers={'Retry-After': '0.1'},
+        )
+
+    started_at = time.monotonic()
+    resp = await scheduler.run('test', request)
+
+    assert resp.status == 429
+    assert len(calls) == 2
+    assert calls[1] - started_at >= 0.1
+
+    # other methods also wait
+    scheduler.pause(0.1)
+    started_at = time.monotonic()
+    await scheduler.run('users.info', ok_request)
+    assert time.monotonic() - started_at >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_channel_bucket():
+    scheduler = Scheduler()
+    sent = []
+
+    def request(name):
+        async def func():
+            sent.append(name)
+            return ok()
+        return func
+
+    # busy channel does not delay replies in other channels
+    for i in range(5):
+        await scheduler.run('chat.postMessage', request(f'busy{i}'),
+                            channel='C1')
+    started_at = time.monotonic()
+    await scheduler.run('chat.postMessage', request('other'), channel='C2')
+    await scheduler.run('chat.delete', request('bot'), channel='C1')
+    await scheduler.run('chat.delete', request('user'), channel='C1',
+                        token='xoxp')
+    assert time.monotonic() - started_at < 0.1
+    assert sent[-3:] == ['other', 'bot', 'user']
+
+    # chat.delete is limited per workspace, not per channel
+    await scheduler.run('chat.delete', request('bot2'), channel='C2')
+    assert scheduler.get_bucket(get_bucket_key('chat.delete')).tokens < \
+        TIERS[3].burst - 1
+    assert set(scheduler.buckets) == {
+        ('chat.postMessage', 'C1', ''),
+        ('chat.postMessage', 'C2', ''),
+        ('chat.delete', '', ''),
+        ('chat.delete', '', 'xoxp'),
+    }
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from yui.session import HTTPPool
+
+
+@pytest.mark.asyncio
+async def test_http_pool_share_connector():
+    pool = HTTPPool(limit=10, limit_per_host=2, dns_cache_ttl=60)
+
+    connector = pool.connector
+    assert connector.limit == 10
+    assert connector.limit_per_host == 2
+    assert connector.use_dns_cache
+
+    async with pool.client_session() as s1:
+        assert s1.connector is connector
+    assert s1.closed
+    assert not connector.closed
+
+    async with pool.client_session() as s2:
+        assert s2.connector is connector
+
+    long_lived = pool.session('slack')
+    assert pool.session('slack') is long_lived
+    assert pool.session('other') is not long_lived
+    assert long_lived.connector is connector
+
+    await pool.close()
+
+    assert long_lived.closed
+    assert connector.closed
+    assert pool.connector is not connector
+    await pool.close()
+
+
+def test_http_pool_configure():
+    pool = HTTPPool()
+    pool.configure(limit=5, limit_per_host=1)
+
+    assert pool.limit == 5
+    assert pool.limit_per_host == 1
+
+    with pytest.raises(TypeError):
+        pool.configure(wrong_key=1)
+
+    with pytest.raises(TypeError):
+        pool.configure(_connector=None)
+
+
+def test_http_pool_new_loop():
+    pool = HTTPPool()
+    current_loop = asyncio.get_event_loop()
+    old_loop = asyncio.new_event_loop()
+    new_loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(old_loop)
+        connector = pool.connector
+        session = pool.session('slack')
+
+        asyncio.set_event_loop(new_loop)
+        assert pool.connector is not connector
+        assert session.closed
+        assert pool.session('slack') is not session
+
+        # retired connector is closed with pool
+        assert not connector.closed
+        new_loop.run_until_complete(pool.close())
+        assert connector.closed
+    finally:
+        asyncio.set_event_loop(current_loop)
+        old_loop.close()
+        new_loop.close()
+
+
+def test_http_pool_new_running_loop():
+    pool = HTTPPool()
+    current_loop = asyncio.get_event_loop()
+    loop_a = asyncio.new_event_loop()
+    loop_b = asyncio.new_event_loop()
+
+    async def get_connector():
+        return pool.connector
+
+    async def switch():
+        connector = pool.connector
+        await pool.close()
+        return connector
+
+    try:
+        asyncio.set_event_loop(loop_a)
+        old = loop_a.run_until_complete(get_connector())
+
+        # switch loops while new loop is running
+        asyncio.set_event_loop(loop_b)
+        new = loop_b.run_until_complete(switch())
+        assert new is not old
+        assert old.closed
+        assert new.closed
+    finally:
+        asyncio.set_event_loop(current_loop)
+        loop_a.close()
+        loop_b.close()
@@ -20,6 +20,37 @@ from yui.types.namespace import Namespace
 from yui.types.user import User
 
 
+class FakeMemcache:
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.calls = []
+
+    async def set(self, key, value, exptime=0):
+        self.calls.append(('set', key))
+        self.data[key] = value
+        return True
+
+    async def add(self, key, value, exptime=0):
+        self.calls.append(('add', key))
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        self.calls.append(('get', key))
+        return self.data.get(key)
+
+    async def multi_get(self, *keys):
+        self.calls.append(('multi_get', keys))
+        return tuple(self.data.get(k) for k in keys)
+
+    async def delete(self, key):
+        self.calls.append(('delete', key))
+        self.data.pop(key, None)
+
+
 @attr.dataclass(slots=True)
 class Call:
     """API Call from bot"""
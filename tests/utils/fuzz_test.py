@@ -1,8 +1,20 @@
+import unicodedata
+
 from fuzzywuzzy import fuzz
 
 
 from yui.utils.fuzz import (
+    Choices,
+    KOREAN_ALPHABETS_FIRST_MAP,
+    KOREAN_ALPHABETS_MIDDLE_MAP,
+    KOREAN_END,
+    KOREAN_START,
+    NORMALIZE_CACHE_SIZE,
+    NgramIndex,
+    Normalized,
+    best_matches,
     match,
+    ngrams,
     normalize_korean_nfc_to_nfd,
     partial_ratio,
     ratio,
@@ -77,3 +89,77 @@ def test_match():
     assert match('소드 아트 온라인', '소드 아트 온라인') == 100
     assert match('소드 아트 온라인', '소드아트온라인') == 100
     assert match('소드 아트 온라인', '소드 오라토리아') == 71
+
+
+def test_best_matches():
+    names = ['강남', '강남구청', '신논현', '교대', '강변']
+    assert best_matches('강남', names) == [('강남', 100)]
+    assert best_matches('강남', names, k=3) == sorted(
+        ((n, ratio('강남', n)) for n in names),
+        key=lambda x: -x[1],
+    )[:3]
+
+    stations = Choices(
+        [{'name': n} for n in names],
+        key=lambda x: x['name'],
+    )
+    station, score = best_matches('교대역', stations)[0]
+    assert station == {'name': '교대'}
+    assert score == ratio('교대역', '교대')
+    assert stations.scores('신논현', 'match') == [
+        match('신논현', n) for n in names
+    ]
+    assert best_matches(Normalized.of('강'), [], k=3) == []
+
+    # earlier choice wins on same score
+    assert best_matches('ab', ['ac', 'ad'], k=1) == [('ac', 50)]
+
+    for scorer, func in [
+        ('partial_ratio', partial_ratio),
+        ('token_sort_ratio', token_sort_ratio),
+    ]:
+        assert Choices(names).scores('강남 구청', scorer) == [
+            func('강남 구청', n) for n in names
+        ]
+
+
+def legacy_normalize_korean_nfc_to_nfd(value: str) -> str:
+    """Implementation before translate table, as reference."""
+
+    for from_, to_ in KOREAN_ALPHABETS_FIRST_MAP.items():
+        value = value.replace(from_, to_)
+
+    for from_, to_ in KOREAN_ALPHABETS_MIDDLE_MAP.items():
+        value = value.replace(from_, to_)
+
+    return ''.join(
+        unicodedata.normalize('NFD', x) if KOREAN_START <= ord(x) <= KOREAN_END
+        else x for x in list(value)
+    )
+
+
+def test_normalize_nfd_equivalence():
+    text = ''.join(chr(x) for x in range(0x10000))
+    assert normalize_korean_nfc_to_nfd(text) == \
+        legacy_normalize_korean_nfc_to_nfd(text)
+
+    for value in ['', '강남구청역', 'ㄱㅏ나ㅁ', 'Re:제로부터 시작하는 이세계 생활']:
+        assert normalize_korean_nfc_to_nfd(value) == \
+            legacy_normalize_korean_nfc_to_nfd(value)
+
+    normalize_korean_nfc_to_nfd.cache_clear()
+    normalize_korean_nfc_to_nfd('강남')
+    normalize_korean_nfc_to_nfd('강남')
+    info = normalize_korean_nfc_to_nfd.cache_info()
+    assert info.hits == 1
+    assert info.maxsize == NORMALIZE_CACHE_SIZE
+
+
+def test_ngram_index():
+    assert ngrams('Re', 3) == {' re', 're '}
+
+    index = NgramIndex(['font-family', 'font-size', 'color', 'background'])
+    assert len(index) == 4
+    assert index.shortlist('font', 2) == [0, 1]
+    assert index.shortlist('colour', 10) == [2]
+    assert index.shortlist('쀍뗗', 10) == []
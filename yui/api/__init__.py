@@ -1,6 +1,6 @@
 from .chat import Chat
 from .conversations import Conversations
-from .endpoint import Endpoint
+from .endpoint import Endpoint, MAX_PAGE_SIZE, PaginationError
 from .users import Users
 
 
@@ -1,7 +1,7 @@
-from typing import List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from .encoder import bool2str
-from .endpoint import Endpoint
+from .endpoint import Endpoint, MAX_PAGE_SIZE
 from ..types.base import ChannelID, Ts, UserID
 from ..types.channel import Channel
 from ..types.slack.response import APIResponse
@@ -20,6 +20,9 @@ class Conversations(Endpoint):
         latest: Optional[Ts] = None,
         oldest: Optional[Ts] = None,
         unreads: Optional[bool] = None,
+        *,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> APIResponse:
         """https://api.slack.com/methods/conversations.history"""
 
@@ -47,8 +50,46 @@ class Conversations(Endpoint):
         if unreads is not None:
             params['unreads'] = bool2str(unreads)
 
+        if cursor:
+            params['cursor'] = cursor
+
+        if limit is not None:
+            params['limit'] = str(limit)
+
         return await self._call('history', params)
 
+    def iter_history(
+        self,
+        channel: Union[Channel, ChannelID],
+        *,
+        inclusive: Optional[bool] = None,
+        latest: Optional[Ts] = None,
+        oldest: Optional[Ts] = None,
+        limit: int = MAX_PAGE_SIZE,
+        total: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate messages of every page of history.
+
+        With total, no more than given count of messages are yielded, and
+        pages after them are not fetched.
+
+        """
+
+        return self._paginate(
+            'history',
+            lambda cursor, size: self.history(
+                channel,
+                inclusive=inclusive,
+                latest=latest,
+                oldest=oldest,
+                cursor=cursor,
+                limit=size,
+            ),
+            'messages',
+            limit=limit,
+            total=total,
+        )
+
     async def info(
         self,
         channel: Union[Channel, ChannelID],
@@ -90,6 +131,29 @@ class Conversations(Endpoint):
 
         return await self._call('list', params)
 
+    def iter_list(
+        self,
+        *,
+        exclude_archived: bool = True,
+        exclude_members: bool = True,
+        limit: int = MAX_PAGE_SIZE,
+        types: str = 'public_channel',
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate channels of every page of list."""
+
+        return self._paginate(
+            'list',
+            lambda cursor, size: self.list(
+                cursor=cursor,
+                exclude_archived=exclude_archived,
+                exclude_members=exclude_members,
+                limit=size,
+                types=types,
+            ),
+            'channels',
+            limit=limit,
+        )
+
     async def open(
         self,
         *,
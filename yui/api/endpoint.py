@@ -1,7 +1,22 @@
-from typing import Dict
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
 
 from ..types.slack.response import APIResponse
 
+#: Largest page size which Slack API accepts for cursor pagination.
+MAX_PAGE_SIZE = 999
+
+
+class PaginationError(Exception):
+    """Slack API returned failed response in middle of pagination."""
+
+    def __init__(self, method: str, response: APIResponse) -> None:
+        super(PaginationError, self).__init__(
+            f'fail to fetch page of {method}: {response.body}'
+        )
+
+        self.response = response
+
 
 class Endpoint:
     """Slack API endpoint."""
@@ -19,3 +34,59 @@ class Endpoint:
         token=None,
     ) -> APIResponse:
         return await self.bot.call(f'{self.name}.{method}', data, token=token)
+
+    async def _paginate(
+        self,
+        method: str,
+        fetch: Callable[[Optional[str], int], Awaitable[APIResponse]],
+        key: str,
+        *,
+        limit: int = MAX_PAGE_SIZE,
+        total: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield items of every page, following ``next_cursor``.
+
+        Next page is fetched while caller consumes current one. Pages are
+        fetched in the context of caller, so lane of scheduler is kept.
+        With ``total``, no more than that count of items are yielded, and
+        each page asks only for items which are still needed.
+
+        """
+
+        def page_size(received: int) -> int:
+            size = min(limit, MAX_PAGE_SIZE)
+            if total is not None:
+                size = min(size, total - received)
+            return size
+
+        if total is not None and total <= 0:
+            return
+
+        received = 0
+        yielded = 0
+        task: Optional[asyncio.Future] = asyncio.ensure_future(
+            fetch(None, page_size(received)),
+        )
+        try:
+            while task is not None:
+                resp = await task
+                task = None
+                body = resp.body
+                if not isinstance(body, dict) or not body.get('ok'):
+                    raise PaginationError(f'{self.name}.{method}', resp)
+
+                items = body.get(key, [])
+                received += len(items)
+                cursor = body.get('response_metadata', {}).get('next_cursor')
+                if cursor and (total is None or received < total):
+                    task = asyncio.ensure_future(
+                        fetch(cursor, page_size(received)),
+                    )
+                for item in items:
+                    if total is not None and yielded >= total:
+                        return
+                    yielded += 1
+                    yield item
+        finally:
+            if task is not None:
+                task.cancel()
@@ -1,7 +1,7 @@
-from typing import Optional, Union
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from .encoder import bool2str
-from .endpoint import Endpoint
+from .endpoint import Endpoint, MAX_PAGE_SIZE
 from ..types.base import UserID
 from ..types.slack.response import APIResponse
 from ..types.user import User
@@ -48,3 +48,24 @@ class Users(Endpoint):
             params['presence'] = bool2str(presence)
 
         return await self._call('list', params)
+
+    def iter_members(
+        self,
+        *,
+        include_locale: Optional[bool] = None,
+        limit: int = MAX_PAGE_SIZE,
+        presence: Optional[bool] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate users of every page of list."""
+
+        return self._paginate(
+            'list',
+            lambda cursor, size: self.list(
+                cursor,
+                include_locale=include_locale,
+                limit=size,
+                presence=presence,
+            ),
+            'members',
+            limit=limit,
+        )
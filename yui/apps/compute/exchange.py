@@ -4,6 +4,7 @@ from typing import Dict
 from urllib.parse import urlencode
 
 from ...box import box
+from ...cache import cached
 from ...command import argument
 from ...event import Message
 from ...session import client_session
@@ -35,6 +36,7 @@ class WrongUnit(ExchangeError):
     """Wrong unit."""
 
 
+@cached(ttl=10 * 60, stale_ttl=60 * 60)
 async def get_exchange_rate(base: str, to: str) -> Dict:
     """Get exchange rate."""
 
@@ -1,6 +1,7 @@
 from typing import Any, Dict, Optional, Set, Tuple
 
 from ...box import box
+from ...cache import cached
 from ...command import argument, option
 from ...event import Message
 from ...session import client_session
@@ -113,6 +114,7 @@ AVAILABLE_COMBINATIONS: Set[Tuple[str, str]] = {
 AVAILABLE_COMBINATIONS |= {(t, s) for s, t in AVAILABLE_COMBINATIONS}
 
 
+@cached(ttl=24 * 60 * 60)
 async def detect_language(headers: Dict[str, str], text: str) -> str:
     url = 'https://openapi.naver.com/v1/papago/detectLangs'
     async with client_session(headers=headers) as session:
@@ -121,6 +123,7 @@ async def detect_language(headers: Dict[str, str], text: str) -> str:
             return result['langCode']
 
 
+@cached(ttl=24 * 60 * 60)
 async def _translate(
     headers: Dict[str, str],
     source: str,
@@ -1,5 +1,12 @@
 import asyncio
 import logging
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import aiomcache
+
+import attr
 
 from ..bot import APICallError, BotReconnect
 from ..box import box
@@ -7,7 +14,6 @@ from ..event import (
     ChannelArchive,
     ChannelCreated,
     ChannelDeleted,
-    ChannelHistoryChanged,
     ChannelJoined,
     ChannelLeft,
     ChannelMarked,
@@ -16,7 +22,6 @@ from ..event import (
     ChatterboxSystemStart,
     GroupArchive,
     GroupClose,
-    GroupHistoryChanged,
     GroupJoined,
     GroupLeft,
     GroupMarked,
@@ -25,13 +30,13 @@ from ..event import (
     GroupUnarchive,
     IMClose,
     IMCreated,
-    IMHistoryChanged,
     IMMarked,
     IMOpen,
     TeamJoin,
     TeamMigrationStarted,
     UserChange,
 )
+from ..scheduler import Priority, lane
 from ..types.channel import (
     DirectMessageChannel,
     PrivateChannel,
@@ -41,6 +46,14 @@ from ..types.user import User
 
 logger = logging.getLogger(__name__)
 
+BOOTSTRAP_CONCURRENCY = 10
+BOOTSTRAP_PROGRESS_STEP = 100
+SNAPSHOT_KEY = 'WORKSPACE_SNAPSHOT'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXPTIME = 60 * 60 * 24 * 7
+WORKSPACE_TYPE = Dict[str, List[Dict[str, Any]]]
+MUTATION_DEBOUNCE = 2.0
+
 
 async def retry(callback, *args, **kwargs):
     while True:
@@ -52,58 +65,277 @@ async def retry(callback, *args, **kwargs):
             raise
 
 
-@box.on(ChatterboxSystemStart)
-async def on_start(bot):
+class Bootstrap:
+    """Call Slack API concurrently on bulk lane of scheduler."""
+
+    def __init__(self, concurrency: int = BOOTSTRAP_CONCURRENCY) -> None:
+        """Initialize"""
+
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.total = 0
+        self.done = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    async def call(self, callback, *args, **kwargs):
+        async with self.semaphore:
+            with lane(Priority.BULK):
+                return await callback(*args, **kwargs)
+
+    def progress(self):
+        self.done += 1
+        if self.done % BOOTSTRAP_PROGRESS_STEP == 0:
+            logger.info(
+                f'bootstrap {self.done}/{self.total} channels '
+                f'({self.elapsed:.2f}s)'
+            )
+
+
+def compact(data: Dict[str, Any], cls) -> Dict[str, Any]:
+    """Keep only non-empty fields which given namespace class declares."""
+
+    names = {f.name for f in attr.fields(cls) if f.init}
+    result = {
+        k: v for k, v in data.items()
+        if k in names and v not in (None, '', [], {})
+    }
+    profile = result.get('profile')
+    if isinstance(profile, dict):
+        result['profile'] = {
+            k: v for k, v in profile.items()
+            if v and not k.startswith('image_')
+        }
+    return result
+
+
+async def fetch_workspace(
+    bot,
+    bootstrap: Bootstrap,
+    *,
+    live: bool = False,
+) -> WORKSPACE_TYPE:
+    """Fetch compact payloads of users and all kind of channels.
+
+    With ``live``, each channel is also stored into bot as soon as it is
+    fetched, so cold start does not wait for whole workspace.
+
+    """
+
+    workspace: WORKSPACE_TYPE = {
+        'channels': [],
+        'ims': [],
+        'groups': [],
+        'users': [],
+    }
+    users_fetched = asyncio.Event()
+
+    async def fetch_channel(channel_id: str):
+        resp = await bootstrap.call(bot.api.conversations.info, channel_id)
+        bootstrap.progress()
+        if not resp.body['ok']:
+            return
+        channel = resp.body['channel']
+        if live:
+            if channel.get('is_im'):
+                # name of DM channel comes from its user
+                await users_fetched.wait()
+            store_channel(bot, channel)
+        if channel.get('is_channel'):
+            workspace['channels'].append(compact(channel, PublicChannel))
+        elif channel.get('is_im'):
+            workspace['ims'].append(compact(channel, DirectMessageChannel))
+        elif channel.get('is_group'):
+            workspace['groups'].append(compact(channel, PrivateChannel))
+
     async def channels():
-        cursor = None
-        bot.channels.clear()
-        while True:
-            result = await bot.api.conversations.list(
-                cursor=cursor,
+        tasks = []
+        with lane(Priority.BULK):
+            async for c in bot.api.conversations.iter_list(
                 types='public_channel,private_channel,im',
-            )
-            cursor = None
-            await asyncio.sleep(0.1)
-            if 'response_metadata' in result.body:
-                cursor = result.body['response_metadata'].get('next_cursor')
-            for c in result.body['channels']:
-                resp = await bot.api.conversations.info(c['id'])
-                if not resp.body['ok']:
-                    continue
-                channel = resp.body['channel']
-                if channel.get('is_channel'):
-                    bot.channels.append(
-                        PublicChannel(**channel)
-                    )
-                elif channel.get('is_im'):
-                    bot.ims.append(
-                        DirectMessageChannel(**channel)
-                    )
-                elif channel.get('is_group'):
-                    bot.groups.append(
-                        PrivateChannel(**channel)
-                    )
-                await asyncio.sleep(0.1)
-            if not cursor:
-                break
+            ):
+                bootstrap.total += 1
+                tasks.append(asyncio.ensure_future(fetch_channel(c['id'])))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def fetch_users():
+        with lane(Priority.BULK):
+            return [
+                compact(u, User)
+                async for u in bot.api.users.iter_members(presence=False)
+            ]
 
     async def users():
-        bot.users.clear()
-        result = await retry(bot.api.users.list, presence=False)
-        for u in result.body['members']:
-            bot.users.append(User(**u))
+        try:
+            workspace['users'] = await retry(fetch_users)
+            if live:
+                bot.users = [
+                    User(**u) for u in workspace['users']  # type: ignore
+                ]
+        finally:
+            users_fetched.set()
 
-    bot.is_ready = False
+    results = await asyncio.gather(
+        channels(),
+        users(),
+        return_exceptions=True,
+    )
+    for r in results:
+        if isinstance(r, Exception):
+            raise r
+
+    return workspace
+
+
+def apply_workspace(bot, workspace: WORKSPACE_TYPE):
+    """Replace state of bot with given payloads."""
+
+    # users first, channels refer them.
+    bot.users = [
+        User(**u) for u in workspace['users']  # type: ignore
+    ]
+    bot.channels = [
+        PublicChannel(**c) for c in workspace['channels']  # type: ignore
+    ]
+    bot.ims = [
+        DirectMessageChannel(**c) for c in workspace['ims']  # type: ignore
+    ]
+    bot.groups = [
+        PrivateChannel(**c) for c in workspace['groups']  # type: ignore
+    ]
+
+
+async def load_snapshot(bot) -> Optional[WORKSPACE_TYPE]:
+    """Load workspace snapshot from cache."""
+
+    try:
+        snapshot = await bot.cache.get(SNAPSHOT_KEY)
+    except (OSError, aiomcache.ClientException):
+        logger.exception('fail to load workspace snapshot')
+        return None
+
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.info('workspace snapshot has old version. ignore it')
+        return None
+    return snapshot['workspace']
 
-    await asyncio.wait(
-        (
-            channels(),
-            users(),
-        ),
-        return_when=asyncio.FIRST_EXCEPTION,
+
+async def save_snapshot(bot, workspace: WORKSPACE_TYPE):
+    """Save workspace snapshot into cache."""
+
+    try:
+        await bot.cache.set(
+            SNAPSHOT_KEY,
+            {
+                'version': SNAPSHOT_VERSION,
+                'saved_at': time.time(),
+                'workspace': workspace,
+            },
+            exptime=SNAPSHOT_EXPTIME,
+        )
+    except (OSError, aiomcache.ClientException):
+        logger.exception('fail to save workspace snapshot')
+
+
+MUTATION_TYPE = Tuple[Callable[..., None], Tuple[Any, ...]]
+
+#: Mutations applied while reconciles of bot are fetching workspace.
+_journals: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+#: Running reconcile task of each bot.
+_reconciles: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def mutate(bot, func: Callable[..., None], *args):
+    """Apply ``func(bot, *args)`` to registries of bot.
+
+    While reconcile is running, mutation is also recorded and applied again
+    after reconcile replaces registries, so it is not reverted by workspace
+    fetched before it.
+
+    """
+
+    func(bot, *args)
+    for journal in _journals.get(bot, ()):
+        journal.append((func, args))
+
+
+async def reconcile(bot):
+    """Fetch fresh workspace state and replace snapshot with it."""
+
+    bootstrap = Bootstrap()
+    journal: List[MUTATION_TYPE] = []
+    journals = _journals.setdefault(bot, [])
+    journals.append(journal)
+    try:
+        workspace = await fetch_workspace(bot, bootstrap)
+    except Exception:
+        logger.exception('fail to reconcile workspace')
+        return
+    finally:
+        journals.remove(journal)
+    apply_workspace(bot, workspace)
+    for func, args in journal:
+        func(bot, *args)
+    await save_snapshot(bot, workspace)
+    logger.info(
+        f'reconcile end. {bootstrap.done}/{bootstrap.total} channels, '
+        f'{len(bot.users)} users in {bootstrap.elapsed:.2f}s'
     )
 
+
+def start_reconcile(bot) -> asyncio.Future:
+    """Run reconcile in background, or get the one already running."""
+
+    task = _reconciles.get(bot)
+    if task is None or task.done():
+        task = _reconciles[bot] = asyncio.ensure_future(reconcile(bot))
+        task.add_done_callback(log_reconcile_error)
+    return task
+
+
+def log_reconcile_error(task: asyncio.Future):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error('reconcile failed', exc_info=task.exception())
+
+
+@box.on(ChatterboxSystemStart)
+async def on_start(bot):
+    bot.is_ready = False
+    started_at = time.monotonic()
+
+    workspace = await load_snapshot(bot)
+    if workspace is not None:
+        apply_workspace(bot, workspace)
+        bot.is_ready = True
+        logger.info(
+            f'warm start with snapshot. {len(bot.channels)} channels, '
+            f'{len(bot.users)} users in {time.monotonic() - started_at:.2f}s'
+        )
+        start_reconcile(bot)
+        return True
+
+    bootstrap = Bootstrap()
+    bot.channels.clear()
+    bot.ims.clear()
+    bot.groups.clear()
+    try:
+        workspace = await fetch_workspace(bot, bootstrap, live=True)
+    except Exception:
+        logger.exception('fail to bootstrap workspace')
+    else:
+        await save_snapshot(bot, workspace)
+
     bot.is_ready = True
+    logger.info(
+        f'bootstrap end. {bootstrap.done}/{bootstrap.total} channels, '
+        f'{len(bot.users)} users in {bootstrap.elapsed:.2f}s'
+    )
 
     return True
 
@@ -112,7 +344,7 @@ async def on_start(bot):
 async def on_team_join(bot, event: TeamJoin):
     logger.info('on team join start')
     res = await retry(bot.api.users.info, event.user)
-    bot.users.append(User(**res.body['user']))  # type: ignore
+    mutate(bot, store_user, res.body['user'])
     logger.info('on team join end')
 
     return True
@@ -126,109 +358,160 @@ async def on_user_change(bot, event: UserChange):
     logger.info('on user change start')
     res = await retry(bot.api.users.info, event.user)
 
-    bot.users[:] = [
-        u for u in bot.users if u.id != event.user.id
-    ] + [User(**res.body['user'])]  # type: ignore
+    mutate(bot, store_user, res.body['user'])
     logger.info('on user change end')
 
     return True
 
 
-@box.on(ChannelArchive)
-@box.on(ChannelCreated)
-@box.on(ChannelDeleted)
-@box.on(ChannelHistoryChanged)
-@box.on(ChannelJoined)
-@box.on(ChannelLeft)
-@box.on(ChannelMarked)
-@box.on(ChannelUnarchive)
-@box.on(ChannelRename)
-async def public_channel_mutation_detected(bot):
-    logger.info('public_channel_mutation_detected start')
-    cursor = None
-    new_channels = []
-    while True:
-        result = await bot.api.conversations.list(
-            cursor=cursor,
-            types='public_channel',
+def store_user(bot, user: Dict[str, Any]):
+    """Put given user payload into registry of bot."""
+
+    obj = User(**user)  # type: ignore
+    bot.users.replace(obj)
+    # name of DM channel comes from its user
+    for dm in bot.ims:
+        if dm.user.id == obj.id:
+            dm.user = obj
+            bot.ims.refresh(dm)
+
+
+def store_channel(bot, channel: Dict[str, Any]):
+    """Put given channel payload into proper registry of bot."""
+
+    channel_id = channel['id']
+    if channel.get('is_channel'):
+        registry = bot.channels
+        obj = PublicChannel(**channel)  # type: ignore
+    elif channel.get('is_im'):
+        registry = bot.ims
+        obj = DirectMessageChannel(**channel)  # type: ignore
+    elif channel.get('is_group'):
+        registry = bot.groups
+        obj = PrivateChannel(**channel)  # type: ignore
+    else:
+        return
+
+    for other in (bot.channels, bot.ims, bot.groups):
+        if other is not registry:
+            other.discard(channel_id)
+    registry.replace(obj)
+
+
+def forget_channel(bot, channel_id: str):
+    """Remove channel from every registry of bot."""
+
+    for registry in (bot.channels, bot.ims, bot.groups):
+        registry.discard(channel_id)
+
+
+def mark_channel(bot, channel_id: str, ts: str):
+    """Update last read ts of channel."""
+
+    for registry in (bot.channels, bot.ims, bot.groups):
+        channel = registry.get_by_id(channel_id)
+        if channel is not None:
+            channel.last_read = ts
+
+
+async def refresh_channel(bot, channel_id: str):
+    """Fetch one channel and update registry of bot with it."""
+
+    resp = await bot.api.conversations.info(channel_id)
+    if not resp.body['ok'] or resp.body['channel'].get('is_archived'):
+        mutate(bot, forget_channel, channel_id)
+    else:
+        mutate(bot, store_channel, resp.body['channel'])
+
+
+class ChannelRefresher:
+    """Coalesce burst of mutation events into one refresh per channel."""
+
+    def __init__(self, bot, delay: float = MUTATION_DEBOUNCE) -> None:
+        """Initialize"""
+
+        self.bot = bot
+        self.delay = delay
+        self.pending: Dict[str, asyncio.Future] = {}
+
+    def schedule(self, channel_id: str) -> bool:
+        """Refresh given channel after debounce window.
+
+        Return :const:`False` if refresh was already scheduled.
+
+        """
+
+        if channel_id in self.pending:
+            return False
+        self.pending[channel_id] = asyncio.ensure_future(
+            self._refresh(channel_id)
         )
-        await asyncio.sleep(0.1)
-        cursor = result.body.get('response_metadata', {}).get('next_cursor')
-        for c in result.body['channels']:
-            res = await bot.api.conversations.info(c['id'])
-            new_channels.append(
-                PublicChannel(**res.body['channel'])
-            )
-            await asyncio.sleep(0.1)
-        if not cursor:
-            break
+        return True
+
+    async def _refresh(self, channel_id: str):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            del self.pending[channel_id]
+        try:
+            with lane(Priority.BULK):
+                await refresh_channel(self.bot, channel_id)
+        except Exception:
+            logger.exception(f'fail to refresh channel {channel_id}')
 
-    bot.channels[:] = new_channels
-    logger.info('public_channel_mutation_detected end')
+
+_refreshers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_refresher(bot) -> ChannelRefresher:
+    try:
+        return _refreshers[bot]
+    except KeyError:
+        refresher = _refreshers[bot] = ChannelRefresher(bot)
+        return refresher
+
+
+@box.on(ChannelMarked)
+@box.on(GroupMarked)
+@box.on(IMMarked)
+async def channel_marked(
+    bot,
+    event: Union[ChannelMarked, GroupMarked, IMMarked],
+):
+    if event.channel.is_unknown:
+        get_refresher(bot).schedule(event.channel.id)
+    else:
+        mutate(bot, mark_channel, event.channel.id, event.ts)
     return True
 
 
+@box.on(ChannelArchive)
+@box.on(ChannelDeleted)
 @box.on(GroupArchive)
+@box.on(GroupLeft)
+async def channel_removed(
+    bot,
+    event: Union[ChannelArchive, ChannelDeleted, GroupArchive, GroupLeft],
+):
+    mutate(bot, forget_channel, event.channel.id)
+    return True
+
+
+@box.on(ChannelCreated)
+@box.on(ChannelJoined)
+@box.on(ChannelLeft)
+@box.on(ChannelRename)
+@box.on(ChannelUnarchive)
 @box.on(GroupClose)
-@box.on(GroupHistoryChanged)
 @box.on(GroupJoined)
-@box.on(GroupLeft)
-@box.on(GroupMarked)
 @box.on(GroupOpen)
 @box.on(GroupRename)
 @box.on(GroupUnarchive)
-async def private_channel_mutation_detected(bot):
-    logger.info('private_channel_mutation_detected start')
-    new_groups = []
-    cursor = None
-    while True:
-        result = await bot.api.conversations.list(
-            cursor=cursor,
-            types='private_channel',
-        )
-        await asyncio.sleep(0.1)
-        cursor = result.body.get('response_metadata', {}).get('next_cursor')
-        for c in result.body['channels']:
-            res = await bot.api.conversations.info(c['id'])
-            new_groups.append(
-                PrivateChannel(**res.body['channel'])
-            )
-            await asyncio.sleep(0.1)
-        if not cursor:
-            break
-
-    bot.groups[:] = new_groups
-    logger.info('private_channel_mutation_detected end')
-    return True
-
-
 @box.on(IMClose)
 @box.on(IMCreated)
-@box.on(IMHistoryChanged)
-@box.on(IMMarked)
 @box.on(IMOpen)
-async def direct_message_channel_mutation_detected(bot):
-    logger.info('direct_message_channel_mutation_detected start')
-    new_ims = []
-    cursor = None
-    while True:
-        result = await bot.api.conversations.list(
-            cursor=cursor,
-            types='im',
-        )
-        await asyncio.sleep(0.1)
-        cursor = result.body.get('response_metadata', {}).get('next_cursor')
-        for c in result.body['channels']:
-            res = await bot.api.conversations.info(c['id'])
-            new_ims.append(
-                DirectMessageChannel(**res.body['channel'])
-            )
-            await asyncio.sleep(0.1)
-        if not cursor:
-            break
-
-    bot.ims[:] = new_ims
-    logger.info('direct_message_channel_mutation_detected end')
+async def channel_changed(bot, event):
+    get_refresher(bot).schedule(event.channel.id)
     return True
 
 
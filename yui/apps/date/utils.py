@@ -1,6 +1,7 @@
 import datetime
 from typing import List
 
+from ...cache import cached
 from ...session import client_session
 from ...utils import json
 
@@ -9,17 +10,24 @@ class APIDoesNotSupport(Exception):
     pass
 
 
-async def get_holiday_names(dt: datetime.datetime) -> List[str]:
+@cached(ttl=24 * 60 * 60, stale_ttl=7 * 24 * 60 * 60)
+async def fetch_holiday_names(day: datetime.date) -> List[str]:
     url = 'https://item4.net/api/holiday'
     async with client_session() as session:
         async with session.get(
-            '{}/{}'.format(url, dt.strftime('%Y/%m/%d'))
+            '{}/{}'.format(url, day.strftime('%Y/%m/%d'))
         ) as resp:
             if resp.status == 200:
                 return await resp.json(loads=json.loads)
     raise APIDoesNotSupport
 
 
+async def get_holiday_names(dt: datetime.datetime) -> List[str]:
+    """Get names of holidays of the day. Cached for each day, not time."""
+
+    return await fetch_holiday_names(dt.date())
+
+
 def weekend_loading_percent(dt: datetime.datetime) -> float:
     weekday = dt.weekday()
     if weekday in [5, 6]:
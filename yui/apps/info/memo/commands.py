@@ -10,7 +10,7 @@ from ....utils.datetime import now
 @box.command('기억')
 @argument('keyword')
 @argument('text', nargs=-1, concat=True)
-async def memo_add(bot, event: Message, sess, keyword: str, text: str):
+async def memo_add(bot, event: Message, db, keyword: str, text: str):
     """
     기억 레코드 생성
 
@@ -25,8 +25,11 @@ async def memo_add(bot, event: Message, sess, keyword: str, text: str):
     memo.text = text
     memo.created_at = now()
 
-    with sess.begin():
-        sess.add(memo)
+    def add(sess):
+        with sess.begin():
+            sess.add(memo)
+
+    await db.run(add)
 
     await bot.say(
         event.channel,
@@ -39,7 +42,7 @@ async def memo_add(bot, event: Message, sess, keyword: str, text: str):
 
 @box.command('알려')
 @argument('keyword', nargs=-1, concat=True)
-async def memo_show(bot, event: Message, sess, keyword: str):
+async def memo_show(bot, event: Message, db, keyword: str):
     """
     기억 레코드 출력
 
@@ -47,13 +50,18 @@ async def memo_show(bot, event: Message, sess, keyword: str):
 
     """
 
-    memos = sess.query(Memo).filter_by(keyword=keyword)\
-        .order_by(Memo.created_datetime).all()
+    def fetch(sess):
+        return [
+            text for text, in sess.query(Memo.text).filter_by(keyword=keyword)
+            .order_by(Memo.created_datetime)
+        ]
+
+    texts = await db.run(fetch)
 
-    if memos:
+    if texts:
         await bot.say(
             event.channel,
-            f'`{keyword}`: ' + ' | '.join(x.text for x in memos)
+            f'`{keyword}`: ' + ' | '.join(texts)
         )
     else:
         await bot.say(
@@ -67,7 +75,7 @@ async def memo_show(bot, event: Message, sess, keyword: str):
 
 @box.command('잊어')
 @argument('keyword', nargs=-1, concat=True)
-async def memo_delete(bot, event: Message, sess, keyword: str):
+async def memo_delete(bot, event: Message, db, keyword: str):
     """
     기억 레코드 삭제
 
@@ -75,7 +83,9 @@ async def memo_delete(bot, event: Message, sess, keyword: str):
 
     """
 
-    sess.query(Memo).filter_by(keyword=keyword).delete()
+    await db.run(
+        lambda sess: sess.query(Memo).filter_by(keyword=keyword).delete()
+    )
 
     await bot.say(
         event.channel,
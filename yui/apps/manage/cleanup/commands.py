@@ -66,6 +66,7 @@ async def cleanup(bot, sess, event: Message, count: int, mode: str):
                 )
                 return
 
+    truncated = False
     if event.channel in channels and mode == 'log':
         deleted = await cleanup_by_event_logs(
             bot,
@@ -74,16 +75,16 @@ async def cleanup(bot, sess, event: Message, count: int, mode: str):
             event.ts,
         )
     else:
-        deleted = await cleanup_by_history(
+        deleted, truncated = await cleanup_by_history(
             bot,
             event.channel,
             event.ts,
             count,
         )
 
-    await bot.say(
-        event.channel,
-        f'본 채널에서 최근 {deleted:,}개의 메시지를 삭제했어요!',
-    )
+    text = f'본 채널에서 최근 {deleted:,}개의 메시지를 삭제했어요!'
+    if truncated:
+        text += ' 채널 기록을 끝까지 불러오지 못해서 일부 메시지는 남아있어요.'
+    await bot.say(event.channel, text)
 
     cleanup.last_call[event.channel.id] = now_dt
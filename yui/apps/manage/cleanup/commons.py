@@ -1,11 +1,19 @@
-import asyncio
-import random
-from typing import Optional
+import logging
+from typing import Iterable, List, Optional, Tuple
 
 
-from .models import EventLog
+from .deleter import DeleteReport, bulk_delete
+from .models import EventLog, ts_to_micro
+from .recorder import recorder
+from ....api import PaginationError
+from ....scheduler import Priority, lane
 from ....types.channel import Channel
 
+#: Count of rows deleted by one query.
+PRUNE_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
 
 async def cleanup_by_event_logs(
     bot,
@@ -14,30 +22,67 @@ async def cleanup_by_event_logs(
     ts: str,
     count: Optional[int] = None,
 ) -> int:
-    deleted = 0
-    logs = sess.query(EventLog).filter(
-        EventLog.channel == channel.id,
-        EventLog.ts <= ts,
-    ).order_by(EventLog.ts.desc())
-    if count:
-        logs = logs.limit(count)
-    for log in logs:  # type: EventLog
-        resp = await bot.api.chat.delete(
-            log.channel,
-            log.ts,
-            token=bot.config.OWNER_USER_TOKEN,
-        )
-        ok = resp.body['ok']
-        if ok or (
-            not ok
-            and resp.body['error'] == 'message_not_found'
-        ):
-            deleted += ok
-            with sess.begin():
-                sess.delete(log)
-        await asyncio.sleep(random.uniform(0.02, 0.5))
-
-    return deleted
+    report = await cleanup_channels_by_event_logs(
+        bot,
+        sess,
+        [channel],
+        ts,
+        count,
+    )
+    return report.deleted
+
+
+async def cleanup_channels_by_event_logs(
+    bot,
+    sess,
+    channels: Iterable[Channel],
+    ts: str,
+    count: Optional[int] = None,
+) -> DeleteReport:
+    """Delete logged messages of all channels in one pipeline."""
+
+    await recorder.flush(bot)
+    ids: List[int] = []
+    messages: List[Tuple[str, str]] = []
+    for channel in channels:
+        logs = sess.query(EventLog.id, EventLog.ts).filter(
+            EventLog.channel == channel.id,
+            EventLog.ts_micro <= ts_to_micro(ts),
+        ).order_by(EventLog.ts_micro.desc())
+        if count:
+            logs = logs.limit(count)
+        for id_, log_ts in logs:
+            ids.append(id_)
+            messages.append((channel.id, log_ts))
+
+    report = await bulk_delete(bot, messages)
+
+    done = [id_ for id_, s in zip(ids, report.statuses) if s.gone]
+    for i in range(0, len(done), PRUNE_BATCH_SIZE):
+        with sess.begin():
+            sess.query(EventLog).filter(
+                EventLog.id.in_(done[i:i+PRUNE_BATCH_SIZE]),
+            ).delete(synchronize_session=False)
+
+    return report
+
+
+def prune_event_logs(sess, before: int) -> int:
+    """Delete logs older than given microseconds, in batches."""
+
+    pruned = 0
+    while True:
+        ids = [
+            id_ for id_, in sess.query(EventLog.id)
+            .filter(EventLog.ts_micro < before)
+            .limit(PRUNE_BATCH_SIZE)
+        ]
+        if not ids:
+            return pruned
+        with sess.begin():
+            pruned += sess.query(EventLog).filter(
+                EventLog.id.in_(ids),
+            ).delete(synchronize_session=False)
 
 
 async def cleanup_by_history(
@@ -45,25 +90,32 @@ async def cleanup_by_history(
     channel: Channel,
     ts: str,
     count: int = 100,
-) -> int:
-    deleted = 0
-    history = await bot.api.conversations.history(
-        channel,
-        count=count,
-        latest=ts,
-        unreads=True,
-    )
+) -> Tuple[int, bool]:
+    """Delete recent messages found in history of channel.
+
+    Returns count of deleted messages, and whether history was truncated by
+    failed page, so some messages were not even tried.
+
+    """
 
-    if history.body['ok']:
-        for message in history.body['messages']:
-            r = await bot.api.chat.delete(
+    messages: List[Tuple[str, str]] = []
+    truncated = False
+    with lane(Priority.BULK):
+        try:
+            async for message in bot.api.conversations.iter_history(
                 channel,
-                message['ts'],
-                token=bot.config.OWNER_USER_TOKEN,
+                latest=ts,
+                total=count,
+            ):
+                messages.append((channel.id, message['ts']))
+        except PaginationError:
+            logger.warning(
+                'history of %s was truncated after %d messages',
+                channel.id,
+                len(messages),
+                exc_info=True,
             )
-            if not r.body['ok']:
-                break
-            deleted += 1
-            await asyncio.sleep(random.uniform(0.02, 0.5))
+            truncated = True
 
-    return deleted
+    report = await bulk_delete(bot, messages, stop_on_error=True)
+    return report.deleted, truncated
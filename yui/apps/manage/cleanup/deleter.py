@@ -0,0 +1,108 @@
+import asyncio
+import enum
+import logging
+import time
+from typing import Iterable, List, Tuple
+
+import attr
+
+from ....scheduler import Priority, lane
+
+#: Count of ``chat.delete`` calls in flight. Rate is limited by scheduler.
+DELETE_CONCURRENCY = 8
+
+logger = logging.getLogger(__name__)
+
+
+class DeleteStatus(enum.Enum):
+    deleted = 'deleted'
+    not_found = 'not_found'
+    failed = 'failed'
+    skipped = 'skipped'
+
+    @property
+    def gone(self) -> bool:
+        """Message is not in channel anymore."""
+
+        return self in (DeleteStatus.deleted, DeleteStatus.not_found)
+
+
+@attr.dataclass(slots=True)
+class DeleteReport:
+    statuses: List[DeleteStatus]
+    elapsed: float
+
+    @property
+    def deleted(self) -> int:
+        return self.statuses.count(DeleteStatus.deleted)
+
+    @property
+    def rate(self) -> float:
+        """Deleted messages per second."""
+
+        if self.elapsed <= 0:
+            return 0.0
+        return self.deleted / self.elapsed
+
+
+async def bulk_delete(
+    bot,
+    messages: Iterable[Tuple[str, str]],
+    *,
+    stop_on_error: bool = False,
+    concurrency: int = DELETE_CONCURRENCY,
+) -> DeleteReport:
+    """Delete ``(channel, ts)`` messages concurrently.
+
+    Calls are paced by the scheduler of bot in bulk lane, so interactive
+    calls are not delayed. ``chat.delete`` of every channel shares one
+    bucket of owner token, so whole run stays within rate limit of the
+    method. With ``stop_on_error``, other workers are cancelled at first
+    failure, and messages of cancelled calls are reported as skipped.
+
+    """
+
+    targets = list(messages)
+    statuses = [DeleteStatus.skipped] * len(targets)
+    pending = iter(range(len(targets)))
+    token = bot.config.OWNER_USER_TOKEN
+    workers: List[asyncio.Future] = []
+
+    async def worker():
+        for i in pending:
+            channel, ts = targets[i]
+            resp = await bot.api.chat.delete(channel, ts, token=token)
+            if resp.body['ok']:
+                statuses[i] = DeleteStatus.deleted
+            elif resp.body.get('error') == 'message_not_found':
+                statuses[i] = DeleteStatus.not_found
+            else:
+                statuses[i] = DeleteStatus.failed
+                if stop_on_error:
+                    current = asyncio.current_task()
+                    for w in workers:
+                        if w is not current:
+                            w.cancel()
+                    return
+
+    started = time.monotonic()
+    with lane(Priority.BULK):
+        workers.extend(
+            asyncio.ensure_future(worker())
+            for _ in range(min(concurrency, len(targets)))
+        )
+    if workers:
+        await asyncio.wait(workers)
+    for w in workers:
+        if not w.cancelled():
+            w.result()
+    report = DeleteReport(statuses, time.monotonic() - started)
+    if targets:
+        logger.info(
+            'deleted %d/%d messages in %.1fs (%.2f/s)',
+            report.deleted,
+            len(targets),
+            report.elapsed,
+            report.rate,
+        )
+    return report
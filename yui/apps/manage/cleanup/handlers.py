@@ -1,18 +1,21 @@
-from .models import EventLog
+from .recorder import recorder
 from ....box import box
 from ....command import Cs
 from ....event import Message
 
 
 @box.on(Message, subtype='*')
-async def make_log(bot, event: Message, sess):
+async def make_log(bot, event: Message):
     try:
         channels = Cs.auto_cleanup_targets.gets()
     except KeyError:
         return True
 
     if event.channel in channels:
-        log = EventLog(channel=event.channel.id, ts=event.ts)
-        with sess.begin():
-            sess.add(log)
+        await recorder.record(bot, event.channel.id, event.ts)
     return True
+
+
+@box.on_shutdown
+async def flush_event_logs(bot):
+    await recorder.flush(bot)
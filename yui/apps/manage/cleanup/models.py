@@ -1,16 +1,30 @@
-from sqlalchemy.schema import Column
-from sqlalchemy.types import Integer, String
+from sqlalchemy.schema import Column, Index
+from sqlalchemy.types import BigInteger, Integer, String
 
 from ....orm import Base
 
 
+def ts_to_micro(ts: str) -> int:
+    """Convert Slack timestamp like ``1577836800.000100`` to microseconds."""
+
+    seconds, _, fraction = ts.partition('.')
+    return int(seconds) * 1000000 + int(fraction[:6].ljust(6, '0'))
+
+
 class EventLog(Base):
     """EventLog for cleanup function"""
 
     __tablename__ = 'event_log'
 
+    __table_args__ = (
+        Index('ix_event_log_channel_ts_micro', 'channel', 'ts_micro'),
+    )
+
     id = Column(Integer, primary_key=True)
 
     ts = Column(String, nullable=False)
 
+    #: Numeric form of ts, for comparing and sorting.
+    ts_micro = Column(BigInteger, nullable=False)
+
     channel = Column(String, nullable=False)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import attr
+
+from .models import EventLog, ts_to_micro
+
+#: Flush buffer when this many logs are collected.
+FLUSH_SIZE = 100
+
+#: Flush buffer this seconds after first log is collected.
+FLUSH_INTERVAL = 5.0
+
+logger = logging.getLogger(__name__)
+
+
+@attr.dataclass(slots=True)
+class RecorderStats:
+    flushes: int = 0
+    failures: int = 0
+    rows: int = 0
+    last_batch_size: int = 0
+    max_batch_size: int = 0
+    last_latency: float = 0.0
+    total_latency: float = 0.0
+
+
+def insert_logs(sess, logs: List[Dict[str, Any]]):
+    with sess.begin():
+        sess.execute(EventLog.__table__.insert(), logs)
+
+
+class EventLogRecorder:
+    """Collect :class:`EventLog` in memory and insert them in bulk."""
+
+    def __init__(
+        self,
+        *,
+        size: int = FLUSH_SIZE,
+        interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        """Initialize"""
+
+        self.size = size
+        self.interval = interval
+        self.buffer: List[Dict[str, Any]] = []
+        self.stats = RecorderStats()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def record(self, bot, channel: str, ts: str):
+        self.buffer.append({
+            'channel': channel,
+            'ts': ts,
+            'ts_micro': ts_to_micro(ts),
+        })
+        if len(self.buffer) >= self.size:
+            await self.flush(bot)
+        elif self._timer is None:
+            self._timer = bot.loop.call_later(
+                self.interval,
+                lambda: asyncio.ensure_future(self.flush(bot)),
+            )
+
+    async def flush(self, bot):
+        """Insert collected logs. Failed logs are kept for next flush."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        logs, self.buffer = self.buffer, []
+        if not logs:
+            return
+
+        started = time.monotonic()
+        try:
+            await bot.db.run(insert_logs, logs)
+        except Exception:
+            self.stats.failures += 1
+            self.buffer[:0] = logs
+            logger.exception('failed to flush %d event logs', len(logs))
+            return
+
+        latency = time.monotonic() - started
+        self.stats.flushes += 1
+        self.stats.rows += len(logs)
+        self.stats.last_batch_size = len(logs)
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(logs))
+        self.stats.last_latency = latency
+        self.stats.total_latency += latency
+
+
+recorder = EventLogRecorder()
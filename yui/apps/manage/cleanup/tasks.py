@@ -1,17 +1,26 @@
-import asyncio
 import datetime
+import logging
 import time
 
-from .commons import cleanup_by_event_logs
+from .commons import cleanup_channels_by_event_logs, prune_event_logs
 from ....box import box
 from ....command import Cs
 
+logger = logging.getLogger(__name__)
+
 box.assert_config_required('OWNER_USER_TOKEN', str)
 box.assert_channels_required('auto_cleanup_targets')
 box.assert_users_required('force_cleanup')
 
 COOLTIME = datetime.timedelta(minutes=5)
 
+#: Logs of deleted messages are removed by cleanup itself, so logs left
+#: here are messages which cleanup could not delete yet, by failed call or
+#: downtime. They are retried on every cleanup until this old, and pruned
+#: after it. Keep it much longer than cleanup window. Messages of pruned logs
+#: are left in channel, and only cleanup by history can remove them.
+LOG_RETENTION = datetime.timedelta(days=30)
+
 
 @box.cron('*/10 * * * *')
 async def cleanup_channels(bot, sess):
@@ -24,6 +33,14 @@ async def cleanup_channels(bot, sess):
     time_limit = naive_now - datetime.timedelta(hours=5)
     ts = str(time.mktime(time_limit.timetuple()))
 
-    for channel in channels:
-        await cleanup_by_event_logs(bot, sess, channel, ts)
-        await asyncio.sleep(5)
+    await cleanup_channels_by_event_logs(bot, sess, channels, ts)
+
+
+@box.cron('5 * * * *')
+async def prune_stale_event_logs(db):
+    before = int((time.time() - LOG_RETENTION.total_seconds()) * 1000000)
+    pruned = await db.run(prune_event_logs, before)
+    if pruned:
+        logger.info(
+            'pruned %d event logs older than %s', pruned, LOG_RETENTION,
+        )
@@ -2,15 +2,12 @@ from typing import List, Optional, Tuple
 
 from lxml.html import fromstring
 
-from sqlalchemy.orm.exc import NoResultFound
-
-from ..shared.cache import JSONCache
+from ..shared.cache import get_snapshot, publish_snapshot
 from ...box import box
 from ...command import C
 from ...session import client_session
 from ...types.slack.attachment import Attachment, Field
 from ...utils.api import retry
-from ...utils.datetime import now
 
 box.assert_channel_required('sao')
 
@@ -28,15 +25,6 @@ BADGE_TRANSLATE = {
 }
 
 
-def get_or_create_cache(name: str, sess) -> JSONCache:
-    try:
-        cache = sess.query(JSONCache).filter_by(name=name).one()
-    except NoResultFound:
-        cache = JSONCache()
-        cache.name = name
-    return cache
-
-
 def process(html: str, last_id: Optional[int]) -> Tuple[List[Attachment], int]:
     h = fromstring(html)
     items = h.cssselect('ul.items_basic li.item_basic')[::-1]
@@ -133,17 +121,15 @@ async def watch(bot, sess):
         async with session.get(url, headers=headers) as resp:
             html = await resp.text()
 
-    cache = get_or_create_cache('personal-booth', sess)
-    attachments, cache.body = await bot.run_in_other_process(
+    snapshot = get_snapshot('personal-booth', sess)
+    attachments, last_id = await bot.run_in_other_process(
         process,
         html,
-        cache.body,
+        snapshot.body if snapshot else None,
     )
 
     if attachments:
-        cache.created_at = now()
-        with sess.begin():
-            sess.add(cache)
+        publish_snapshot('personal-booth', sess, last_id)
 
         await retry(bot.api.chat.postMessage(
             channel=C.sao.get(),
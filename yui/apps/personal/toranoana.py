@@ -6,15 +6,12 @@ import attr
 
 from lxml.html import fromstring
 
-from sqlalchemy.orm.exc import NoResultFound
-
-from ..shared.cache import JSONCache
+from ..shared.cache import get_snapshot, publish_snapshot
 from ...box import box
 from ...command import C
 from ...session import client_session
 from ...types.slack.attachment import Attachment, Field
 from ...utils.api import retry
-from ...utils.datetime import now
 
 
 @attr.dataclass()
@@ -35,15 +32,6 @@ class Page:
         return f'{u.scheme}://{u.hostname}'
 
 
-def get_or_create_cache(name: str, sess) -> JSONCache:
-    try:
-        cache = sess.query(JSONCache).filter_by(name=name).one()
-    except NoResultFound:
-        cache = JSONCache()
-        cache.name = name
-    return cache
-
-
 def process(
     html: str,
     page: Page,
@@ -167,18 +155,16 @@ async def watch(bot, sess):
             async with session.get(page.url, headers=headers) as resp:
                 html = await resp.text()
 
-        cache = get_or_create_cache(page.label, sess)
-        attachments, cache.body = await bot.run_in_other_process(
+        snapshot = get_snapshot(page.label, sess)
+        attachments, seen = await bot.run_in_other_process(
             process,
             html,
             page,
-            cache.body,
+            snapshot.body if snapshot else None,
         )
 
         if attachments:
-            cache.created_at = now()
-            with sess.begin():
-                sess.add(cache)
+            publish_snapshot(page.label, sess, seen)
 
             await retry(bot.api.chat.postMessage(
                 channel=C.toranoana.get(),
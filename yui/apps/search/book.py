@@ -1,9 +1,10 @@
 from decimal import Decimal
-from typing import List
+from typing import Any, Dict, List
 
 import tossi
 
 from ...box import box
+from ...cache import cached
 from ...command import argument
 from ...event import Message
 from ...session import client_session
@@ -15,6 +16,26 @@ box.assert_config_required('NAVER_CLIENT_ID', str)
 box.assert_config_required('NAVER_CLIENT_SECRET', str)
 
 
+@cached(ttl=24 * 60 * 60)
+async def search_book(
+    keyword: str,
+    client_id: str,
+    client_secret: str,
+) -> Dict[str, Any]:
+    url = 'https://openapi.naver.com/v1/search/book.json'
+    params = {
+        'query': keyword,
+    }
+    headers = {
+        'X-Naver-Client-Id': client_id,
+        'X-Naver-Client-Secret': client_secret,
+    }
+
+    async with client_session() as session:
+        async with session.get(url, params=params, headers=headers) as resp:
+            return await resp.json(loads=json.loads)
+
+
 @box.command('책', ['book'])
 @argument('keyword', nargs=-1, concat=True)
 async def book(bot, event: Message, keyword: str):
@@ -27,18 +48,11 @@ async def book(bot, event: Message, keyword: str):
 
     """
 
-    url = 'https://openapi.naver.com/v1/search/book.json'
-    params = {
-        'query': keyword,
-    }
-    headers = {
-        'X-Naver-Client-Id': bot.config.NAVER_CLIENT_ID,
-        'X-Naver-Client-Secret': bot.config.NAVER_CLIENT_SECRET,
-    }
-
-    async with client_session() as session:
-        async with session.get(url, params=params, headers=headers) as resp:
-            data = await resp.json(loads=json.loads)
+    data = await search_book(
+        keyword,
+        bot.config.NAVER_CLIENT_ID,
+        bot.config.NAVER_CLIENT_SECRET,
+    )
 
     attachments: List[Attachment] = []
 
@@ -6,6 +6,7 @@ from lxml.html import fromstring
 
 from ...bot import Bot
 from ...box import box
+from ...cache import cached
 from ...command import argument, option
 from ...event import Message
 from ...session import client_session
@@ -77,6 +78,19 @@ def parse(html: str) -> Tuple[Optional[str], List[Attachment]]:
         return None, attachments
 
 
+@cached(ttl=24 * 60 * 60)
+async def fetch_dic_html(keyword: str, dic: str) -> str:
+    url = 'http://dic.daum.net/search.do?{}'.format(
+        urlencode({
+            'q': keyword,
+            'dic': dic,
+        })
+    )
+    async with client_session() as session:
+        async with session.get(url) as res:
+            return await res.text()
+
+
 @box.command('dic', ['사전'])
 @option('--category', '-c', transform_func=choice(list(DICS.keys())),
         default='영어')
@@ -98,16 +112,7 @@ async def dic(bot: Bot, event: Message, category: str, keyword: str):
 
     """
 
-    url = 'http://dic.daum.net/search.do?{}'.format(
-        urlencode({
-            'q': keyword,
-            'dic': DICS[category],
-        })
-    )
-    html = ''
-    async with client_session() as session:
-        async with session.get(url) as res:
-            html = await res.text()
+    html = await fetch_dic_html(keyword, DICS[category])
 
     redirect, attachments = await bot.run_in_other_process(parse, html)
 
@@ -1,20 +1,18 @@
 import asyncio
 import logging
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 from fuzzywuzzy import fuzz
 
 from lxml.html import fromstring
 
-from sqlalchemy.orm.exc import NoResultFound
-
-from ..shared.cache import JSONCache
+from ..shared.cache import Snapshot, get_snapshot, publish_snapshot
 from ...bot import Bot
 from ...box import box
 from ...command import argument
 from ...event import ChatterboxSystemStart, Message
 from ...session import client_session
-from ...utils.datetime import now
+from ...utils.fuzz import NgramIndex
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +24,61 @@ REF_URLS: Dict[str, str] = {
 }
 
 
-def fetch_or_create_cache(name: str, sess) -> JSONCache:
-    try:
-        ref = sess.query(JSONCache).filter_by(name=name).one()
-    except NoResultFound:
-        ref = JSONCache()
-        ref.name = name
-    return ref
+#: Count of entries rescored after n-gram index narrowed them down.
+SHORTLIST_SIZE = 50
+
+REF_KEYS: Dict[str, Callable[[Sequence[str]], str]] = {
+    'html': lambda entry: entry[0],
+    'css': lambda entry: entry[0],
+    'python': lambda entry: entry[0] or entry[1],
+}
+
+
+class RefIndex:
+    """Entries of reference with n-gram index of their names."""
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        """Initialize"""
+
+        self.snapshot = snapshot
+        self.entries: Sequence[Sequence[str]] = snapshot.body
+        key = REF_KEYS[snapshot.name]
+        self.index = NgramIndex(key(e) for e in self.entries)
+
+    def find(self, keyword: str) -> Tuple[Optional[Sequence[str]], int]:
+        """Find most similar entry and its ratio."""
+
+        keys = self.index.keys
+        positions: Sequence[int] = self.index.shortlist(
+            keyword,
+            SHORTLIST_SIZE,
+        )
+        if not positions:
+            positions = range(len(keys))
+
+        entry = None
+        ratio = -1
+        for i in positions:
+            _ratio = fuzz.ratio(keyword, keys[i])
+            if _ratio > ratio:
+                entry = self.entries[i]
+                ratio = _ratio
+        return entry, ratio
+
+
+#: Index of each reference. Replaced as whole when reference is refreshed.
+REF_INDEXES: Dict[str, RefIndex] = {}
+
+
+def get_ref_index(name: str, sess) -> Optional[RefIndex]:
+    snapshot = get_snapshot(name, sess)
+    if snapshot is None:
+        return None
+
+    index = REF_INDEXES.get(name)
+    if index is None or index.snapshot is not snapshot:
+        index = REF_INDEXES[name] = RefIndex(snapshot)
+    return index
 
 
 def parse(
@@ -57,8 +103,6 @@ def parse(
 async def fetch_css_ref(bot: Bot, sess):
     logger.info(f'fetch css ref start')
 
-    ref = fetch_or_create_cache('css', sess)
-
     url = 'https://developer.mozilla.org/en-US/docs/Web/CSS/Reference'
     async with client_session() as session:
         async with session.get(url) as resp:
@@ -71,11 +115,8 @@ async def fetch_css_ref(bot: Bot, sess):
         'https://developer.mozilla.org',
     )
 
-    ref.body = body
-    ref.created_at = now()
-
-    with sess.begin():
-        sess.add(ref)
+    snapshot = publish_snapshot('css', sess, body)
+    REF_INDEXES['css'] = RefIndex(snapshot)
 
     logger.info(f'fetch css ref end')
 
@@ -83,8 +124,6 @@ async def fetch_css_ref(bot: Bot, sess):
 async def fetch_html_ref(bot: Bot, sess):
     logger.info(f'fetch html ref start')
 
-    ref = fetch_or_create_cache('html', sess)
-
     url = 'https://developer.mozilla.org/en-US/docs/Web/HTML/Element'
     async with client_session() as session:
         async with session.get(url) as resp:
@@ -97,11 +136,8 @@ async def fetch_html_ref(bot: Bot, sess):
         'https://developer.mozilla.org',
     )
 
-    ref.body = body
-    ref.created_at = now()
-
-    with sess.begin():
-        sess.add(ref)
+    snapshot = publish_snapshot('html', sess, body)
+    REF_INDEXES['html'] = RefIndex(snapshot)
 
     logger.info(f'fetch html ref end')
 
@@ -134,8 +170,6 @@ def parse_python(blob: bytes) -> List[Tuple[str, str, str]]:
 async def fetch_python_ref(bot: Bot, sess):
     logger.info(f'fetch python ref start')
 
-    ref = fetch_or_create_cache('python', sess)
-
     url = 'https://docs.python.org/3/library/'
     async with client_session() as session:
         async with session.get(url) as resp:
@@ -146,11 +180,8 @@ async def fetch_python_ref(bot: Bot, sess):
         blob,
     )
 
-    ref.body = body
-    ref.created_at = now()
-
-    with sess.begin():
-        sess.add(ref)
+    snapshot = publish_snapshot('python', sess, body)
+    REF_INDEXES['python'] = RefIndex(snapshot)
 
     logger.info(f'fetch python ref end')
 
@@ -188,26 +219,18 @@ async def html(bot, event: Message, sess, keyword: str):
 
     """
 
-    try:
-        ref = sess.query(JSONCache).filter_by(name='html').one()
-    except NoResultFound:
+    index = get_ref_index('html', sess)
+    if index is None:
         await bot.say(
             event.channel,
             '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
         )
         return
 
-    name = None
-    link = None
-    ratio = -1
-    for _name, _link in ref.body:
-        _ratio = fuzz.ratio(keyword, _name)
-        if _ratio > ratio:
-            name = _name
-            link = _link
-            ratio = _ratio
-
-    if ratio > 40:
+    entry, ratio = index.find(keyword)
+
+    if entry and ratio > 40:
+        name, link = entry
         await bot.say(
             event.channel,
             f':html: `{name}` - {link}'
@@ -229,26 +252,18 @@ async def css(bot, event: Message, sess, keyword: str):
 
     """
 
-    try:
-        ref = sess.query(JSONCache).filter_by(name='css').one()
-    except NoResultFound:
+    index = get_ref_index('css', sess)
+    if index is None:
         await bot.say(
             event.channel,
             '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
         )
         return
 
-    name = None
-    link = None
-    ratio = -1
-    for _name, _link in ref.body:
-        _ratio = fuzz.ratio(keyword, _name)
-        if _ratio > ratio:
-            name = _name
-            link = _link
-            ratio = _ratio
-
-    if ratio > 40:
+    entry, ratio = index.find(keyword)
+
+    if entry and ratio > 40:
+        name, link = entry
         await bot.say(
             event.channel,
             f':css: `{name}` - {link}'
@@ -326,29 +341,18 @@ async def python(bot, event: Message, sess, keyword: str):
 
     """
 
-    try:
-        ref = sess.query(JSONCache).filter_by(name='python').one()
-    except NoResultFound:
+    index = get_ref_index('python', sess)
+    if index is None:
         await bot.say(
             event.channel,
             '아직 레퍼런스 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
         )
         return
 
-    name = None
-    link = None
-    ratio = -1
-    for code, _name, _link in ref.body:
-        if code:
-            _ratio = fuzz.ratio(keyword, code)
-        else:
-            _ratio = fuzz.ratio(keyword, _name)
-        if _ratio > ratio:
-            name = _name
-            link = _link
-            ratio = _ratio
+    entry, ratio = index.find(keyword)
 
-    if ratio > 40:
+    if entry and ratio > 40:
+        code, name, link = entry
         await bot.say(
             event.channel,
             f':python: {name} - {link}'
@@ -16,7 +16,7 @@ from ...event import Message
 from ...session import client_session
 from ...types.slack.attachment import Attachment
 from ...utils import json
-from ...utils.fuzz import match
+from ...utils.fuzz import Choices, Normalized, best_matches
 
 
 class Sub(NamedTuple):
@@ -214,13 +214,13 @@ async def search_on_air(bot, event: Message, title: str, timeout: float = 2.5):
         else:
             a_data.extend(res)
 
+    query = Normalized.of(title.lower())
     for ani in o_data:
-        ani['ratio'] = max(
-            match(
-                title.lower(),
-                a['s'].lower(),
-            ) for a in ani['n']
-        )
+        ani['ratio'] = best_matches(
+            query,
+            Choices(ani['n'], key=lambda a: a['s'].lower()),
+            scorer='match',
+        )[0][1]
 
     o_ani = max(o_data, key=lambda x: x['ratio'])
 
@@ -246,13 +246,9 @@ async def search_on_air(bot, event: Message, title: str, timeout: float = 2.5):
         use_anissia = False
         a_ani = None
         if a_data:
+            aliases = Choices(o_ani['n'], key=lambda a: a['s'].lower())
             for ani in a_data:
-                ani['ratio'] = max(
-                    match(
-                        alias['s'].lower(),
-                        ani['s'].lower()
-                    ) for alias in o_ani['n']
-                )
+                ani['ratio'] = max(aliases.scores(ani['s'].lower(), 'match'))
 
                 if o_ani['t'] == ani['t']:
                     ani['ratio'] += 5
@@ -1,24 +1,28 @@
 import asyncio
 import logging
 import re
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
 
-from sqlalchemy.orm.exc import NoResultFound
-
 import tossi
 
-from ..shared.cache import JSONCache
+from ..shared.cache import Snapshot, get_snapshot, publish_snapshot
 from ...box import box
+from ...cache import cached
 from ...command import argument, option
 from ...event import ChatterboxSystemStart, Message
 from ...session import client_session
 from ...transform import choice
 from ...utils import json
 from ...utils.datetime import now
-from ...utils.fuzz import ratio
+from ...utils.fuzz import Choices, best_matches
 
 PARENTHESES = re.compile(r'\(.+?\)')
+PARENTHESES_CONTENT = re.compile(r'\((.+?)\)')
+SPACES = re.compile(r'\s+')
+
+#: Minutes of departure time slot. Routes are reused within same slot.
+ROUTE_SLOT_MINUTES = 10
 
 logger = logging.getLogger(__name__)
 
@@ -36,14 +40,126 @@ REGION_TABLE: Dict[str, Tuple[str, str]] = {
 }
 
 
+def station_aliases(name: str) -> List[str]:
+    """Names to find station by. ``총신대입구(이수)`` is found by both."""
+
+    aliases = [PARENTHESES.sub('', name).strip()]
+    aliases.extend(x.strip() for x in PARENTHESES_CONTENT.findall(name))
+    return [x for x in aliases if x]
+
+
+def alias_key(name: str) -> str:
+    """Key of exact lookup. Spaces and trailing ``역`` are ignored."""
+
+    key = SPACES.sub('', name).lower()
+    if len(key) > 1 and key.endswith('역'):
+        key = key[:-1]
+    return key
+
+
+class StationIndex:
+    """Stations of region, looked up by alias first and fuzzy next."""
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        """Initialize"""
+
+        self.snapshot = snapshot
+        self.exact: Dict[str, Dict[str, Any]] = {}
+        names: List[Tuple[str, Dict[str, Any]]] = []
+        for station in snapshot.body[0]['realInfo']:
+            for alias in station_aliases(station['name']):
+                key = alias_key(alias)
+                if key not in self.exact:
+                    self.exact[key] = station
+                    names.append((alias, station))
+        self.names = Choices(names, key=lambda x: x[0])
+
+    def find(self, query: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Find station and its ratio."""
+
+        station = self.exact.get(alias_key(query))
+        if station is not None:
+            return station, 100
+
+        matches = best_matches(query, self.names)
+        if not matches:
+            return None, -1
+        (_, station), ratio = matches[0]
+        return station, ratio
+
+
+#: Station index of each region. Replaced as whole when DB is refreshed.
+STATION_INDEXES: Dict[str, StationIndex] = {}
+
+
+def get_station_index(name: str, sess) -> Optional[StationIndex]:
+    snapshot = get_snapshot(name, sess)
+    if snapshot is None:
+        return None
+
+    index = STATION_INDEXES.get(name)
+    if index is None or index.snapshot is not snapshot:
+        index = STATION_INDEXES[name] = StationIndex(snapshot)
+    return index
+
+
+class RouteNotFound(Exception):
+    """API responded without route. Not cached."""
+
+    def __init__(self, body) -> None:
+        """Initialize"""
+
+        super(RouteNotFound, self).__init__(body)
+        self.body = body
+
+
+@cached(ttl=ROUTE_SLOT_MINUTES * 60)
+async def fetch_route(
+    service_region: str,
+    start: str,
+    goal: str,
+    departure_time: str,
+):
+    url = 'https://map.naver.com/v5/api/subway/search?{}'.format(
+        urlencode({
+            'serviceRegion': service_region,
+            'start': start,
+            'goal': goal,
+            'departureTime': departure_time,
+        })
+    )
+
+    async with client_session(headers=headers) as session:
+        async with session.get(url) as resp:
+            body = await resp.json(loads=json.loads)
+    if not isinstance(body, dict) or not body.get('paths'):
+        raise RouteNotFound(body)
+    return body
+
+
+async def search_route(service_region: str, start: str, goal: str):
+    """Search route departing in current time slot."""
+
+    dt = now()
+    dt = dt.replace(
+        minute=dt.minute - dt.minute % ROUTE_SLOT_MINUTES,
+        second=0,
+        microsecond=0,
+    )
+    try:
+        return await fetch_route(
+            service_region,
+            start,
+            goal,
+            dt.strftime('%Y-%m-%dT%H:%M:%S'),
+        )
+    except RouteNotFound as e:
+        return e.body
+
+
 async def fetch_station_db(sess, service_region: str, api_version: str):
     name = f'subway-{service_region}-{api_version}'
     logger.info(f'fetch {name} start')
-    try:
-        db = sess.query(JSONCache).filter_by(name=name).one()
-    except NoResultFound:
-        db = JSONCache()
-        db.name = name
 
     metadata_url = 'https://map.naver.com/v5/api/subway/provide?{}'.format(
         urlencode({
@@ -57,12 +173,10 @@ async def fetch_station_db(sess, service_region: str, api_version: str):
 
     async with client_session(headers=headers) as session:
         async with session.get(metadata_url) as resp:
-            db.body = await resp.json(loads=json.loads)
-
-    db.created_at = now()
+            body = await resp.json(loads=json.loads)
 
-    with sess.begin():
-        sess.add(db)
+    snapshot = publish_snapshot(name, sess, body)
+    STATION_INDEXES[name] = StationIndex(snapshot)
 
     logger.info(f'fetch {name} end')
 
@@ -89,33 +203,16 @@ async def refresh_db(sess):
 async def body(bot, event: Message, sess, region: str, start: str, end: str):
     service_region, api_version = REGION_TABLE[region]
 
-    try:
-        db = sess.query(JSONCache).filter_by(
-            name=f'subway-{service_region}-{api_version}'
-        ).one()
-    except NoResultFound:
+    index = get_station_index(f'subway-{service_region}-{api_version}', sess)
+    if index is None:
         await bot.say(
             event.channel,
             '아직 지하철 관련 명령어의 실행준비가 덜 되었어요. 잠시만 기다려주세요!'
         )
         return
 
-    data = db.body
-
-    find_start = None
-    find_start_ratio = -1
-    find_end = None
-    find_end_ratio = -1
-    for x in data[0]['realInfo']:
-        name = PARENTHESES.sub('', x['name'])
-        start_ratio = ratio(name, start)
-        end_ratio = ratio(name, end)
-        if find_start_ratio < start_ratio:
-            find_start = x
-            find_start_ratio = start_ratio
-        if find_end_ratio < end_ratio:
-            find_end = x
-            find_end_ratio = end_ratio
+    find_start, find_start_ratio = index.find(start)
+    find_end, find_end_ratio = index.find(end)
 
     if find_start_ratio < 40:
         await bot.say(
@@ -137,19 +234,12 @@ async def body(bot, event: Message, sess, region: str, start: str, end: str):
             )
             return
 
-        url = 'https://map.naver.com/v5/api/subway/search?{}'.format(
-            urlencode({
-                'serviceRegion': service_region,
-                'start': find_start['id'],
-                'goal': find_end['id'],
-                'departureTime': now().strftime('%Y-%m-%dT%H:%M:%S'),
-            })
+        result = await search_route(
+            service_region,
+            find_start['id'],
+            find_end['id'],
         )
 
-        async with client_session(headers=headers) as session:
-            async with session.get(url) as resp:
-                result = await resp.json(loads=json.loads)
-
         text = ''
 
         paths = result['paths'][0]
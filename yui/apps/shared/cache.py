@@ -1,9 +1,20 @@
+import datetime
+import time
+from typing import Any, Dict, Optional
+
+import attr
+
+from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.schema import Column
 from sqlalchemy.types import Integer, String
 
 from ...orm import Base
 from ...orm.type import JSONType
 from ...orm.utils import insert_datetime_field
+from ...utils.datetime import now
+
+#: Seconds to trust snapshot without checking its version in DB.
+SNAPSHOT_CHECK_INTERVAL = 60.0
 
 
 class JSONCache(Base):
@@ -17,3 +28,79 @@ class JSONCache(Base):
     body = Column(JSONType)
 
     insert_datetime_field('created', locals(), False)
+
+
+@attr.dataclass(slots=True)
+class Snapshot:
+    """Decoded body of :class:`JSONCache`, shared in process.
+
+    Body is shared between readers. Do not modify it, publish new one.
+
+    """
+
+    name: str
+    body: Any
+    version: datetime.datetime
+    checked_at: float
+
+
+#: Latest snapshot of each name. Replaced as whole on publish.
+SNAPSHOTS: Dict[str, Snapshot] = {}
+
+
+def get_snapshot(name: str, sess) -> Optional[Snapshot]:
+    """Get snapshot of given name, loading it only when DB has new one."""
+
+    snapshot = SNAPSHOTS.get(name)
+    if snapshot is not None:
+        checked_at = time.monotonic()
+        if checked_at - snapshot.checked_at < SNAPSHOT_CHECK_INTERVAL:
+            return snapshot
+        version = sess.query(JSONCache.created_datetime).filter_by(
+            name=name,
+        ).scalar()
+        if version == snapshot.version:
+            snapshot.checked_at = checked_at
+            return snapshot
+
+    try:
+        record = sess.query(JSONCache).filter_by(name=name).one()
+    except NoResultFound:
+        SNAPSHOTS.pop(name, None)
+        return None
+
+    snapshot = SNAPSHOTS[name] = Snapshot(
+        name=name,
+        body=record.body,
+        version=record.created_datetime,
+        checked_at=time.monotonic(),
+    )
+    return snapshot
+
+
+def publish_snapshot(
+    name: str,
+    sess,
+    body: Any,
+    created_at: Optional[datetime.datetime] = None,
+) -> Snapshot:
+    """Store body into DB and make it latest snapshot."""
+
+    try:
+        record = sess.query(JSONCache).filter_by(name=name).one()
+    except NoResultFound:
+        record = JSONCache()
+        record.name = name
+    record.body = body
+    record.created_at = created_at or now()
+
+    with sess.begin():
+        sess.add(record)
+
+    snapshot = SNAPSHOTS[name] = Snapshot(
+        name=name,
+        body=body,
+        version=record.created_datetime,
+        checked_at=time.monotonic(),
+    )
+    return snapshot
@@ -1,5 +1,4 @@
 import datetime
-from hashlib import md5
 from typing import NamedTuple, Optional, Tuple
 from urllib.parse import urlencode
 
@@ -8,6 +7,7 @@ from fake_useragent import UserAgent
 import tzlocal
 
 from ...box import box
+from ...cache import cached
 from ...command import argument
 from ...event import Message
 from ...session import client_session
@@ -47,6 +47,7 @@ class AQIRecord(NamedTuple):
     co: Optional[Field] = None  # 일산화 탄소 (Carbon Monoxide)
 
 
+@cached(ttl=7 * 24 * 60 * 60)
 async def get_geometric_info_by_address(
     address: str,
     api_key: str,
@@ -69,6 +70,7 @@ async def get_geometric_info_by_address(
     return full_address, lat, lng
 
 
+@cached(ttl=7 * 24 * 60 * 60)
 async def get_aqi_idx(lat: float, lng: float, token: str) -> str:
     url = f'https://api.waqi.info/feed/geo:{lat};{lng}/?token={token}'
     async with client_session() as session:
@@ -144,44 +146,19 @@ async def aqi(bot, event: Message, address: str):
 
     """
 
-    addr = md5(address.encode()).hexdigest()
+    try:
+        full_address, lat, lng = await get_geometric_info_by_address(
+            address,
+            bot.config.GOOGLE_API_KEY,
+        )
+    except IndexError:
+        await bot.say(
+            event.channel,
+            '해당 주소는 찾을 수 없어요!'
+        )
+        return
 
-    cached = await bot.cache.multi_get(
-        f'AQI_ADDRESS_{addr}_full_address',
-        f'AQI_ADDRESS_{addr}_lat',
-        f'AQI_ADDRESS_{addr}_lng',
-    )
-    if cached[0] and cached[1] and cached[2]:
-        full_address, lat, lng = cached
-    else:
-        try:
-            full_address, lat, lng = await get_geometric_info_by_address(
-                address,
-                bot.config.GOOGLE_API_KEY,
-            )
-            await bot.cache.set(
-                f'AQI_ADDRESS_{addr}_full_address',
-                full_address,
-            )
-            await bot.cache.set(
-                f'AQI_ADDRESS_{addr}_lat',
-                lat,
-            )
-            await bot.cache.set(
-                f'AQI_ADDRESS_{addr}_lng',
-                lng,
-            )
-        except IndexError:
-            await bot.say(
-                event.channel,
-                '해당 주소는 찾을 수 없어요!'
-            )
-            return
-
-    idx = await bot.cache.get(f'AQI_IDX_{lat}_{lng}')
-    if not idx:
-        idx = await get_aqi_idx(lat, lng, bot.config.AQI_API_TOKEN)
-        await bot.cache.set(f'AQI_IDX_{lat}_{lng}', idx)
+    idx = await get_aqi_idx(lat, lng, bot.config.AQI_API_TOKEN)
 
     if idx == 'wrong':
         await bot.say(
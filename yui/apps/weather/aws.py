@@ -5,12 +5,13 @@ from typing import Dict, List, Tuple
 from aiohttp import client_exceptions
 
 from ...box import box
+from ...cache import cached
 from ...command import argument, option
 from ...event import Message
 from ...session import client_session
 from ...utils import json
 from ...utils.datetime import fromisoformat, now
-from ...utils.fuzz import ratio
+from ...utils.fuzz import Choices
 
 API_URL = 'https://item4.net/api/weather/'
 EXCEPTIONS = (
@@ -20,6 +21,13 @@ EXCEPTIONS = (
 )
 
 
+@cached(ttl=60)
+async def fetch_weather_data() -> Dict:
+    async with client_session() as session:
+        async with session.get(API_URL) as resp:
+            return await resp.json(loads=json.loads)
+
+
 def shorten(input) -> str:
     decimal_string = str(Decimal(format(input, 'f'))) if input else '0'
     return (
@@ -91,9 +99,7 @@ async def aws(
         return
 
     try:
-        async with client_session() as session:
-            async with session.get(API_URL) as resp:
-                data = await resp.json(loads=json.loads)
+        data = await fetch_weather_data()
     except EXCEPTIONS:
         await bot.say(
             event.channel,
@@ -104,7 +110,9 @@ async def aws(
     records: List[Tuple[int, Dict]] = []
     observed_at = fromisoformat(data['observed_at'].split('+', 1)[0])
 
-    for record in data['records']:
+    names = Choices(data['records'], key=lambda x: x['name'])
+    name_ratios = names.scores(keyword)
+    for record, name_ratio in zip(names.items, name_ratios):
         if record['name'] == keyword:
             if not fuzzy:
                 records.clear()
@@ -112,7 +120,6 @@ async def aws(
             if not fuzzy:
                 break
         else:
-            name_ratio = ratio(record['name'], keyword)
             address_score = 50 if keyword in record['address'] else 0
             score = name_ratio + address_score
             if score >= 90:
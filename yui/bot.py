@@ -6,7 +6,7 @@ import logging.config
 import traceback
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, TypeVar, Union
+from typing import Any, Callable, Dict, TypeVar, Union
 
 import aiocron
 
@@ -22,22 +22,21 @@ from dateutil.tz import tzoffset
 
 from .api import SlackAPI
 from .box import Box, box
+from .box.resources import resource_scope
 from .box.tasks import CronTask
-from .cache import Cache
+from .cache import Cache, LocalCache, set_default_cache
+from .codec import Codec
 from .config import Config
+from .dispatcher import Dispatcher
 from .event import create_event
-from .orm import Base, EngineConfig, get_database_engine, make_session
-from .session import client_session
+from .orm import AsyncDatabase, Base, get_database_engine
+from .registry import RegistryAttribute, get_dm_name
+from .scheduler import Priority, Scheduler, lane
+from .session import HTTPPool, pool
 from .types.base import ChannelID
-from .types.channel import (
-    Channel,
-    DirectMessageChannel,
-    PrivateChannel,
-    PublicChannel,
-)
+from .types.channel import Channel
 from .types.namespace import Namespace
 from .types.slack.response import APIResponse
-from .types.user import User
 from .utils import json
 from .utils.api import retry
 
@@ -46,6 +45,12 @@ R = TypeVar('R')
 UTC9 = tzoffset('UTC9', timedelta(hours=9))
 
 
+async def shutdown_database(bot):
+    """Stop threads of database after other shutdown hooks used it."""
+
+    bot.db.shutdown()
+
+
 class BotReconnect(Exception):
     """Exception for reconnect bot"""
 
@@ -73,7 +78,12 @@ class Bot:
 
     api: SlackAPI
     cache: Cache
+    http: HTTPPool
     loop: asyncio.AbstractEventLoop
+    channels = RegistryAttribute()
+    ims = RegistryAttribute(get_dm_name)
+    groups = RegistryAttribute()
+    users = RegistryAttribute()
 
     def __init__(
         self,
@@ -97,13 +107,38 @@ class Bot:
 
         logger.info('connect to DB')
         config.DATABASE_ENGINE = get_database_engine(config)
+        self.db = AsyncDatabase(
+            config.DATABASE_ENGINE,
+            max_workers=config.DATABASE_WORKERS,
+        )
 
         logger.info('connect to memcache')
         self.mc = aiomcache.Client(
             host=config.CACHE['HOST'],
             port=config.CACHE['PORT'],
         )
-        self.cache = Cache(self.mc, config.CACHE.get('PREFIX', 'YUI_'))
+        local = None
+        if config.CACHE.get('LOCAL_MAX_BYTES'):
+            local = LocalCache(
+                max_bytes=config.CACHE['LOCAL_MAX_BYTES'],
+                ttl=config.CACHE.get('LOCAL_TTL', 30),
+                negative_ttl=config.CACHE.get('LOCAL_NEGATIVE_TTL', 5),
+            )
+        self.cache = Cache(
+            self.mc,
+            config.CACHE.get('PREFIX', 'YUI_'),
+            local=local,
+            codec=Codec.from_name(config.CACHE.get('CODEC', 'json')),
+        )
+
+        logger.info('prepare http connection pool')
+        self.http = pool
+        self.http.configure(
+            limit=config.HTTP.get('LIMIT', 100),
+            limit_per_host=config.HTTP.get('LIMIT_PER_HOST', 20),
+            dns_cache_ttl=config.HTTP.get('DNS_CACHE_TTL', 300),
+            keepalive_timeout=config.HTTP.get('KEEPALIVE_TIMEOUT', 30),
+        )
 
         logger.info('import apps')
         for app_name in config.APPS:
@@ -114,12 +149,16 @@ class Bot:
 
         self.orm_base = orm_base or Base
         self.box = using_box or box
+        # apps are imported already, so it runs after their shutdown hooks
+        self.box.on_shutdown(shutdown_database)
         self.queue: asyncio.Queue = asyncio.Queue()
+        self.dispatcher = Dispatcher(self.queue, config.WORKERS)
+        self.scheduler = Scheduler()
         self.api = SlackAPI(self)
-        self.channels: List[PublicChannel] = []
-        self.ims: List[DirectMessageChannel] = []
-        self.groups: List[PrivateChannel] = []
-        self.users: List[User] = []
+        self.channels = []
+        self.ims = []
+        self.groups = []
+        self.users = []
         self.restart = False
         self.is_ready = False
 
@@ -145,42 +184,26 @@ class Bot:
         def register(c: CronTask):
             logger.info(f'register {c}')
             lock = asyncio.Lock()
-            func_params = c.handler.params
-            kw: Dict[str, Any] = {}
-            if 'bot' in func_params:
-                kw['bot'] = self
 
             @aiocron.crontab(c.spec, tz=UTC9, *c.args, **c.kwargs)
             async def task():
                 if lock.locked() or not self.is_ready:
                     return
                 async with lock:
-                    if 'loop' in func_params:
-                        kw['loop'] = self.loop
-
-                    sess = make_session(bind=self.config.DATABASE_ENGINE)
-                    if 'sess' in func_params:
-                        kw['sess'] = sess
-
-                    if 'engine_config' in func_params:
-                        kw['engine_config'] = EngineConfig(
-                            url=self.config.DATABASE_URL,
-                            echo=self.config.DATABASE_ECHO,
-                        )
-
-                    logger.debug(f'hit and start to run {c}')
-                    try:
-                        await c.handler(**kw)
-                    except:  # noqa: E722
-                        logger.error(f'Error: {traceback.format_exc()}')
-                        await self.say(
-                            self.config.USERS['owner'],
-                            '*Traceback*\n```\n{}\n```\n'.format(
-                                traceback.format_exc(),
+                    with resource_scope(self) as resources:
+                        kw = resources.inject(c.handler.injections, {})
+
+                        logger.debug(f'hit and start to run {c}')
+                        try:
+                            await c.handler(**kw)
+                        except:  # noqa: E722
+                            logger.error(f'Error: {traceback.format_exc()}')
+                            await self.say(
+                                self.config.USERS['owner'],
+                                '*Traceback*\n```\n{}\n```\n'.format(
+                                    traceback.format_exc(),
+                                )
                             )
-                        )
-                    finally:
-                        sess.close()
                     logger.debug(f'end {c}')
 
             c.start = task.start
@@ -192,6 +215,7 @@ class Bot:
     def run(self):
         """Run"""
 
+        set_default_cache(self.cache)
         while True:
             loop = asyncio.get_event_loop()
             loop.set_debug(self.config.DEBUG)
@@ -205,8 +229,23 @@ class Bot:
                     return_when=asyncio.FIRST_EXCEPTION,
                 )
             )
+            loop.run_until_complete(self.shutdown())
+            loop.run_until_complete(self.http.close())
             loop.close()
 
+    async def shutdown(self):
+        """Run shutdown hooks of box."""
+
+        logger = logging.getLogger(f'{__name__}.Bot.shutdown')
+
+        for handler in self.box.shutdown_hooks:
+            with resource_scope(self) as resources:
+                kw = resources.inject(handler.injections, {})
+                try:
+                    await handler(**kw)
+                except:  # noqa: E722
+                    logger.error(f'Error: {traceback.format_exc()}')
+
     async def run_in_other_process(
         self,
         f: Callable[..., R],
@@ -236,29 +275,45 @@ class Bot:
         *,
         token: str = None,
     ) -> APIResponse:
-        """Call API methods."""
+        """Call API methods within rate limit."""
 
-        async with client_session() as session:
-            form = aiohttp.FormData(data or {})
-            form.add_field('token', token or self.config.TOKEN)
-            try:
-                async with session.post(
-                    'https://slack.com/api/{}'.format(method),
-                    data=form
-                ) as response:
-                    try:
-                        result = await response.json(loads=json.loads)
-                    except ContentTypeError:
-                        result = await response.text()
-                    return APIResponse(
-                        body=result,
-                        status=response.status,
-                        headers=response.headers,
-                    )
-            except ClientConnectorError:
-                raise APICallError('fail to call {} with {}'.format(
-                    method, data
-                ))
+        return await self.scheduler.run(
+            method,
+            functools.partial(self.request, method, data, token=token),
+            channel=(data or {}).get('channel'),
+            token=token,
+        )
+
+    async def request(
+        self,
+        method: str,
+        data: Dict[str, str] = None,
+        *,
+        token: str = None,
+    ) -> APIResponse:
+        """Send request to API methods immediately."""
+
+        session = self.http.session('slack')
+        form = aiohttp.FormData(data or {})
+        form.add_field('token', token or self.config.TOKEN)
+        try:
+            async with session.post(
+                'https://slack.com/api/{}'.format(method),
+                data=form
+            ) as response:
+                try:
+                    result = await response.json(loads=json.loads)
+                except ContentTypeError:
+                    result = await response.text()
+                return APIResponse(
+                    body=result,
+                    status=response.status,
+                    headers=response.headers,
+                )
+        except ClientConnectorError:
+            raise APICallError('fail to call {} with {}'.format(
+                method, data
+            ))
 
     async def say(
         self,
@@ -311,15 +366,16 @@ class Bot:
                 )
                 return False
 
-        while True:
-            event = await self.queue.get()
-
+        async def process_event(event):
             logger.info(event)
 
-            for handler in self.box.apps:
-                result = await handle(handler, event)
-                if not result:
-                    break
+            with lane(Priority.INTERACTIVE), resource_scope(self):
+                for handler in self.box.get_apps(event, self.config.PREFIX):
+                    result = await handle(handler, event)
+                    if not result:
+                        break
+
+        await self.dispatcher.run(process_event)
 
     async def ping(self, ws: ClientWebSocketResponse):
         while not ws.closed:
@@ -402,7 +458,7 @@ class Bot:
             while not self.is_ready:
                 await asyncio.sleep(0.01)
             try:
-                async with client_session() as session:
+                async with self.http.client_session() as session:
                     async with session.ws_connect(rtm.body['url']) as ws:
                         await asyncio.wait(
                             (
@@ -4,7 +4,9 @@ from .parsers import KWARGS_DICT, parse_option_and_arguments
 from .tasks import CronTask
 from .utils import (
     CONTAINER,
+    MessageCommand,
     SPACE_RE,
+    get_command,
     is_container,
 )
 
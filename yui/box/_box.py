@@ -1,14 +1,24 @@
-from typing import Any, Dict, List, Optional, Set, Type, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
 
 from .apps.base import BaseApp
 from .apps.basic import App
+from .apps.route import RouteApp
+from .parsers import compile_plan
 from .tasks import CronTask
+from .utils import get_command
 from ..command.validators import VALIDATOR_TYPE
-from ..event import Event
+from ..event import BaseEvent, Event, Message
 from ..types.handler import DECORATOR_ARGS_TYPE, DECORATOR_TYPE, Handler
 from ..utils.handler import get_handler
 
 
+#: key of dispatch index. (event type, subtype, command name)
+DISPATCH_KEY = Tuple[Optional[str], Any, Optional[str]]
+
+#: placeholder for event which has not subtype attribute
+NO_SUBTYPE = object()
+
+
 class Box:
     """Box, collection of apps and tasks"""
 
@@ -22,11 +32,27 @@ class Box:
         self.users_required: Set[str] = set()
         self.apps: List[BaseApp] = []
         self.tasks: List[CronTask] = []
+        self.shutdown_hooks: List[Handler] = []
+        self._index: Optional[_DispatchIndex] = None
 
     def register(self, app: BaseApp):
         """Register App manually."""
 
         self.apps.append(app)
+        self._index = None
+
+    def get_apps(self, event: BaseEvent, prefix: str) -> List[BaseApp]:
+        """Get apps which can handle given event, in registration order.
+
+        Apps which never react to the event are excluded, so running only
+        these apps gives same result with running all of :attr:`apps`.
+
+        """
+
+        index = self._index
+        if index is None or index.size != len(self.apps):
+            index = self._index = _DispatchIndex(self.apps)
+        return index.get(event, prefix)
 
     def assert_config_required(self, key: str, type_):
         """Mark required configuration key and type."""
@@ -68,6 +94,7 @@ class Box:
 
         def decorator(target: DECORATOR_ARGS_TYPE) -> Handler:
             handler = get_handler(target)
+            compile_plan(handler)
 
             self.apps.append(App(
                 'message',
@@ -81,6 +108,7 @@ class Box:
                 use_shlex=use_shlex,
                 channel_validator=channels,
             ))
+            self._index = None
 
             return handler
 
@@ -102,6 +130,7 @@ class Box:
 
         def decorator(target: DECORATOR_ARGS_TYPE) -> Handler:
             handler = get_handler(target)
+            compile_plan(handler)
 
             self.apps.append(App(
                 event_type,
@@ -109,6 +138,7 @@ class Box:
                 handler,
                 channel_validator=channels,
             ))
+            self._index = None
 
             return handler
 
@@ -120,3 +150,76 @@ class Box:
         c = CronTask(self, spec, args, kwargs)
         self.tasks.append(c)
         return c
+
+    def on_shutdown(self, target: DECORATOR_ARGS_TYPE) -> Handler:
+        """Decorator for function which runs when bot stops."""
+
+        handler = get_handler(target)
+        self.shutdown_hooks.append(handler)
+        return handler
+
+
+class _DispatchIndex:
+    """Index of apps keyed by event type, subtype and command name."""
+
+    def __init__(self, apps: List[BaseApp]) -> None:
+        self.size = len(apps)
+        self.apps = apps[:]
+        self.events: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        self.commands: Dict[str, List[int]] = {}
+        self.fallback: List[int] = []
+        self.cache: Dict[DISPATCH_KEY, List[BaseApp]] = {}
+
+        for i, app in enumerate(self.apps):
+            if isinstance(app, App):
+                if app.is_command:
+                    for name in app.names:
+                        self.commands.setdefault(name, []).append(i)
+                else:
+                    key = (app.type, app.subtype)
+                    self.events.setdefault(key, []).append(i)
+            elif isinstance(app, RouteApp):
+                for name in app.names:
+                    self.commands.setdefault(name, []).append(i)
+            else:
+                self.fallback.append(i)
+
+    def get(self, event: BaseEvent, prefix: str) -> List[BaseApp]:
+        type_ = getattr(event, 'type', None)
+        subtype = getattr(event, 'subtype', NO_SUBTYPE)
+        name = None
+        if isinstance(event, Message):
+            name = self.get_command_name(event, prefix)
+
+        cache_key = (type_, subtype, name)
+        try:
+            return self.cache[cache_key]
+        except KeyError:
+            pass
+
+        positions = self.fallback[:]
+        if subtype is not NO_SUBTYPE:
+            positions += self.events.get((type_, subtype), [])
+            if subtype != '*':
+                positions += self.events.get((type_, '*'), [])
+        if name is not None:
+            for i in self.commands[name]:
+                app = self.apps[i]
+                if isinstance(app, App) and not (
+                    app.type == type_ and app.subtype in (subtype, '*')
+                ):
+                    continue
+                positions.append(i)
+
+        apps = [self.apps[i] for i in sorted(set(positions))]
+        self.cache[cache_key] = apps
+        return apps
+
+    def get_command_name(self, event: Message, prefix: str) -> Optional[str]:
+        call = get_command(event).call
+        if not call.startswith(prefix):
+            return None
+        name = call[len(prefix):]
+        if name in self.commands:
+            return name
+        return None
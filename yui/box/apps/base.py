@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import contextlib
-import inspect
-from typing import Mapping, TYPE_CHECKING
+from typing import TYPE_CHECKING
 
+from ..resources import resource_scope
 from ...event import Event
-from ...orm import EngineConfig, make_session
+from ...types.handler import Handler
 
 if TYPE_CHECKING:
     from ...bot import Bot
@@ -45,27 +45,14 @@ class BaseApp:
         *,
         bot: Bot,
         event: Event,
-        func_params: Mapping[str, inspect.Parameter],
+        handler: Handler,
         **kwargs,
     ):
-        sess = make_session(bind=bot.config.DATABASE_ENGINE)
+        func_params = handler.params
         if 'self' in func_params:
             kwargs['_self'] = self
-        if 'bot' in func_params:
-            kwargs['bot'] = bot
-        if 'loop' in func_params:
-            kwargs['loop'] = bot.loop
         if 'event' in func_params:
             kwargs['event'] = event
-        if 'sess' in func_params:
-            kwargs['sess'] = sess
-        if 'engine_config' in func_params:
-            kwargs['engine_config'] = EngineConfig(
-                url=bot.config.DATABASE_URL,
-                echo=bot.config.DATABASE_ECHO,
-            )
 
-        try:
-            yield kwargs
-        finally:
-            sess.close()
+        with resource_scope(bot) as resources:
+            yield resources.inject(handler.injections, kwargs)
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-import html
 import inspect
-import shlex
 from typing import List, Optional, TYPE_CHECKING
 
 from .base import BaseApp
 from ..parsers import parse_option_and_arguments
-from ..utils import SPACE_RE
+from ..utils import get_command
 from ...command.validators import VALIDATOR_TYPE
 from ...event import Event, Message
 from ...types.handler import Handler
@@ -105,7 +103,7 @@ class App(BaseApp):
             with self.prepare_kwargs(
                 bot=bot,
                 event=event,
-                func_params=self.handler.params,
+                handler=self.handler,
             ) as kwargs:
                 res = await self.handler(**kwargs)
 
@@ -113,40 +111,25 @@ class App(BaseApp):
 
     async def _run_message_event(self, bot: Bot, event: Message):
         res: Optional[bool] = True
-        call = ''
-        args = ''
-        if event.text:
-            try:
-                call, args = SPACE_RE.split(event.text, 1)
-            except ValueError:
-                call = event.text
-        elif event.message and event.message.text:
-            try:
-                call, args = SPACE_RE.split(event.message.text, 1)
-            except ValueError:
-                call = event.message.text
-
-        raw = html.unescape(args)
+        command = get_command(event)
+        raw = command.raw
 
         match = True
         if self.is_command:
             match = any(
-                call == bot.config.PREFIX + name for name in self.names
+                command.call == bot.config.PREFIX + name
+                for name in self.names
             )
 
         if match:
             func_params = self.handler.params
-            if self.use_shlex:
-                try:
-                    chunks = shlex.split(raw)
-                except ValueError:
-                    await bot.say(
-                        event.channel,
-                        '*Error*: Can not parse this command'
-                    )
-                    return False
-            else:
-                chunks = raw.split(' ')
+            chunks = command.get_chunks(self.use_shlex)
+            if chunks is None:
+                await bot.say(
+                    event.channel,
+                    '*Error*: Can not parse this command'
+                )
+                return False
 
             try:
                 kw, remain_chunks = parse_option_and_arguments(
@@ -176,7 +159,7 @@ class App(BaseApp):
                 with self.prepare_kwargs(
                     bot=bot,
                     event=event,
-                    func_params=func_params,
+                    handler=self.handler,
                     **kw,
                 ) as kwargs:
                     res = await self.handler(**kwargs)
@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import html
-import shlex
 from typing import List, Optional, TYPE_CHECKING, Union
 
 from .base import BaseApp
-from ..parsers import parse_option_and_arguments
-from ..utils import SPACE_RE
+from ..parsers import compile_plan, parse_option_and_arguments
+from ..utils import MessageCommand, get_command
 from ...event import Event, Message
 from ...types.handler import HANDLER_CALL_TYPE, Handler
 from ...utils.handler import get_handler
@@ -29,6 +27,7 @@ class Route:
     ) -> None:
         self.name = name
         self.handler = get_handler(callback)
+        compile_plan(self.handler)
         self.subtype = subtype
 
 
@@ -55,54 +54,30 @@ class RouteApp(BaseApp):
         if not isinstance(event, Message):
             return True
 
-        root_args = ''
-        root_call = ''
-        args = ''
+        root = get_command(event)
+        command = None
         handler = None
-        if event.text:
-            try:
-                root_call, root_args = SPACE_RE.split(event.text, 1)
-            except ValueError:
-                root_call = event.text
-        elif event.message and event.message.text:
-            try:
-                root_call, root_args = SPACE_RE.split(event.message.text, 1)
-            except ValueError:
-                root_call = event.message.text
 
-        if root_call == bot.config.PREFIX + self.name:
+        if root.call == bot.config.PREFIX + self.name:
             for c in self.route_list:
                 if c.subtype == event.subtype or c.subtype == '*':
-                    if root_args is None:
-                        if c.name is None:
-                            handler = c.handler
-                            break
-                    else:
-                        try:
-                            call, args = SPACE_RE.split(root_args, 1)
-                        except ValueError:
-                            call = root_args
-
-                        if c.name == call:
-                            handler = c.handler
-                            break
+                    command = root.subcommand
+                    if c.name == command.call:
+                        handler = c.handler
+                        break
             else:
                 handler = Handler(self.fallback)
 
         if handler:
-            raw = html.unescape(args)
-            func_params = handler.params
-            if self.use_shlex:
-                try:
-                    chunks = shlex.split(raw)
-                except ValueError:
-                    await bot.say(
-                        event.channel,
-                        '*Error*: Can not parse this command'
-                    )
-                    return False
-            else:
-                chunks = raw.split(' ')
+            if command is None:
+                command = MessageCommand('')
+            chunks = command.get_chunks(self.use_shlex)
+            if chunks is None:
+                await bot.say(
+                    event.channel,
+                    '*Error*: Can not parse this command'
+                )
+                return False
 
             try:
                 kw, remain_chunks = parse_option_and_arguments(
@@ -115,7 +90,7 @@ class RouteApp(BaseApp):
             with self.prepare_kwargs(
                 bot=bot,
                 event=event,
-                func_params=func_params,
+                handler=handler,
                 **kw,
             ) as kwargs:
                 return await handler(**kwargs)
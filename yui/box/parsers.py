@@ -1,209 +1,259 @@
+import functools
 import inspect
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import attr
 
 from .utils import is_container
-from ..types.handler import Handler
-from ..utils.cast import cast
+from ..types.handler import Argument, Handler, Option
+from ..utils.cast import KNOWN_TYPES, cast
 
 KWARGS_DICT = Dict[str, Any]
+CONVERTER_TYPE = Callable[[List[str]], Any]
 
 
-def parse_option_and_arguments(
-    handler: Handler,
-    chunks: List[str],
-) -> Tuple[KWARGS_DICT, List[str]]:
-    end = False
+def resolve_type(handler: Handler, item: Union[Argument, Option]):
+    """Find type of option or argument value from annotation of handler."""
+
+    if item.type_ is not None:
+        return item.type_
+
+    type_ = handler.params[item.dest].annotation
+    if type_ == inspect._empty or item.transform_func:  # type: ignore
+        return str
+    return type_
+
+
+def get_caster(type_) -> Callable[[Any], Any]:
+    """Get function which cast chunk into given type."""
 
-    result: KWARGS_DICT = {}
-    options = handler.options
-    arguments = handler.arguments
+    if type_ in KNOWN_TYPES or type_ is bool:
+        return type_
+    return functools.partial(cast, type_)
 
-    for o in options:
-        if o.type_ is None:
-            type_ = handler.params[o.dest].annotation
 
-            if type_ == inspect._empty:  # type: ignore
-                type_ = str
+def compile_option(handler: Handler, option: Option) -> CONVERTER_TYPE:
+    type_ = resolve_type(handler, option)
+    caster = get_caster(type_)
+    container_cls = option.container_cls
+    transform_func = option.transform_func
+
+    def convert(args: List[str]):
+        try:
+            if container_cls:
+                if option.multiple:
+                    r = cast(type_, args)
+                else:
+                    r = container_cls(caster(x) for x in args)
             else:
-                if o.transform_func:
-                    type_ = str
+                r = caster(args[0])
+        except ValueError as e:
+            raise SyntaxError(
+                option.type_error.format(name=option.name, e=e)
+            )
 
-            o.type_ = type_
+        if transform_func:
+            try:
+                if container_cls:
+                    r = container_cls(transform_func(x) for x in r)
+                else:
+                    r = transform_func(r)
+            except ValueError as e:
+                raise SyntaxError(
+                    option.transform_error.format(name=option.name, e=e)
+                )
+        return r
+
+    return convert
 
-    for a in arguments:
-        if a.type_ is None:
-            type_ = handler.params[a.dest].annotation
 
-            if type_ == inspect._empty:  # type: ignore
-                type_ = str
+def compile_argument(handler: Handler, argument: Argument) -> CONVERTER_TYPE:
+    type_ = resolve_type(handler, argument)
+    caster = get_caster(type_)
+    container_cls = argument.container_cls
+    typing_has_container = argument.typing_has_container
+    if argument.type_ is None and is_container(type_):
+        container_cls = None
+        typing_has_container = True
+    transform_func = argument.transform_func
+
+    def convert(args: List[str]):
+        try:
+            if argument.concat:
+                r = ' '.join(args)
+            elif container_cls:
+                r = container_cls(caster(x) for x in args)
+            elif typing_has_container:
+                r = cast(type_, args)
             else:
-                if a.transform_func:
-                    type_ = str
+                r = caster(args[0])
+        except ValueError as e:
+            raise SyntaxError(
+                argument.type_error.format(name=argument.name, e=e)
+            )
 
-            a.type_ = type_
-            if is_container(a.type_):
-                a.container_cls = None
-                a.typing_has_container = True
+        if transform_func:
+            try:
+                if container_cls and r:
+                    r = container_cls(transform_func(x) for x in r)
+                else:
+                    r = transform_func(r)
+            except ValueError as e:
+                raise SyntaxError(
+                    argument.transform_error.format(name=argument.name, e=e)
+                )
+        return r
 
-    required = {o.dest for o in options if o.required}
+    return convert
 
-    for option in options:
-        if option.multiple:
-            result[option.dest] = []
-        else:
-            if callable(option.default):
+
+@attr.dataclass(slots=True)
+class ParsePlan:
+    """Pre-resolved parsing information of handler."""
+
+    options: List[Option]
+    option_converters: List[CONVERTER_TYPE]
+    lookup: Dict[str, int]
+    required: List[Option]
+    arguments: List[Argument]
+    argument_converters: List[CONVERTER_TYPE]
+    tail_nargs: List[int]
+
+    def defaults(self) -> KWARGS_DICT:
+        result: KWARGS_DICT = {}
+        for option in self.options:
+            if option.multiple:
+                result[option.dest] = []
+            elif callable(option.default):
                 result[option.dest] = option.default()
             else:
                 result[option.dest] = option.default
+        return result
 
-    while not end and chunks:
-        for option in options:
-            name = chunks.pop(0)
-            if name.startswith(option.name + '='):
-                name, new_chunk = name.split('=', 1)
-                chunks.insert(0, new_chunk)
-
-            if name == option.name:
-                if option.dest in required:
-                    required.remove(option.dest)
-
-                if option.nargs == 0:
-                    result[option.dest] = option.value
-                    break
-
-                length = len(chunks)
-                try:
-                    args = [chunks.pop(0) for _ in range(option.nargs)]
-                except IndexError:
-                    raise SyntaxError(
-                        option.count_error.format(
-                            name=option.name,
-                            expected=option.nargs,
-                            given=length,
-                        )
-                    )
-                try:
-                    if option.container_cls:
-                        if option.multiple:
-                            r = cast(option.type_, args)
-                        else:
-                            r = option.container_cls(
-                                cast(option.type_, x) for x in args
-                            )
-                    else:
-                        r = cast(option.type_, args[0])
-                except ValueError as e:
-                    raise SyntaxError(
-                        option.type_error.format(name=option.name, e=e)
-                    )
-
-                if option.transform_func:
-                    if option.container_cls:
-                        try:
-                            r = option.container_cls(
-                                option.transform_func(x)
-                                for x in r
-                            )
-                        except ValueError as e:
-                            raise SyntaxError(
-                                option.transform_error.format(
-                                    name=option.name,
-                                    e=e,
-                                )
-                            )
-                    else:
-                        try:
-                            r = option.transform_func(r)
-                        except ValueError as e:
-                            raise SyntaxError(
-                                option.transform_error.format(
-                                    name=option.name,
-                                    e=e,
-                                )
-                            )
+    def find_option(self, chunk: str) -> Tuple[Optional[int], Optional[str]]:
+        index = self.lookup.get(chunk)
+        if index is None and '=' in chunk:
+            name, value = chunk.split('=', 1)
+            index = self.lookup.get(name)
+            if index is not None:
+                return index, value
+        return index, None
 
-                if option.multiple:
-                    result[option.dest].append(r[0])
-                else:
-                    result[option.dest] = r
+    def parse(self, chunks: List[str]) -> Tuple[KWARGS_DICT, List[str]]:
+        chunks = list(chunks)
+        result = self.defaults()
+        given = set()
+        i = 0
 
+        while i < len(chunks):
+            index, value = self.find_option(chunks[i])
+            if index is None:
                 break
-            chunks.insert(0, name)
-        else:
-            end = True
+            if value is None:
+                i += 1
+            else:
+                chunks[i] = value
+
+            option = self.options[index]
+            given.add(option.dest)
+
+            if option.nargs == 0:
+                result[option.dest] = option.value
+                continue
+
+            length = len(chunks) - i
+            if length < option.nargs:
+                raise SyntaxError(option.count_error.format(
+                    name=option.name,
+                    expected=option.nargs,
+                    given=length,
+                ))
+            r = self.option_converters[index](chunks[i:i+option.nargs])
+            i += option.nargs
 
-    if required:
-        raise SyntaxError(
-            '\n'.join(o.count_error.format(
+            if option.multiple:
+                result[option.dest].append(r[0])
+            else:
+                result[option.dest] = r
+
+        missing = [o for o in self.required if o.dest not in given]
+        if missing:
+            raise SyntaxError('\n'.join(o.count_error.format(
                 name=o.name,
                 expected=o.nargs,
                 given=0,
-            ) for o in (
-                list(filter(lambda x: x.dest == o, options))[0]
-                for o in required
-            ))
-        )
-
-    for i, argument in enumerate(arguments):
-        length = argument.nargs
-        if argument.nargs < 0:
-            length = len(chunks) - sum(a.nargs for a in arguments[i:]) - 1
-
-        if length < 1:
-            raise SyntaxError(argument.count_error.format(
-                name=argument.name,
-                expected='>0',
-                given=0,
-            ))
-        if length <= len(chunks):
-            args = [chunks.pop(0) for _ in range(length)]
-        else:
-            raise SyntaxError(argument.count_error.format(
-                name=argument.name,
-                expected=argument.nargs,
-                given=len(chunks),
-            ))
-        try:
-            if argument.concat:
-                r = ' '.join(args)
-            elif argument.container_cls:
-                r = argument.container_cls(
-                    cast(argument.type_, x) for x in args
-                )
-            elif argument.typing_has_container:
-                r = cast(argument.type_, args)
-            else:
-                r = cast(argument.type_, args[0])
-        except ValueError as e:
-            raise SyntaxError(
-                argument.type_error.format(
+            ) for o in missing))
+
+        for argument, convert, tail in zip(
+            self.arguments,
+            self.argument_converters,
+            self.tail_nargs,
+        ):
+            rest = len(chunks) - i
+            length = argument.nargs
+            if length < 0:
+                length = rest - tail
+
+            if length < 1:
+                raise SyntaxError(argument.count_error.format(
                     name=argument.name,
-                    e=e,
-                )
-            )
+                    expected='>0',
+                    given=0,
+                ))
+            if length > rest:
+                raise SyntaxError(argument.count_error.format(
+                    name=argument.name,
+                    expected=argument.nargs,
+                    given=rest,
+                ))
+            r = convert(chunks[i:i+length])
+            i += length
 
-        if argument.transform_func:
-            if argument.container_cls and r:
-                try:
-                    r = argument.container_cls(
-                        argument.transform_func(x)
-                        for x in r
-                    )
-                except ValueError as e:
-                    raise SyntaxError(argument.transform_error.format(
-                        name=argument.name,
-                        e=e,
-                    ))
-            else:
-                try:
-                    r = argument.transform_func(r)
-                except ValueError as e:
-                    raise SyntaxError(argument.transform_error.format(
-                        name=argument.name,
-                        e=e,
-                    ))
-
-        if r is not None:
-            result[argument.dest] = r
-
-    return result, chunks
+            if r is not None:
+                result[argument.dest] = r
+
+        return result, chunks[i:]
+
+
+def compile_plan(handler: Handler) -> ParsePlan:
+    """Build parse plan of handler and keep it in handler."""
+
+    options = list(handler.options)
+    arguments = list(handler.arguments)
+    first: Dict[str, Option] = {}
+    for option in options:
+        first.setdefault(option.dest, option)
+    required = [
+        first[dest]
+        for dest in dict.fromkeys(o.dest for o in options if o.required)
+    ]
+    lookup: Dict[str, int] = {}
+    for index, option in enumerate(options):
+        lookup.setdefault(option.name, index)
+    tail_nargs = [
+        sum(a.nargs for a in arguments[i:]) + 1
+        for i in range(len(arguments))
+    ]
+
+    handler.plan = ParsePlan(
+        options=options,
+        option_converters=[compile_option(handler, o) for o in options],
+        lookup=lookup,
+        required=required,
+        arguments=arguments,
+        argument_converters=[
+            compile_argument(handler, a) for a in arguments
+        ],
+        tail_nargs=tail_nargs,
+    )
+    return handler.plan
+
+
+def parse_option_and_arguments(
+    handler: Handler,
+    chunks: List[str],
+) -> Tuple[KWARGS_DICT, List[str]]:
+    plan = handler.plan
+    if plan is None:
+        plan = compile_plan(handler)
+    return plan.parse(chunks)
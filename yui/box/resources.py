@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+from typing import Any, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from sqlalchemy.orm import Session
+
+from ..orm import EngineConfig, make_session
+
+if TYPE_CHECKING:
+    from ..bot import Bot
+
+
+class Resources:
+    """Resources which handlers in one dispatch share.
+
+    Each resource is made when a handler requires it at first.
+
+    """
+
+    def __init__(self, bot: Bot) -> None:
+        """Initialize"""
+
+        self.bot = bot
+        self._sess: Optional[Session] = None
+        self._engine_config: Optional[EngineConfig] = None
+        self.closed = False
+
+    @property
+    def sess(self) -> Session:
+        if self._sess is None:
+            self._sess = make_session(bind=self.bot.config.DATABASE_ENGINE)
+        return self._sess
+
+    @property
+    def engine_config(self) -> EngineConfig:
+        if self._engine_config is None:
+            self._engine_config = EngineConfig(
+                url=self.bot.config.DATABASE_URL,
+                echo=self.bot.config.DATABASE_ECHO,
+            )
+        return self._engine_config
+
+    def inject(
+        self,
+        names: Iterable[str],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Fill kwargs with resources of given names."""
+
+        for name in names:
+            if name == 'bot':
+                kwargs['bot'] = self.bot
+            elif name == 'loop':
+                kwargs['loop'] = self.bot.loop
+            elif name == 'sess':
+                kwargs['sess'] = self.sess
+            elif name == 'db':
+                kwargs['db'] = self.bot.db
+            elif name == 'engine_config':
+                kwargs['engine_config'] = self.engine_config
+        return kwargs
+
+    def close(self):
+        self.closed = True
+        if self._sess is not None:
+            self._sess.close()
+            self._sess = None
+
+
+_current: contextvars.ContextVar[Optional[Resources]] = \
+    contextvars.ContextVar('resources', default=None)
+
+
+@contextlib.contextmanager
+def resource_scope(bot: Bot) -> Iterator[Resources]:
+    """Share resources in this block. Nested block reuses outer one.
+
+    Task spawned in the block inherits the scope, but gets new one when
+    the block was already closed.
+
+    """
+
+    current = _current.get()
+    if current is not None and current.bot is bot and not current.closed:
+        yield current
+        return
+
+    resources = Resources(bot)
+    token = _current.set(resources)
+    try:
+        yield resources
+    finally:
+        _current.reset(token)
+        resources.close()
@@ -1,9 +1,17 @@
+import html
 import re
+import shlex
+from functools import cached_property  # type: ignore
+from typing import List, Optional
+
+from ..event import Message
 
 SPACE_RE = re.compile(r'\s+')
 
 CONTAINER = (set, tuple, list)
 
+COMMAND_KEY = '_command'
+
 
 def is_container(t) -> bool:
     """Check given value is container type?"""
@@ -12,3 +20,60 @@ def is_container(t) -> bool:
         return t.__origin__ in CONTAINER
 
     return t in CONTAINER
+
+
+class MessageCommand:
+    """Command part of message text. Each part is computed lazily."""
+
+    def __init__(self, text: str) -> None:
+        """Initialize"""
+
+        self.text = text
+        try:
+            self.call, self.args = SPACE_RE.split(text, 1)
+        except ValueError:
+            self.call = text
+            self.args = ''
+
+    @cached_property
+    def raw(self) -> str:
+        return html.unescape(self.args)
+
+    @cached_property
+    def plain_chunks(self) -> List[str]:
+        return self.raw.split(' ')
+
+    @cached_property
+    def shlex_chunks(self) -> Optional[List[str]]:
+        """Chunks split by shlex. :const:`None` if it is not parsable."""
+
+        try:
+            return shlex.split(self.raw)
+        except ValueError:
+            return None
+
+    @cached_property
+    def subcommand(self) -> 'MessageCommand':
+        """Command view of arguments."""
+
+        return MessageCommand(self.args)
+
+    def get_chunks(self, use_shlex: bool) -> Optional[List[str]]:
+        if use_shlex:
+            return self.shlex_chunks
+        return self.plain_chunks
+
+
+def get_command(event: Message) -> MessageCommand:
+    """Get command view of message. It is made once per event."""
+
+    try:
+        return event.__dict__[COMMAND_KEY]
+    except KeyError:
+        pass
+
+    text = event.text
+    if not text and event.message:
+        text = event.message.text
+    command = event.__dict__[COMMAND_KEY] = MessageCommand(text or '')
+    return command
@@ -1,33 +1,288 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
 from decimal import Decimal
-from typing import Dict, List, Optional, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import aiomcache
 
+import attr
+
+from .codec import Codec
 from .utils import json
 
 DATA_TYPE = Optional[Union[str, bytes, bool, int, float, Decimal, Dict, List]]
+LOADER_TYPE = Callable[[], Awaitable[DATA_TYPE]]
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+logger = logging.getLogger(__name__)
+
+#: Seconds which other process can hold lease of loading.
+LEASE_TTL = 10
+
+#: Interval of checking result of load in other process.
+LEASE_POLL_INTERVAL = 0.05
+
+#: Limit of encoded value which :func:`cached` stores. Memcached keeps 1MB.
+CACHED_MAX_BYTES = 512 * 1024
+
+CACHE_ERRORS = (OSError, aiomcache.exceptions.ClientException)
+
+#: Largest data which is stored in one memcached item. Memcached keeps 1MB.
+CHUNK_SIZE = 1000 * 1000
+
+#: Header of manifest of data which is split into chunks.
+CHUNKED_HEADER = 0x7f
+
+#: Marker of key which does not exist in memcached.
+MISSING = b''
+
+
+@attr.dataclass(slots=True)
+class CacheStats:
+    """Counters of in-process cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    count: int = 0
+
+
+@attr.dataclass(slots=True)
+class LocalEntry:
+    data: bytes
+    expires_at: float
+
+
+class LocalCache:
+    """In-process LRU cache bounded by total bytes of stored data.
+
+    It keeps encoded data, so callers always get their own decoded copy.
+    Keys which memcached does not have are kept for ``negative_ttl``.
+
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl: float = 30,
+        negative_ttl: float = 5,
+    ) -> None:
+        """Initialize"""
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries: 'OrderedDict[bytes, LocalEntry]' = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Find data of key. :data:`MISSING` means known missing key."""
+
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.data
+
+    def set(self, key: bytes, data: bytes, exptime: int = 0):
+        ttl = self.ttl if data else self.negative_ttl
+        if exptime > 0:
+            ttl = min(ttl, exptime)
+        size = len(key) + len(data)
+        self.delete(key)
+        if size > self.max_bytes or ttl <= 0:
+            return
+        self.entries[key] = LocalEntry(data, time.monotonic() + ttl)
+        self.stats.size += size
+        self.stats.count += 1
+        while self.stats.size > self.max_bytes:
+            self._account(*self.entries.popitem(last=False))
+            self.stats.evictions += 1
+
+    def delete(self, key: bytes):
+        if key in self.entries:
+            self._remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.stats.size = 0
+        self.stats.count = 0
+
+    def _remove(self, key: bytes):
+        self._account(key, self.entries.pop(key))
+
+    def _account(self, key: bytes, entry: LocalEntry):
+        self.stats.size -= len(key) + len(entry.data)
+        self.stats.count -= 1
 
 
 class Cache:
 
-    def __init__(self, mc: aiomcache.Client, prefix: str = '') -> None:
+    def __init__(
+        self,
+        mc: aiomcache.Client,
+        prefix: str = '',
+        *,
+        local: Optional[LocalCache] = None,
+        codec: Optional[Codec] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
         self.mc = mc
         self.prefix = prefix.encode()
+        self.local = local
+        self.codec = Codec() if codec is None else codec
+        self.chunk_size = chunk_size
+        self.inflight: Dict[bytes, asyncio.Future] = {}
 
     def _key(self, key: Union[str, bytes]) -> bytes:
         if isinstance(key, str):
             key = key.encode()
         return self.prefix + key
 
+    def _keep(self, key: bytes, data: Optional[bytes], exptime: int = 0):
+        if self.local is not None:
+            self.local.set(key, MISSING if data is None else data, exptime)
+
+    async def _write(
+        self,
+        key: bytes,
+        data: bytes,
+        exptime: int,
+        *,
+        add: bool = False,
+    ) -> bool:
+        """Store data, splitting it into chunks if it is too big.
+
+        Manifest of chunked data is also kept under its own small key, so
+        chunks of overwritten value are found without fetching the value.
+        It is read together with the write, and chunks are not left behind
+        when overwritten value had chunks or ``add`` fails.
+
+        """
+
+        manifest_key = self._manifest_key(key)
+        if len(data) <= self.chunk_size:
+            if add:
+                return await self.mc.add(key, data, exptime=exptime)
+            result, old = await asyncio.gather(
+                self.mc.set(key, data, exptime=exptime),
+                self.mc.get(manifest_key),
+            )
+            if result and old:
+                await self._delete_keys(
+                    [manifest_key, *self._chunk_keys(key, old)],
+                )
+            return result
+
+        token = os.urandom(4).hex()
+        chunks = [
+            data[i:i+self.chunk_size]
+            for i in range(0, len(data), self.chunk_size)
+        ]
+        chunk_keys = [
+            self._chunk_key(key, token, i) for i in range(len(chunks))
+        ]
+        stored = bytes((CHUNKED_HEADER,)) + json.dumps({
+            'token': token,
+            'count': len(chunks),
+            'size': len(data),
+        }).encode()
+        *_, old = await asyncio.gather(
+            *(
+                self.mc.set(chunk_key, chunk, exptime=exptime)
+                for chunk_key, chunk in zip(chunk_keys, chunks)
+            ),
+            self.mc.get(manifest_key),
+        )
+        if add:
+            result = await self.mc.add(key, stored, exptime=exptime)
+            if not result:
+                await self._delete_keys(chunk_keys)
+                return result
+        else:
+            result = await self.mc.set(key, stored, exptime=exptime)
+        if result:
+            await asyncio.gather(
+                self.mc.set(manifest_key, stored, exptime=exptime),
+                self._delete_keys(self._chunk_keys(key, old)),
+            )
+        return result
+
+    @staticmethod
+    def _manifest_key(key: bytes) -> bytes:
+        return key + b'.manifest'
+
+    @staticmethod
+    def _chunk_key(key: bytes, token: str, index: int) -> bytes:
+        return key + f'.chunk.{token}.{index}'.encode()
+
+    def _chunk_keys(self, key: bytes, data: Optional[bytes]) -> List[bytes]:
+        """Find keys of chunks which given stored data refers."""
+
+        if not data or data[0] != CHUNKED_HEADER:
+            return []
+        manifest = json.loads(data[1:])
+        return [
+            self._chunk_key(key, manifest['token'], i)
+            for i in range(manifest['count'])
+        ]
+
+    async def _delete_keys(self, keys: List[bytes]):
+        await asyncio.gather(*(self.mc.delete(k) for k in keys))
+
+    async def _assemble(
+        self,
+        key: bytes,
+        data: Optional[bytes],
+    ) -> Optional[bytes]:
+        if not data or data[0] != CHUNKED_HEADER:
+            return data
+        manifest = json.loads(data[1:])
+        chunks = await self.mc.multi_get(*self._chunk_keys(key, data))
+        if any(chunk is None for chunk in chunks):
+            return None
+        data = b''.join(chunks)
+        if len(data) != manifest['size']:
+            return None
+        return data
+
+    async def _fetch(self, key: bytes) -> Optional[bytes]:
+        return await self._assemble(key, await self.mc.get(key))
+
     async def set(
         self,
         key: Union[str, bytes],
         value: DATA_TYPE,
         exptime: int = 0,
     ) -> bool:
-        data = json.dumps(value).encode()
+        data = self.codec.encode(value)
         key = self._key(key)
-        return await self.mc.set(key, data, exptime=exptime)
+        result = await self._write(key, data, exptime)
+        self._keep(key, data, exptime)
+        return result
 
     async def add(
         self,
@@ -35,22 +290,247 @@ class Cache:
         value: DATA_TYPE,
         exptime: int = 0,
     ) -> bool:
-        data = json.dumps(value).encode()
+        data = self.codec.encode(value)
         key = self._key(key)
-        return await self.mc.add(key, data, exptime=exptime)
+        result = await self._write(key, data, exptime, add=True)
+        if self.local is not None:
+            if result:
+                self._keep(key, data, exptime)
+            else:
+                self.local.delete(key)
+        return result
+
+    async def _get_data(self, key: bytes) -> Optional[bytes]:
+        if self.local is not None:
+            data = self.local.get(key)
+            if data is not None:
+                return data or None
+        data = await self._fetch(key)
+        self._keep(key, data)
+        return data
 
     async def get(self, key: Union[str, bytes], default=None) -> DATA_TYPE:
         key = self._key(key)
-        data = await self.mc.get(key)
+        data = await self._get_data(key)
         if data is None:
             return default
-        return json.loads(data)
+        return self.codec.decode(data)
 
     async def multi_get(self, *keys: Union[str, bytes]) -> List[DATA_TYPE]:
         prefixed_keys = [self._key(k) for k in keys]
-        values = await self.mc.multi_get(*prefixed_keys)
-        return [None if v is None else json.loads(v) for v in values]
+        values: List[Optional[bytes]] = [None] * len(prefixed_keys)
+        misses: List[Tuple[int, bytes]] = []
+        for i, key in enumerate(prefixed_keys):
+            data = None
+            if self.local is not None:
+                data = self.local.get(key)
+            if data is None:
+                misses.append((i, key))
+            else:
+                values[i] = data or None
+
+        if misses:
+            fetched = await self.mc.multi_get(*(k for _, k in misses))
+            for (i, key), data in zip(misses, fetched):
+                data = await self._assemble(key, data)
+                values[i] = data
+                self._keep(key, data)
+
+        return [None if v is None else self.codec.decode(v) for v in values]
 
     async def delete(self, key: Union[str, bytes]):
         key = self._key(key)
-        await self.mc.delete(key)
+        if self.local is not None:
+            self.local.delete(key)
+        manifest_key = self._manifest_key(key)
+        manifest, _ = await asyncio.gather(
+            self.mc.get(manifest_key),
+            self.mc.delete(key),
+        )
+        if manifest:
+            await self._delete_keys(
+                [manifest_key, *self._chunk_keys(key, manifest)],
+            )
+
+    async def get_or_set(
+        self,
+        key: Union[str, bytes],
+        loader: LOADER_TYPE,
+        ttl: int,
+        *,
+        stale_ttl: int = 0,
+        lease_ttl: int = LEASE_TTL,
+        max_bytes: Optional[int] = None,
+    ) -> DATA_TYPE:
+        """Get value of key, or load and store it if it is not cached.
+
+        Concurrent callers of same key wait for only one call of loader.
+        Bot processes which share memcached also wait for the process which
+        holds lease of the key. When value is older than ``ttl`` but younger
+        than ``ttl + stale_ttl``, stale value is returned immediately and it
+        is refreshed in background. Loaded value which is encoded longer
+        than ``max_bytes`` is returned without storing.
+
+        """
+
+        key = self._key(key)
+        found, value, fresh = self._unwrap(await self._get_data(key))
+        if found:
+            if fresh:
+                return value
+            if stale_ttl:
+                task = self._flight(
+                    key, loader, ttl, stale_ttl, lease_ttl, max_bytes,
+                )
+                task.add_done_callback(self._log_refresh_error)
+                return value
+        return await asyncio.shield(self._flight(
+            key, loader, ttl, stale_ttl, lease_ttl, max_bytes,
+        ))
+
+    def _unwrap(self, data: Optional[bytes]) -> Tuple[bool, DATA_TYPE, bool]:
+        if data is None:
+            return False, None, False
+        envelope = self.codec.decode(data)
+        if not isinstance(envelope, dict) or 'fresh_until' not in envelope:
+            return False, None, False
+        return True, envelope['value'], envelope['fresh_until'] > time.time()
+
+    def _flight(
+        self,
+        key: bytes,
+        loader: LOADER_TYPE,
+        ttl: int,
+        stale_ttl: int,
+        lease_ttl: int,
+        max_bytes: Optional[int],
+    ) -> asyncio.Future:
+        try:
+            return self.inflight[key]
+        except KeyError:
+            pass
+        task = self.inflight[key] = asyncio.ensure_future(
+            self._load(key, loader, ttl, stale_ttl, lease_ttl, max_bytes),
+        )
+        task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return task
+
+    async def _load(
+        self,
+        key: bytes,
+        loader: LOADER_TYPE,
+        ttl: int,
+        stale_ttl: int,
+        lease_ttl: int,
+        max_bytes: Optional[int],
+    ) -> DATA_TYPE:
+        lease = key + b'.lease'
+        acquired = await self.mc.add(lease, b'1', exptime=lease_ttl)
+        if not acquired:
+            deadline = time.monotonic() + lease_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                data = await self._fetch(key)
+                found, value, fresh = self._unwrap(data)
+                if fresh:
+                    self._keep(key, data, ttl + stale_ttl)
+                    return value
+            logger.info(f'lease of {key!r} expired. load it without lease')
+        try:
+            value = await loader()
+            data = self.codec.encode({
+                'value': value,
+                'fresh_until': time.time() + ttl,
+            })
+            if max_bytes is None or len(data) <= max_bytes:
+                await self._write(key, data, ttl + stale_ttl)
+                self._keep(key, data, ttl + stale_ttl)
+            return value
+        finally:
+            if acquired:
+                await self.mc.delete(lease)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('fail to refresh cache', exc_info=task.exception())
+
+    def stats(self) -> Optional[CacheStats]:
+        """Counters of in-process tier. :const:`None` if it is disabled."""
+
+        if self.local is None:
+            return None
+        return attr.evolve(self.local.stats)
+
+
+_default_cache: Optional[Cache] = None
+
+
+def set_default_cache(cache: Optional[Cache]):
+    """Set cache which functions decorated with :func:`cached` use."""
+
+    global _default_cache
+    _default_cache = cache
+
+
+def make_key(func: Callable, *args, **kwargs) -> str:
+    """Make cache key of function call from its arguments."""
+
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    digest = hashlib.sha1(repr(sorted(bound.arguments.items())).encode())
+    return f'CACHED_{func.__module__}.{func.__qualname__}_{digest.hexdigest()}'
+
+
+def cached(
+    ttl: int,
+    *,
+    stale_ttl: int = 0,
+    max_bytes: int = CACHED_MAX_BYTES,
+) -> Callable[[F], F]:
+    """Cache result of coroutine function in default cache.
+
+    Key is made from arguments of each call. Result is kept for
+    ``ttl + stale_ttl`` seconds. Within ``stale_ttl`` after ``ttl``, cached
+    value is returned immediately and refreshed in background, and it is
+    still returned when the refresh fails. Result must be JSON serializable.
+    When default cache is not set or it fails, function is called directly.
+
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = _default_cache
+            if cache is None:
+                return await func(*args, **kwargs)
+
+            called = False
+            results: List[Any] = []
+
+            async def loader():
+                nonlocal called
+                called = True
+                result = await func(*args, **kwargs)
+                results.append(result)
+                return result
+
+            try:
+                return await cache.get_or_set(
+                    make_key(func, *args, **kwargs),
+                    loader,
+                    ttl,
+                    stale_ttl=stale_ttl,
+                    max_bytes=max_bytes,
+                )
+            except CACHE_ERRORS:
+                if results:
+                    return results[0]
+                if called:
+                    raise
+                logger.warning(f'fail to use cache of {func.__qualname__}')
+                return await func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
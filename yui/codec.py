@@ -0,0 +1,142 @@
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import attr
+
+from .utils import json
+
+try:
+    import msgpack
+    has_msgpack = True
+except ImportError:
+    has_msgpack = False
+
+try:
+    import zstandard
+    has_zstd = True
+except ImportError:
+    has_zstd = False
+
+#: Encoded data longer than this is compressed when codec has compressor.
+COMPRESS_MIN_BYTES = 1024
+
+
+@attr.dataclass(slots=True, frozen=True)
+class Serializer:
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+@attr.dataclass(slots=True, frozen=True)
+class Compressor:
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value).encode()
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    'json': Serializer('json', _json_dumps, json.loads),
+}
+if has_msgpack:
+    SERIALIZERS['msgpack'] = Serializer(
+        'msgpack',
+        lambda value: msgpack.packb(value, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False),
+    )
+
+COMPRESSORS: Dict[str, Compressor] = {
+    'zlib': Compressor('zlib', zlib.compress, zlib.decompress),
+}
+if has_zstd:
+    COMPRESSORS['zstd'] = Compressor(
+        'zstd',
+        lambda data: zstandard.ZstdCompressor().compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+#: One byte header of each serializer and compressor combination.
+#: Never change assigned value. Stored data depend on it.
+HEADERS: Dict[Tuple[str, Optional[str]], int] = {
+    ('json', None): 0x01,
+    ('json', 'zlib'): 0x02,
+    ('json', 'zstd'): 0x03,
+    ('msgpack', None): 0x04,
+    ('msgpack', 'zlib'): 0x05,
+    ('msgpack', 'zstd'): 0x06,
+}
+HEADER_NAMES = {v: k for k, v in HEADERS.items()}
+
+
+class CodecError(Exception):
+    """Data can not be decoded or codec is not available."""
+
+
+class Codec:
+    """Encode value with one byte header of its format.
+
+    Data without known header are considered as plain JSON text, which
+    old version of :class:`yui.cache.Cache` stored.
+
+    """
+
+    def __init__(
+        self,
+        serializer: str = 'json',
+        compressor: Optional[str] = None,
+        *,
+        compress_min_bytes: int = COMPRESS_MIN_BYTES,
+    ) -> None:
+        """Initialize"""
+
+        if serializer not in SERIALIZERS:
+            raise CodecError(f'serializer {serializer} is not available')
+        if compressor is not None and compressor not in COMPRESSORS:
+            raise CodecError(f'compressor {compressor} is not available')
+
+        self.serializer = SERIALIZERS[serializer]
+        self.compressor = None if compressor is None else \
+            COMPRESSORS[compressor]
+        self.compress_min_bytes = compress_min_bytes
+
+    @classmethod
+    def from_name(cls, name: str) -> 'Codec':
+        """Make codec from name like ``json``, ``msgpack+zstd``."""
+
+        serializer, _, compressor = name.partition('+')
+        return cls(serializer, compressor or None)
+
+    @property
+    def name(self) -> str:
+        if self.compressor is None:
+            return self.serializer.name
+        return f'{self.serializer.name}+{self.compressor.name}'
+
+    def encode(self, value: Any) -> bytes:
+        data = self.serializer.dumps(value)
+        compressor = None
+        if self.compressor and len(data) >= self.compress_min_bytes:
+            compressor = self.compressor.name
+            data = self.compressor.compress(data)
+        header = HEADERS[self.serializer.name, compressor]
+        return bytes((header,)) + data
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            serializer, compressor = HEADER_NAMES[data[0]]
+        except KeyError:
+            return json.loads(data)
+        try:
+            loads = SERIALIZERS[serializer].loads
+            decompress = None if compressor is None else \
+                COMPRESSORS[compressor].decompress
+        except KeyError:
+            raise CodecError(f'codec of header {data[0]} is not available')
+        body = data[1:]
+        if decompress is not None:
+            body = decompress(body)
+        return loads(body)
@@ -99,6 +99,7 @@ def argument(
                 transform_error=transform_error,
             )
         )
+        handler.plan = None
         return handler
 
     return decorator
@@ -250,6 +251,7 @@ def option(
     def decorator(target: DECORATOR_ARGS_TYPE) -> Handler:
         handler = get_handler(target)
         handler.options[:] = options + handler.options
+        handler.plan = None
         return handler
 
     return decorator
@@ -16,10 +16,12 @@ DEFAULT = {
     'DEBUG': False,
     'RECEIVE_TIMEOUT': 300,  # 60 * 5 seconds
     'REGISTER_CRONTAB': True,
+    'WORKERS': 8,
     'PREFIX': '',
     'APPS': (),
     'DATABASE_URL': '',
     'DATABASE_ECHO': False,
+    'DATABASE_WORKERS': 4,
     'LOGGING': {
         'version': 1,
         'disable_existing_loggers': False,
@@ -61,7 +63,19 @@ DEFAULT = {
         'HOST': 'localhost',
         'PORT': 11211,
         'PREFIX': 'YUI_',
-    }
+        'CODEC': 'json+zlib',
+        # in-process tier is off by default. other processes may see stale
+        # values for LOCAL_TTL seconds after a write when it is on.
+        'LOCAL_MAX_BYTES': 0,
+        'LOCAL_TTL': 30,
+        'LOCAL_NEGATIVE_TTL': 5,
+    },
+    'HTTP': {
+        'LIMIT': 100,
+        'LIMIT_PER_HOST': 20,
+        'DNS_CACHE_TTL': 300,
+        'KEEPALIVE_TIMEOUT': 30,
+    },
 }
 
 
@@ -81,10 +95,13 @@ class Config:
     DATABASE_ECHO: bool
     LOGGING: Dict[str, Any]
     REGISTER_CRONTAB: bool
+    WORKERS: int
     CHANNELS: Dict[str, Any]
     USERS: Dict[str, Any]
     CACHE: Dict[str, Any]
+    HTTP: Dict[str, Any]
     WEBSOCKETDEBUGGERURL: Optional[str] = None
+    DATABASE_WORKERS: int = 4
     DATABASE_ENGINE: Engine = attr.ib(init=False, repr=False, cmp=False)
 
     def check(
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import logging
+import time
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import attr
+
+from .event import BaseEvent
+
+EVENT_HANDLER_TYPE = Callable[[BaseEvent], Awaitable[None]]
+
+#: Seconds between debug logs of dispatcher status.
+STATUS_LOG_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+
+@attr.dataclass(slots=True)
+class LaneStatus:
+    """Snapshot of one lane."""
+
+    key: str
+    queue_size: int
+    busy: bool
+    handled: int
+    busy_seconds: float
+    current: Optional[BaseEvent] = None
+
+
+@attr.dataclass(slots=True)
+class DispatcherStatus:
+    """Snapshot of dispatcher."""
+
+    queue_size: int
+    running: int
+    handled: int
+    lanes: List[LaneStatus]
+
+    @property
+    def busy_lanes(self) -> int:
+        return sum(1 for x in self.lanes if x.busy)
+
+
+class Lane:
+    """Events of one channel, handled in order by its own task."""
+
+    def __init__(self, key: str) -> None:
+        """Initialize"""
+
+        self.key = key
+        self.queue: Deque[BaseEvent] = collections.deque()
+        self.task: Optional[asyncio.Future] = None
+        self.current: Optional[BaseEvent] = None
+        self.started_at: Optional[float] = None
+        self.handled = 0
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None
+
+    def status(self) -> LaneStatus:
+        busy_seconds = 0.0
+        if self.started_at is not None:
+            busy_seconds = time.monotonic() - self.started_at
+        return LaneStatus(
+            key=self.key,
+            queue_size=len(self.queue),
+            busy=self.busy,
+            handled=self.handled,
+            busy_seconds=busy_seconds,
+            current=self.current,
+        )
+
+
+def get_lane_key(event: BaseEvent) -> str:
+    """Get ordering key of event. Events of same key are handled in order."""
+
+    channel = getattr(event, 'channel', None)
+    if channel is None:
+        channel = getattr(event, 'channel_id', None)
+    if channel is None:
+        return ''
+    if isinstance(channel, str):
+        return channel
+    return getattr(channel, 'id', None) or ''
+
+
+class Dispatcher:
+    """Dispatch events to per-channel lanes.
+
+    Each channel gets its own FIFO lane, made when an event arrives and
+    dropped when it is drained, so events of same channel are handled in
+    order and a slow handler never delays other channels. Events without
+    channel need no order, so each of them gets its own lane. At most
+    ``size`` events are handled at once over all lanes.
+
+    """
+
+    def __init__(self, queue: asyncio.Queue, size: int) -> None:
+        """Initialize"""
+
+        if size < 1:
+            raise ValueError('Dispatcher needs at least one worker.')
+
+        self.queue = queue
+        self.size = size
+        self.semaphore = asyncio.Semaphore(size)
+        self.lanes: Dict[str, Lane] = {}
+        self.unordered: Set[Lane] = set()
+        self.running = 0
+        self.handled = 0
+        self._failure: Optional[asyncio.Future] = None
+
+    def route(self, event: BaseEvent) -> Lane:
+        """Get lane of given event, making it if there is no one."""
+
+        key = get_lane_key(event)
+        if not key:
+            lane = Lane(key)
+            self.unordered.add(lane)
+            return lane
+        try:
+            return self.lanes[key]
+        except KeyError:
+            lane = self.lanes[key] = Lane(key)
+            return lane
+
+    def dispatch(self, event: BaseEvent, callback: EVENT_HANDLER_TYPE):
+        """Put event into its lane and start the lane if it is idle."""
+
+        lane = self.route(event)
+        lane.queue.append(event)
+        if lane.task is None or lane.task.done():
+            lane.task = asyncio.ensure_future(self._drain(lane, callback))
+            lane.task.add_done_callback(self._check_failure)
+
+    async def run(self, callback: EVENT_HANDLER_TYPE):
+        """Take events from queue and handle them in lanes."""
+
+        self._failure = asyncio.get_event_loop().create_future()
+        distribute = asyncio.ensure_future(self._distribute(callback))
+        report = asyncio.ensure_future(self._report())
+        try:
+            await asyncio.wait(
+                (distribute, self._failure),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if self._failure.done():
+                self._failure.result()
+            distribute.result()
+        finally:
+            distribute.cancel()
+            report.cancel()
+            for lane in self._all_lanes():
+                if lane.task is not None:
+                    lane.task.cancel()
+            self.lanes.clear()
+            self.unordered.clear()
+
+    async def _distribute(self, callback: EVENT_HANDLER_TYPE):
+        while True:
+            event = await self.queue.get()
+            self.dispatch(event, callback)
+
+    async def _drain(self, lane: Lane, callback: EVENT_HANDLER_TYPE):
+        while lane.queue:
+            event = lane.queue.popleft()
+            async with self.semaphore:
+                lane.current = event
+                lane.started_at = time.monotonic()
+                self.running += 1
+                try:
+                    await callback(event)
+                finally:
+                    self.running -= 1
+                    lane.current = None
+                    lane.started_at = None
+                    lane.handled += 1
+                    self.handled += 1
+        if self.lanes.get(lane.key) is lane:
+            del self.lanes[lane.key]
+        self.unordered.discard(lane)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(STATUS_LOG_INTERVAL)
+            status = self.status()
+            logger.debug(
+                'dispatcher: queue %d, running %d/%d, lanes %d, handled %d',
+                status.queue_size,
+                status.running,
+                self.size,
+                len(status.lanes),
+                status.handled,
+            )
+            for lane in status.lanes:
+                if lane.busy:
+                    logger.debug(
+                        'lane %r: busy %.1fs, queue %d',
+                        lane.key,
+                        lane.busy_seconds,
+                        lane.queue_size,
+                    )
+
+    def _all_lanes(self) -> List[Lane]:
+        return list(self.lanes.values()) + list(self.unordered)
+
+    def _check_failure(self, task: asyncio.Future):
+        if task.cancelled() or task.exception() is None:
+            return
+        if self._failure is not None and not self._failure.done():
+            self._failure.set_exception(task.exception())
+
+    def status(self) -> DispatcherStatus:
+        """Report queue depth and occupancy of each lane."""
+
+        return DispatcherStatus(
+            queue_size=self.queue.qsize(),
+            running=self.running,
+            handled=self.handled,
+            lanes=[x.status() for x in self._all_lanes()],
+        )
@@ -0,0 +1,85 @@
+"""EventLog ts_micro
+
+Revision ID: 5d0b8e9e6f3a
+Revises: 43c50e70d7f4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from alembic import op
+
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d0b8e9e6f3a'
+down_revision = '43c50e70d7f4'
+branch_labels = None
+depends_on = None
+
+#: Rows of irregular ts which are converted in Python at once.
+BATCH_SIZE = 1000
+
+event_log = sa.table(
+    'event_log',
+    sa.column('id', sa.Integer()),
+    sa.column('ts', sa.String()),
+    sa.column('ts_micro', sa.BigInteger()),
+)
+
+
+def ts_to_micro(ts: str) -> int:
+    seconds, _, fraction = ts.partition('.')
+    return int(seconds) * 1000000 + int(fraction[:6].ljust(6, '0'))
+
+
+def upgrade():
+    op.add_column(
+        'event_log',
+        sa.Column('ts_micro', sa.BigInteger(), nullable=True),
+    )
+
+    conn = op.get_bind()
+    # Slack ts has 6 fractional digits, so removing the dot gives micros.
+    conn.execute(
+        event_log.update()
+        .where(event_log.c.ts.like('%.______'))
+        .values(ts_micro=sa.cast(
+            sa.func.replace(event_log.c.ts, '.', ''),
+            sa.BigInteger(),
+        ))
+    )
+
+    update = (
+        event_log.update()
+        .where(event_log.c.id == sa.bindparam('_id'))
+        .values(ts_micro=sa.bindparam('_ts_micro'))
+    )
+    while True:
+        rows = conn.execute(
+            sa.select([event_log.c.id, event_log.c.ts])
+            .where(event_log.c.ts_micro.is_(None))
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(update, [
+            {'_id': id_, '_ts_micro': ts_to_micro(ts)} for id_, ts in rows
+        ])
+
+    with op.batch_alter_table('event_log') as batch_op:
+        batch_op.alter_column(
+            'ts_micro',
+            existing_type=sa.BigInteger(),
+            nullable=False,
+        )
+    op.create_index(
+        'ix_event_log_channel_ts_micro',
+        'event_log',
+        ['channel', 'ts_micro'],
+    )
+
+
+def downgrade():
+    op.drop_index('ix_event_log_channel_ts_micro', table_name='event_log')
+    with op.batch_alter_table('event_log') as batch_op:
+        batch_op.drop_column('ts_micro')
@@ -1,3 +1,4 @@
+from .database import AsyncDatabase, QueryStats
 from .engine import create_database_engine, get_database_engine
 from .model import Base
 from .session import (
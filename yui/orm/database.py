@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import attr
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .session import make_session
+
+R = TypeVar('R')
+
+#: Default count of threads which run database work.
+DATABASE_WORKERS = 4
+
+
+@attr.dataclass(slots=True)
+class QueryStats:
+    """Time spent on executing query, split by thread which ran it.
+
+    ``blocking_*`` fields count queries which ran on the event loop thread.
+    They blocked websocket receiving and every other handler.
+
+    """
+
+    count: int = 0
+    total: float = 0.0
+    blocking_count: int = 0
+    blocking_total: float = 0.0
+
+    def record(self, elapsed: float, blocking: bool):
+        self.count += 1
+        self.total += elapsed
+        if blocking:
+            self.blocking_count += 1
+            self.blocking_total += elapsed
+
+
+def is_thread_local_engine(engine: Engine) -> bool:
+    """Check engine keeps its data per thread, like in-memory SQLite."""
+
+    url = engine.url
+    return url.get_backend_name() == 'sqlite' and \
+        url.database in (None, '', ':memory:')
+
+
+_engine_stats: 'weakref.WeakKeyDictionary[Engine, QueryStats]' = \
+    weakref.WeakKeyDictionary()
+
+
+def watch_engine(engine: Engine, loop_thread: int) -> QueryStats:
+    """Record every query of engine into stats.
+
+    Listeners are attached only once per engine, so every database of same
+    engine shares its stats and each query is counted once.
+
+    """
+
+    try:
+        return _engine_stats[engine]
+    except KeyError:
+        pass
+    stats = _engine_stats[engine] = QueryStats()
+    started: threading.local = threading.local()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before(conn, cursor, statement, parameters, context, executemany):
+        started.at = time.monotonic()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after(conn, cursor, statement, parameters, context, executemany):
+        at = getattr(started, 'at', None)
+        if at is None:
+            return
+        started.at = None
+        stats.record(
+            time.monotonic() - at,
+            threading.get_ident() == loop_thread,
+        )
+
+    return stats
+
+
+class AsyncDatabase:
+    """Run session work on dedicated threads, not on the event loop.
+
+    Each :meth:`run` call gets its own session, because a session must not
+    be shared between threads. In-memory SQLite can not be seen from other
+    threads, so work on it runs inline.
+
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        max_workers: int = DATABASE_WORKERS,
+    ) -> None:
+        """Initialize"""
+
+        self.engine = engine
+        self.max_workers = max_workers
+        self.stats = watch_engine(engine, threading.get_ident())
+        self.executor: Optional[ThreadPoolExecutor] = None
+        if not is_thread_local_engine(engine):
+            self.executor = self._make_executor()
+
+    def _make_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            self.max_workers,
+            thread_name_prefix='yui-db',
+        )
+
+    def _work(self, func: Callable[..., R], *args, **kwargs) -> R:
+        sess = make_session(bind=self.engine)
+        try:
+            return func(sess, *args, **kwargs)
+        finally:
+            sess.close()
+
+    async def run(
+        self,
+        func: Callable[..., R],
+        *args,
+        **kwargs,
+    ) -> R:
+        """Call ``func(sess, *args, **kwargs)`` with fresh session.
+
+        Returned ORM objects are detached from closed session. Load every
+        attribute you need in func, or return plain values.
+
+        """
+
+        if self.executor is None:
+            return self._work(func, *args, **kwargs)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            lambda: self._work(func, *args, **kwargs),
+        )
+
+    def shutdown(self):
+        """Stop worker threads.
+
+        Bot runs shutdown hooks before it reconnects too, so fresh executor
+        takes place of stopped one. It starts no thread until next work.
+
+        """
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = self._make_executor()
@@ -0,0 +1,246 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar('T')
+NAME_GETTER_TYPE = Callable[[Any], Optional[str]]
+INDEX_KEY_TYPE = Tuple[Dict[str, List[Any]], str]
+
+
+def get_name(obj) -> Optional[str]:
+    """Get name of Slack object."""
+
+    return getattr(obj, 'name', None)
+
+
+def get_dm_name(obj) -> Optional[str]:
+    """Get name of DM channel. It is same with name of the user."""
+
+    user = getattr(obj, 'user', None)
+    if user is None:
+        return None
+    return getattr(user, 'name', None)
+
+
+class Registry(List[T]):
+    """List of Slack objects with hash index by id and name.
+
+    It works like a plain list, but lookup by id or name takes constant time.
+    When same id or name was added more than once, first one wins like
+    linear scan of list. Mutations update index of changed items only, and
+    fall back to :meth:`reindex` when order among items of same id or name
+    can not be known cheaply.
+
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[T] = (),
+        *,
+        name_getter: NAME_GETTER_TYPE = get_name,
+    ) -> None:
+        """Initialize"""
+
+        super(Registry, self).__init__()
+        self.name_getter = name_getter
+        self._ids: Dict[str, List[T]] = {}
+        self._names: Dict[str, List[T]] = {}
+        self._keys: Dict[int, List[INDEX_KEY_TYPE]] = {}
+        self.extend(iterable)
+
+    def _index_keys(self, obj: T) -> List[INDEX_KEY_TYPE]:
+        keys: List[INDEX_KEY_TYPE] = []
+        id = getattr(obj, 'id', None)
+        if id is not None:
+            keys.append((self._ids, id))
+        name = self.name_getter(obj)
+        if name is not None:
+            keys.append((self._names, name))
+        return keys
+
+    def _add_index(self, obj: T, *, last: bool) -> bool:
+        """Add obj into index.
+
+        Return :const:`False` without change when other items share id or
+        name of obj and obj is not at the end of list, because its order
+        among them is not known.
+
+        """
+
+        keys = self._index_keys(obj)
+        if not last and any(index.get(key) for index, key in keys):
+            return False
+        for index, key in keys:
+            index.setdefault(key, []).append(obj)
+        self._keys[id(obj)] = keys
+        return True
+
+    def _remove_index(self, obj: T):
+        keys = self._keys.pop(id(obj), None)
+        if keys is None:
+            keys = self._index_keys(obj)
+        for index, key in keys:
+            bucket = index.get(key, [])
+            for i, x in enumerate(bucket):
+                if x is obj:
+                    del bucket[i]
+                    break
+            if not bucket:
+                index.pop(key, None)
+
+    def _position(self, obj: T) -> int:
+        for i, x in enumerate(self):
+            if x is obj:
+                return i
+        raise ValueError(obj)
+
+    def reindex(self):
+        """Rebuild whole index."""
+
+        self._ids.clear()
+        self._names.clear()
+        self._keys.clear()
+        for obj in self:
+            self._add_index(obj, last=True)
+
+    def refresh(self, obj: T):
+        """Update index of item after its id or name was changed."""
+
+        self._remove_index(obj)
+        if not self._add_index(obj, last=bool(self) and self[-1] is obj):
+            self.reindex()
+
+    def get_by_id(self, id: str) -> Optional[T]:
+        """Find object by id."""
+
+        bucket = self._ids.get(id)
+        return bucket[0] if bucket else None
+
+    def get_by_name(self, name: str) -> Optional[T]:
+        """Find object by name."""
+
+        bucket = self._names.get(name)
+        return bucket[0] if bucket else None
+
+    def replace(self, obj: T):
+        """Replace object which has same id with given object, or add it."""
+
+        old = self.get_by_id(getattr(obj, 'id', None))  # type: ignore
+        if old is None:
+            self.append(obj)
+            return
+        self[self._position(old)] = obj
+
+    def discard(self, id: str) -> Optional[T]:
+        """Remove objects which has given id."""
+
+        bucket = self._ids.get(id)
+        if not bucket:
+            return None
+        old = bucket[0]
+        for obj in list(bucket):
+            super(Registry, self).__delitem__(self._position(obj))
+            self._remove_index(obj)
+        return old
+
+    def append(self, obj: T):
+        super(Registry, self).append(obj)
+        self._add_index(obj, last=True)
+
+    def extend(self, iterable: Iterable[T]):
+        for obj in iterable:
+            self.append(obj)
+
+    def __iadd__(self, iterable):  # type: ignore
+        self.extend(iterable)
+        return self
+
+    def insert(self, index, obj: T):
+        super(Registry, self).insert(index, obj)
+        if not self._add_index(obj, last=self[-1] is obj):
+            self.reindex()
+
+    def remove(self, obj: T):
+        index = self.index(obj)
+        old = self[index]
+        super(Registry, self).__delitem__(index)
+        self._remove_index(old)
+
+    def pop(self, index=-1) -> T:
+        obj = super(Registry, self).pop(index)
+        self._remove_index(obj)
+        return obj
+
+    def clear(self):
+        super(Registry, self).clear()
+        self._ids.clear()
+        self._names.clear()
+        self._keys.clear()
+
+    def sort(self, *args, **kwargs):
+        super(Registry, self).sort(*args, **kwargs)
+        self.reindex()
+
+    def reverse(self):
+        super(Registry, self).reverse()
+        self.reindex()
+
+    def __imul__(self, n):  # type: ignore
+        super(Registry, self).__imul__(n)
+        self.reindex()
+        return self
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super(Registry, self).__setitem__(index, value)
+            self.reindex()
+            return
+        old = self[index]
+        super(Registry, self).__setitem__(index, value)
+        self._remove_index(old)
+        if not self._add_index(value, last=self[-1] is value):
+            self.reindex()
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            super(Registry, self).__delitem__(index)
+            self.reindex()
+            return
+        old = self[index]
+        super(Registry, self).__delitem__(index)
+        self._remove_index(old)
+
+
+class RegistryAttribute:
+    """Descriptor which keep value of attribute as :class:`Registry`."""
+
+    def __init__(self, name_getter: NAME_GETTER_TYPE = get_name) -> None:
+        """Initialize"""
+
+        self.name_getter = name_getter
+        self.name = ''
+        self.attr_name = ''
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+        self.attr_name = f'_{name}_registry'
+
+    def __get__(self, obj, objtype=None) -> Registry:
+        if obj is None:
+            return self  # type: ignore
+        try:
+            return obj.__dict__[self.attr_name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __set__(self, obj, value: Iterable):
+        if not isinstance(value, Registry):
+            value = Registry(value, name_getter=self.name_getter)
+        obj.__dict__[self.attr_name] = value
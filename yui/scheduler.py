@@ -0,0 +1,262 @@
+import asyncio
+import contextlib
+import contextvars
+import enum
+import heapq
+import itertools
+import logging
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import attr
+
+from .types.slack.response import APIResponse
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TYPE = Callable[[], Awaitable[APIResponse]]
+BUCKET_KEY_TYPE = Tuple[str, str, str]
+
+
+class Priority(enum.IntEnum):
+    """Lane of API call. Lower value goes first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+@attr.dataclass(slots=True, frozen=True)
+class RateLimit:
+    """Allowed rate of one Slack API method."""
+
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+#: Rate limit tiers of Slack Web API.
+TIERS: Dict[int, RateLimit] = {
+    1: RateLimit(per_minute=1, burst=1),
+    2: RateLimit(per_minute=20, burst=3),
+    3: RateLimit(per_minute=50, burst=5),
+    4: RateLimit(per_minute=100, burst=10),
+}
+
+#: Tier of methods which yui calls.
+METHOD_TIERS: Dict[str, int] = {
+    'chat.delete': 3,
+    'conversations.history': 3,
+    'conversations.info': 3,
+    'conversations.list': 2,
+    'conversations.open': 3,
+    'rtm.start': 1,
+    'users.info': 4,
+    'users.list': 2,
+}
+
+#: Methods which have own limit instead of tier.
+SPECIAL_LIMITS: Dict[str, RateLimit] = {
+    'chat.postMessage': RateLimit(per_minute=60, burst=5),
+}
+
+#: Methods whose limit applies to each channel separately. Others are
+#: limited per workspace.
+CHANNEL_SCOPED_METHODS: FrozenSet[str] = frozenset({
+    'chat.postMessage',
+})
+
+DEFAULT_TIER = 3
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    'priority',
+    default=Priority.NORMAL,
+)
+
+
+def get_priority() -> Priority:
+    """Get lane of API calls in current context."""
+
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def lane(priority: Priority) -> Iterator[None]:
+    """Make API calls in this block use given lane."""
+
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_rate_limit(method: str) -> RateLimit:
+    """Find rate limit of given method."""
+
+    try:
+        return SPECIAL_LIMITS[method]
+    except KeyError:
+        return TIERS[METHOD_TIERS.get(method, DEFAULT_TIER)]
+
+
+def get_bucket_key(
+    method: str,
+    *,
+    channel: Optional[str] = None,
+    token: Optional[str] = None,
+) -> BUCKET_KEY_TYPE:
+    """Make key of bucket which given call consumes.
+
+    Limits are counted for each token, and channel scoped methods are also
+    counted for each channel. ``None`` token means default token of bot.
+
+    """
+
+    if method not in CHANNEL_SCOPED_METHODS:
+        channel = None
+    return method, channel or '', token or ''
+
+
+class TokenBucket:
+    """Token bucket which hands out tokens to waiters by priority."""
+
+    def __init__(self, scheduler: 'Scheduler', limit: RateLimit) -> None:
+        """Initialize"""
+
+        self.scheduler = scheduler
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated_at = time.monotonic()
+        self.waiters: List[Tuple[int, int]] = []
+        self.condition = asyncio.Condition()
+        self._counter = itertools.count()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.limit.burst),
+            self.tokens + (now - self.updated_at) * self.limit.rate,
+        )
+        self.updated_at = now
+
+    def drain(self):
+        self.refill()
+        self.tokens = min(self.tokens, 0.0)
+
+    def delay(self) -> float:
+        self.refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.limit.rate
+
+    async def acquire(self, priority: Priority):
+        entry = (int(priority), next(self._counter))
+        async with self.condition:
+            heapq.heappush(self.waiters, entry)
+            self.condition.notify_all()
+            try:
+                while True:
+                    timeout: Optional[float] = None
+                    if self.waiters[0] == entry:
+                        timeout = max(
+                            self.scheduler.pause_remaining(),
+                            self.delay(),
+                        )
+                        if timeout <= 0:
+                            heapq.heappop(self.waiters)
+                            self.tokens -= 1
+                            return
+                    try:
+                        await asyncio.wait_for(
+                            self.condition.wait(),
+                            timeout=timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self.waiters:
+                    self.waiters.remove(entry)
+                    heapq.heapify(self.waiters)
+                raise
+            finally:
+                self.condition.notify_all()
+
+
+class Scheduler:
+    """Schedule Slack API calls within rate limit of each method.
+
+    Calls wait for token of bucket of method, token and channel (only for
+    :data:`CHANNEL_SCOPED_METHODS`), and calls on higher priority
+    lane take token first. When Slack responds with 429, all calls wait
+    until ``Retry-After`` and the call is sent again.
+
+    """
+
+    def __init__(self, max_retries: int = 3) -> None:
+        """Initialize"""
+
+        self.max_retries = max_retries
+        self.buckets: Dict[BUCKET_KEY_TYPE, TokenBucket] = {}
+        self.paused_until = 0.0
+
+    def get_bucket(self, key: BUCKET_KEY_TYPE) -> TokenBucket:
+        try:
+            return self.buckets[key]
+        except KeyError:
+            bucket = self.buckets[key] = TokenBucket(
+                self,
+                get_rate_limit(key[0]),
+            )
+            return bucket
+
+    def pause(self, seconds: float):
+        """Hold every call for given seconds."""
+
+        self.paused_until = max(
+            self.paused_until,
+            time.monotonic() + seconds,
+        )
+
+    def pause_remaining(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+    async def run(
+        self,
+        method: str,
+        request: REQUEST_TYPE,
+        *,
+        channel: Optional[str] = None,
+        token: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> APIResponse:
+        """Send request when rate limit of method allows it."""
+
+        if priority is None:
+            priority = get_priority()
+        bucket = self.get_bucket(
+            get_bucket_key(method, channel=channel, token=token),
+        )
+        retries = 0
+        while True:
+            await bucket.acquire(priority)
+            resp = await request()
+            if resp.status != 429 or retries >= self.max_retries:
+                return resp
+            retries += 1
+            delay = float(resp.headers.get('Retry-After', 1))
+            logger.info(f'{method} got rate limited. wait {delay}s')
+            bucket.drain()
+            self.pause(delay)
@@ -1,3 +1,133 @@
+import asyncio
+from typing import Dict, List, Optional
+
 import aiohttp
 
-client_session = aiohttp.ClientSession
+
+class HTTPPool:
+    """Long-lived keep-alive HTTP connection pool shared by bot and apps."""
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30,
+    ) -> None:
+        """Initialize"""
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._retired: List[aiohttp.TCPConnector] = []
+
+    def configure(self, **kwargs) -> None:
+        """Change pool options. Applied when next connector is made."""
+
+        for key, value in kwargs.items():
+            if not hasattr(self, key) or key.startswith('_'):
+                raise TypeError(f'Unexpected pool option: {key}')
+            setattr(self, key, value)
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        """Shared connector of current event loop."""
+
+        loop = asyncio.get_event_loop()
+        if (
+            self._connector is None
+            or self._connector.closed
+            or self._loop is not loop
+        ):
+            self._discard()
+            self._connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._loop = loop
+        return self._connector
+
+    def _discard(self) -> None:
+        """Release sessions and connector made for previous event loop."""
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            # Sessions do not own connector, so closing them only detaches.
+            session.detach()
+
+        connector, loop = self._connector, self._loop
+        self._connector = None
+        self._loop = None
+        if connector is None or connector.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Previous loop is alive on other thread. Close it there.
+            asyncio.run_coroutine_threadsafe(close_connector(connector), loop)
+        else:
+            # Never run other loop from here, current one may be running.
+            self._retired.append(connector)
+
+    def client_session(self, **kwargs) -> aiohttp.ClientSession:
+        """Make short-lived session on top of shared connector.
+
+        Closing this session does not close pooled connections.
+
+        """
+
+        return aiohttp.ClientSession(
+            connector=self.connector,
+            connector_owner=False,
+            **kwargs,
+        )
+
+    def session(self, name: str = 'default') -> aiohttp.ClientSession:
+        """Get long-lived session by name. Do not close it by yourself."""
+
+        connector = self.connector
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=False,
+            )
+            self._sessions[name] = session
+        return session
+
+    async def close(self) -> None:
+        """Close all sessions and pooled connections."""
+
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+        retired, self._retired = self._retired, []
+        for connector in retired:
+            await close_connector(connector)
+
+        if self._connector is not None:
+            await self._connector.close()
+        self._connector = None
+        self._loop = None
+
+
+async def close_connector(connector: aiohttp.TCPConnector) -> None:
+    await connector.close()
+
+
+# (:class:`HTTPPool`) Default pool instance
+pool = HTTPPool()
+
+
+def client_session(**kwargs) -> aiohttp.ClientSession:
+    """Make session which share keep-alive connections of default pool."""
+
+    return pool.client_session(**kwargs)
@@ -9,6 +9,7 @@ from typing import (
     Mapping,
     Optional,
     TYPE_CHECKING,
+    Tuple,
     Type,
     Union,
 )
@@ -19,6 +20,9 @@ if TYPE_CHECKING:
     from ..box.tasks import CronTask
 
 
+#: Names of parameter which are filled by bot, not by command parser.
+INJECTABLE_PARAMS = ('bot', 'loop', 'sess', 'db', 'engine_config')
+
 HANDLER_CALL_RETURN_TYPE = Coroutine[Any, Any, Optional[bool]]
 HANDLER_CALL_TYPE = Callable[..., HANDLER_CALL_RETURN_TYPE]
 
@@ -69,10 +73,15 @@ class Handler:
     last_call: Any = attr.ib(init=False)
     doc: Optional[str] = attr.ib(init=False)
     params: Mapping[str, inspect.Parameter] = attr.ib(init=False)
+    plan: Any = attr.ib(init=False, default=None)
+    injections: Tuple[str, ...] = attr.ib(init=False)
 
     def __attrs_post_init__(self):
         self.doc = inspect.getdoc(self.f)
         self.params = inspect.signature(self.f).parameters
+        self.injections = tuple(
+            name for name in INJECTABLE_PARAMS if name in self.params
+        )
         self.arguments = []
         self.options = []
         self.last_call = {}
@@ -97,9 +97,9 @@ def channel_id_convert(value):
         }[id[0]]
     except KeyError:
         raise KeyError('Given Channel ID prefix was not expected.')
-    for obj in objs:
-        if obj.id == id:
-            return obj
+    obj = objs.get_by_id(id)
+    if obj is not None:
+        return obj
 
     from .channel import create_unknown_channel  # circular dependency
     if isinstance(value, str):
@@ -123,9 +123,9 @@ def user_id_convert(value):
     from .user import create_unknown_user  # circular dependency
     if not (id.startswith('U') or id.startswith('W')):
         raise KeyError('Given ID value has unexpected prefix.')
-    for obj in bot.users:
-        if obj.id == id:
-            return obj
+    obj = bot.users.get_by_id(id)
+    if obj is not None:
+        return obj
 
     if isinstance(value, str):
         kwargs = {'id': value}
@@ -152,22 +152,17 @@ def id_convert(value):
 def name_convert(value, type: str = None):
     bot = Namespace._bot
 
-    if type is None or type == 'channel':
-        for c in bot.channels:
-            if c.name == value:
-                return c
-    if type is None or type == 'ims':
-        for d in bot.ims:
-            if d.user.name == value:
-                return d
-    if type is None or type == 'groups':
-        for g in bot.groups:
-            if g.name == value:
-                return g
-    if type is None or type == 'users':
-        for u in bot.users:
-            if u.name == value:
-                return u
+    registries = {
+        'channel': bot.channels,
+        'ims': bot.ims,
+        'groups': bot.groups,
+        'users': bot.users,
+    }
+    for key, registry in registries.items():
+        if type is None or type == key:
+            obj = registry.get_by_name(value)
+            if obj is not None:
+                return obj
 
     raise KeyError('Bot did not know given name.')
 
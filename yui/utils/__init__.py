@@ -29,10 +29,13 @@ from .format import (
     strike,
 )
 from .fuzz import (
+    Choices,
     KOREAN_ALPHABETS_FIRST_MAP,
     KOREAN_ALPHABETS_MIDDLE_MAP,
     KOREAN_END,
     KOREAN_START,
+    Normalized,
+    best_matches,
     match,
     normalize_korean_nfc_to_nfd,
     partial_ratio,
@@ -1,8 +1,33 @@
+import collections
+import functools
+import heapq
 import unicodedata
-from typing import Dict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import attr
 
 from fuzzywuzzy import fuzz
 
+try:
+    import Levenshtein
+    has_levenshtein = True
+except ImportError:
+    has_levenshtein = False
+
+T = TypeVar('T')
+
 KOREAN_START = ord('가')
 KOREAN_END = ord('힣')
 KOREAN_ALPHABETS_FIRST_MAP: Dict[str, str] = {
@@ -32,19 +57,27 @@ KOREAN_ALPHABETS_MIDDLE_MAP: Dict[str, str] = {
 }
 
 
-def normalize_korean_nfc_to_nfd(value: str) -> str:
-    """Normalize Korean string to NFD."""
+#: Count of memoized results of :func:`normalize_korean_nfc_to_nfd`.
+NORMALIZE_CACHE_SIZE = 4096
 
-    for from_, to_ in KOREAN_ALPHABETS_FIRST_MAP.items():
-        value = value.replace(from_, to_)
 
-    for from_, to_ in KOREAN_ALPHABETS_MIDDLE_MAP.items():
-        value = value.replace(from_, to_)
+def _build_nfd_table() -> Dict[int, str]:
+    table: Dict[int, str] = {}
+    for mapping in (KOREAN_ALPHABETS_FIRST_MAP, KOREAN_ALPHABETS_MIDDLE_MAP):
+        table.update({ord(k): v for k, v in mapping.items()})
+    for code in range(KOREAN_START, KOREAN_END + 1):
+        table[code] = unicodedata.normalize('NFD', chr(code))
+    return table
 
-    return ''.join(
-        unicodedata.normalize('NFD', x) if KOREAN_START <= ord(x) <= KOREAN_END
-        else x for x in list(value)
-    )
+
+KOREAN_NFD_TABLE = _build_nfd_table()
+
+
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_korean_nfc_to_nfd(value: str) -> str:
+    """Normalize Korean string to NFD."""
+
+    return value.translate(KOREAN_NFD_TABLE)
 
 
 def ratio(str1: str, str2: str) -> int:
@@ -82,3 +115,143 @@ def match(s1: str, s2: str) -> int:
     r = ratio(s1, s2)
     weight = 1 - (min(rng) / max(rng))
     return max(0, min(100, int(r * (1 + weight * tsr / 100))))
+
+
+@attr.dataclass(slots=True, frozen=True)
+class Normalized:
+    """Text with its normalized form, for scoring many times."""
+
+    text: str
+    nfd: str
+
+    @classmethod
+    def of(cls, text: str) -> 'Normalized':
+        return cls(text, normalize_korean_nfc_to_nfd(text))
+
+
+SCORER_TYPE = Callable[[Normalized, Normalized], int]
+
+
+def score_ratio(a: Normalized, b: Normalized) -> int:
+    if has_levenshtein:
+        # same value with fuzz.ratio, without its wrapper overhead
+        return int(round(100 * Levenshtein.ratio(a.nfd, b.nfd)))
+    return fuzz.ratio(a.nfd, b.nfd)
+
+
+def score_partial_ratio(a: Normalized, b: Normalized) -> int:
+    return fuzz.partial_ratio(a.nfd, b.nfd)
+
+
+def score_token_sort_ratio(a: Normalized, b: Normalized) -> int:
+    return fuzz.token_sort_ratio(a.nfd, b.nfd)
+
+
+def score_match(a: Normalized, b: Normalized) -> int:
+    rng = [len(a.text), len(b.text)]
+    tsr = score_token_sort_ratio(a, b)
+    r = score_ratio(a, b)
+    weight = 1 - (min(rng) / max(rng))
+    return max(0, min(100, int(r * (1 + weight * tsr / 100))))
+
+
+SCORERS: Dict[str, SCORER_TYPE] = {
+    'ratio': score_ratio,
+    'partial_ratio': score_partial_ratio,
+    'token_sort_ratio': score_token_sort_ratio,
+    'match': score_match,
+}
+
+
+class Choices(Generic[T]):
+    """Choices normalized once, to be matched with many queries."""
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        key: Optional[Callable[[T], str]] = None,
+    ) -> None:
+        """Initialize"""
+
+        self.items: List[T] = list(items)
+        self.normalized = [
+            Normalized.of(key(x) if key else x)  # type: ignore
+            for x in self.items
+        ]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def scores(
+        self,
+        query: Union[str, Normalized],
+        scorer: Union[str, SCORER_TYPE] = 'ratio',
+    ) -> List[int]:
+        """Score of each choice, in order of items."""
+
+        if isinstance(query, str):
+            query = Normalized.of(query)
+        if isinstance(scorer, str):
+            scorer = SCORERS[scorer]
+        return [scorer(query, n) for n in self.normalized]
+
+
+def best_matches(
+    query: Union[str, Normalized],
+    choices: Union[Choices[Any], Iterable[str]],
+    k: int = 1,
+    scorer: Union[str, SCORER_TYPE] = 'ratio',
+) -> List[Tuple[Any, int]]:
+    """Get top k choices and their scores, best first.
+
+    Query is normalized only once. Pass :class:`Choices` to reuse
+    normalized choices. Earlier choice wins when scores are same.
+
+    """
+
+    if not isinstance(choices, Choices):
+        choices = Choices(choices)
+    return heapq.nlargest(
+        k,
+        zip(choices.items, choices.scores(query, scorer)),
+        key=lambda x: x[1],
+    )
+
+
+def ngrams(text: str, n: int = 3) -> Set[str]:
+    """Character n-grams of lowercased text padded by space."""
+
+    text = f' {text.lower()} '
+    return {text[i:i+n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """Inverted index from character n-gram to positions of keys.
+
+    It makes short list of keys which share many n-grams with query, so
+    only them have to be scored by slow fuzzy scorer.
+
+    """
+
+    def __init__(self, keys: Iterable[str], n: int = 3) -> None:
+        """Initialize"""
+
+        self.n = n
+        self.keys: List[str] = list(keys)
+        self.postings: Dict[str, List[int]] = {}
+        for i, key in enumerate(self.keys):
+            for gram in ngrams(key, n):
+                self.postings.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def shortlist(self, query: str, limit: int) -> List[int]:
+        """Positions of keys sharing most n-grams with query, in order."""
+
+        counts: Dict[int, int] = collections.Counter()
+        for gram in ngrams(query, self.n):
+            for i in self.postings.get(gram, ()):
+                counts[i] += 1
+        top = heapq.nlargest(limit, counts.items(), key=lambda x: x[1])
+        return sorted(i for i, _ in top)
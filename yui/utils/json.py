@@ -1,9 +1,9 @@
-from typing import Any
+from typing import Any, Union
 
 import orjson
 
 
-def loads(value: str) -> Any:
+def loads(value: Union[str, bytes]) -> Any:
     return orjson.loads(value)
 
 